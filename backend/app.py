@@ -1,28 +1,80 @@
 """FastAPI backend for GCP Release Notes Navigator."""
 
+import asyncio
+import hmac
+import json
+import os
 from contextlib import asynccontextmanager
 from datetime import date
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from google.api_core.exceptions import NotFound
 from pydantic import BaseModel
 
 from src.ai import generate_sql_query, summarize_release_notes, LLM_MODEL, LLM_ENDPOINT
+from src.answer_cache import answer_cache, answer_key
 from src.bq import init_bq_client
+from src.changes import ChangeFeed, for_platform
 from src.config import get_table_name
+from src.count_cube import CountCube, heatmap_from_cells
+from src.etag import ConditionalGetMiddleware
+from src.intent_router import INTENT_ROUTER, IntentRouter
+from src.llm_scheduler import PRIORITY_SUMMARY, LLMBusy, scheduler as llm_scheduler
+from src.note_store import NOTE_STORE, NoteStoreRefresher
+from src.notifiers import build_notifiers
+from src.render import attach_render_artifacts
+from src.shared_state import shared_state
+from src.subscriptions import Subscription, SubscriptionMatcher, SubscriptionStore
+from src.suggest import SuggestIndexRefresher
 from src.queries import (
+    AI_QUERY_MAX_ROWS,
     get_date_range,
+    get_note_columns,
+    get_table_columns,
+    load_platforms,
     load_product_names,
     load_release_note_types,
+    query_page,
     query_release_notes,
+    run_bounded,
+    run_query,
 )
+from src.query_builder import (
+    NoteFilters,
+    heatmap_query,
+    time_series_query,
+    top_products_query,
+    trailing_window,
+    type_distribution_query,
+)
+from src.tracing import TracingMiddleware, fastapi_traces_requests, init_tracing, set_attributes, span
 
 # --------------- Startup ---------------
 
 bq_client = None
 table_name = None
-_filter_options: dict | None = None
+_note_columns: list[str] | None = None
+# Filter options per platform (None: all platforms), loaded on first request.
+_filter_options: dict[str | None, dict] = {}
+# The ingestion job's table has a `platform` column; the public dataset
+# doesn't — every row there is GCP.
+_has_platform = False
+_platforms: list[str] = ["GCP"]
+_suggester: SuggestIndexRefresher | None = None
+_note_store: NoteStoreRefresher | None = None
+_changes = ChangeFeed()
+_subscriptions = SubscriptionStore()
+# None when nothing would match new subscriptions (no note store, or no ingested_at to pull by).
+_matcher: SubscriptionMatcher | None = None
+_answers = answer_cache()
+_router: IntentRouter | None = None
+
+CHANGES_KEEPALIVE_SECONDS = float(os.environ.get("CHANGES_KEEPALIVE_SECONDS", "15"))
+# Shared secret for POST /api/changes/notify; unset, anyone who can reach the backend may call it.
+CHANGES_NOTIFY_TOKEN = os.environ.get("CHANGES_NOTIFY_TOKEN", "")
 
 TABLE_SCHEMA = [
     {"name": "description", "type": "STRING"},
@@ -33,26 +85,111 @@ TABLE_SCHEMA = [
 ]
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    global bq_client, table_name, _filter_options
-    bq_client = init_bq_client()
-    table_name = get_table_name()
-    # Pre-load stable filter options once at startup
-    types = load_release_note_types(bq_client, table_name)
-    products = load_product_names(bq_client, table_name)
-    min_date, max_date = get_date_range(bq_client, table_name)
-    _filter_options = {
+def _table_schema() -> list[dict]:
+    """TABLE_SCHEMA, plus `platform` when the table has it."""
+    if _has_platform:
+        return TABLE_SCHEMA + [{"name": "platform", "type": "STRING"}]
+    return TABLE_SCHEMA
+
+
+def _load_filter_options(platform: str | None) -> dict:
+    types = load_release_note_types(bq_client, table_name, platform)
+    products = load_product_names(bq_client, table_name, platform)
+    min_date, max_date = get_date_range(bq_client, table_name, platform)
+    return {
+        "platforms": _platforms,
         "types": types,
         "products": products,
         "min_date": str(min_date),
         "max_date": str(max_date),
     }
+
+
+def _resolve_platform(platform: Optional[str]) -> Optional[str]:
+    """Validate a `platform` parameter; returns the value to filter on, or None for no filter."""
+    if not platform:
+        return None
+    platform = platform.strip().upper()
+    if platform not in _platforms:
+        raise HTTPException(status_code=400, detail=f"Unknown platform {platform!r}; expected one of {_platforms}")
+    return platform if _has_platform else None
+
+
+def _startup_state() -> dict:
+    """Table shape and filter options; with several workers, one of them queries these for all."""
+    global _has_platform, _platforms
+    columns = get_table_columns(bq_client, table_name)
+    _has_platform = "platform" in columns
+    _platforms = load_platforms(bq_client, table_name) if _has_platform else ["GCP"]
+    # Every platform's options up front, so workers don't each load them on first request.
+    keys = [None] + (_platforms if _has_platform else [])
+    return {
+        "note_columns": get_note_columns(bq_client, table_name),
+        "has_platform": _has_platform,
+        "ingestion_owned": {"ingested_at", "row_hash"} <= set(columns),
+        "platforms": _platforms,
+        "filter_options": {key or "": _load_filter_options(key) for key in keys},
+    }
+
+
+def _observe_changes(store, version: str) -> None:
+    """NoteStoreRefresher's on_change: feed the new snapshot's counts to the change stream."""
+    counts = {(platform or "GCP", product): n for (platform, product), n in store.product_counts().items()}
+    _changes.observe(version, counts)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global bq_client, table_name, _note_columns, _filter_options, _has_platform, _platforms, _suggester, _note_store, _router, _matcher
+    bq_client = init_bq_client()
+    table_name = get_table_name()
+    shared = shared_state()
+    startup = shared.once("startup", _startup_state) if shared else _startup_state()
+    _note_columns, _has_platform, _platforms = startup["note_columns"], startup["has_platform"], startup["platforms"]
+    _filter_options = {key or None: options for key, options in startup["filter_options"].items()}
+    if INTENT_ROUTER != "off":
+        options = _filter_options[None]
+        _router = IntentRouter(options["products"], options["types"], _platforms if _has_platform else [])
+    # Built in the background; /api/suggest answers `ready: false` until then.
+    text_column = "description_text" if "description_text" in _note_columns else "description"
+    _suggester = SuggestIndexRefresher(bq_client, table_name, text_column, shared).start()
+    # Loaded in the background too; release notes come from BigQuery until it is.
+    # Its pulls are also what subscriptions are matched against.
+    if NOTE_STORE != "none":
+        if startup["ingestion_owned"]:
+            _matcher = SubscriptionMatcher(_subscriptions, build_notifiers(), terms=_suggester)
+        _note_store = NoteStoreRefresher(
+            bq_client,
+            table_name,
+            _note_columns,
+            shared,
+            on_change=_observe_changes,
+            on_rows=_matcher.on_rows if _matcher else None,
+        ).start()
     yield
+    _suggester.stop()
+    if _note_store:
+        _note_store.stop()
+
+
+def _data_version() -> str | None:
+    """The table's data version as the background refreshers last saw it (the same in every worker)."""
+    refresher = _note_store or _suggester
+    return refresher.version if refresher else None
 
 
 app = FastAPI(title="GCP Release Notes API", lifespan=lifespan)
 
+# Innermost, so 304s still go through tracing and CORS.
+app.add_middleware(
+    ConditionalGetMiddleware,
+    version=_data_version,
+    paths=("/api/data-version", "/api/filter-options", "/api/release-notes", "/api/insights/"),
+)
+
+if init_tracing("release-notes-backend") and not fastapi_traces_requests():
+    app.add_middleware(TracingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -60,6 +197,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(LLMBusy)
+async def llm_busy(request: Request, exc: LLMBusy):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "reason": exc.reason, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # --------------- Health ---------------
 
 
@@ -68,17 +214,174 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/api/data-version")
+async def data_version():
+    """Changes whenever the table's contents do; clients key their caches on it."""
+    return {"version": _data_version()}
+
+
+# --------------- Change Feed ---------------
+
+
+def _sse(event: str, data: dict, event_id: str | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/api/changes/stream")
+async def changes_stream(
+    request: Request,
+    platform: Optional[str] = None,
+    last_event_id: Optional[str] = Header(default=None),
+):
+    """Server-Sent Events: a `notes` event each time new release notes land.
+
+    Starts with a `hello` event carrying the current data version (`reset`
+    when the Last-Event-ID the client reconnected with can't be replayed),
+    then the replayed and live `notes` events — or a `version` event when
+    the data changed without adding notes for `platform` — with a comment
+    line every CHANGES_KEEPALIVE_SECONDS so proxies keep the connection
+    open. Needs the note store; with NOTE_STORE=none only the hello and
+    keep-alives are sent.
+    """
+    requested = platform.strip().upper() if platform else None
+    _resolve_platform(platform)
+
+    async def events():
+        queue, backlog = _changes.subscribe(last_event_id)
+        try:
+            yield "retry: 5000\n" + _sse("hello", {"version": _data_version(), "reset": backlog is None})
+            for event in backlog or []:
+                if narrowed := for_platform(event, requested):
+                    yield _sse("notes", narrowed, event["id"])
+            while not await request.is_disconnected():
+                try:
+                    name, event = await asyncio.wait_for(queue.get(), CHANGES_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if name == "notes" and (narrowed := for_platform(event, requested)):
+                    yield _sse("notes", narrowed, event["id"])
+                else:
+                    yield _sse("version", {"version": event["version"]})
+        finally:
+            _changes.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/changes/notify", status_code=202)
+async def changes_notify(x_notify_token: Optional[str] = Header(default=None)):
+    """Called by the ingestion job after it inserts rows: refresh now instead of at the next interval."""
+    if CHANGES_NOTIFY_TOKEN and not hmac.compare_digest(x_notify_token or "", CHANGES_NOTIFY_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid notify token")
+    for refresher in (_note_store, _suggester):
+        if refresher:
+            refresher.request_refresh()
+    return {"accepted": True, "version": _data_version()}
+
+
+# --------------- Subscriptions ---------------
+
+
+class SubscriptionRequest(BaseModel):
+    subscriber: str
+    products: list[str] = []
+    types: list[str] = []
+    keywords: list[str] = []
+    platform: Optional[str] = None
+
+
+@app.post("/api/subscriptions", status_code=201)
+def create_subscription(request: SubscriptionRequest):
+    """Be notified of new notes matching these products, types and keywords (see src/subscriptions.py)."""
+    if _matcher is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Notifications aren't available here: matching needs the note store and the ingestion job's table",
+        )
+    subscriber = request.subscriber.strip()
+    keywords = tuple(k.strip().lower() for k in request.keywords if k.strip())
+    if not subscriber:
+        raise HTTPException(status_code=400, detail="subscriber is required")
+    if not (request.products or request.types or keywords):
+        raise HTTPException(status_code=400, detail="A subscription needs at least one product, type or keyword")
+    subscription = Subscription(
+        subscriber=subscriber,
+        products=tuple(request.products),
+        types=tuple(request.types),
+        keywords=keywords,
+        platform=_resolve_platform(request.platform),
+    )
+    return _subscriptions.add(subscription).to_dict()
+
+
+@app.get("/api/subscriptions")
+def list_subscriptions(subscriber: str):
+    return {"subscriptions": [s.to_dict() for s in _subscriptions.for_subscriber(subscriber.strip())]}
+
+
+@app.delete("/api/subscriptions/{subscription_id}")
+def delete_subscription(subscription_id: str, subscriber: str):
+    if not _subscriptions.remove(subscription_id, subscriber.strip()):
+        raise HTTPException(status_code=404, detail="No such subscription")
+    return {"deleted": subscription_id}
+
+
 # --------------- Filter Options ---------------
 
 
 @app.get("/api/filter-options")
-def get_filter_options():
-    return _filter_options
+def get_filter_options(platform: Optional[str] = None):
+    platform = _resolve_platform(platform)
+    if platform not in _filter_options:
+        _filter_options[platform] = _load_filter_options(platform)
+    return _filter_options[platform]
+
+
+# --------------- Suggestions ---------------
+
+
+@app.get("/api/suggest")
+async def suggest(q: str = "", limit: int = Query(default=8, ge=1, le=20), kinds: list[str] = Query(default=[])):
+    """Ranked completions for a search-box prefix, from the in-memory index.
+
+    async on purpose: it never blocks, so it runs on the event loop instead of
+    queueing for a threadpool worker behind BigQuery-bound requests.
+    """
+    index = _suggester.index if _suggester else None
+    if index is None:
+        return {"suggestions": [], "ready": False, "version": None}
+    completions = index.complete(q, limit, kinds or None)
+    return {
+        "suggestions": [{"text": c.text, "kind": c.kind, "count": c.count} for c in completions],
+        "ready": True,
+        "version": _suggester.version,
+    }
 
 
 # --------------- Release Notes ---------------
 
 
+def _query_release_notes(types, products, start, end, search, limit, offset, platform):
+    """query_release_notes(), answered from the in-memory note store when it's loaded and can."""
+    store = _note_store.store if _note_store else None
+    if store is not None:
+        filters = NoteFilters.of(types, products, start, end, search, platform)
+        with span("note_store.query", rows=len(store)):
+            result = store.query(filters, limit, offset, _note_columns)
+        if result is not None:
+            return result
+    return query_release_notes(
+        types, products, start, end, search, limit, offset, bq_client, table_name,
+        columns=_note_columns, platform=platform,
+    )
+
+
 @app.get("/api/release-notes")
 def get_release_notes(
     types: list[str] = Query(default=[]),
@@ -88,76 +391,122 @@ def get_release_notes(
     search: str = "",
     page: int = 1,
     page_size: int = 10,
+    platform: Optional[str] = None,
 ):
     offset = (page - 1) * page_size
     start = date.fromisoformat(start_date) if start_date else None
     end = date.fromisoformat(end_date) if end_date else None
 
-    df, total = query_release_notes(
-        types, products, start, end, search, page_size, offset, bq_client, table_name
+    df, total = _query_release_notes(
+        types, products, start, end, search, page_size, offset, _resolve_platform(platform)
     )
 
     if not df.empty and "published_at" in df.columns:
         df["published_at"] = df["published_at"].astype(str)
 
-    return {"data": df.to_dict(orient="records"), "total": int(total)}
+    with span("pandas.to_dict", rows=len(df)):
+        records = df.to_dict(orient="records")
+    with span("render.attach_artifacts"):
+        records = attach_render_artifacts(records)
+    return {"data": records, "total": int(total)}
 
 
 # --------------- Insights ---------------
 
 
+def _insight_filters(
+    platform: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    types: list[str],
+    products: list[str],
+    default_months: int | None = None,
+) -> NoteFilters:
+    """Filters for an insight query; charts over time default to the trailing `default_months`."""
+    start = date.fromisoformat(start_date) if start_date else None
+    end = date.fromisoformat(end_date) if end_date else None
+    if default_months and not (start and end):
+        start, end = trailing_window(default_months, end)
+    return NoteFilters.of(types, products, start, end, platform=_resolve_platform(platform))
+
+
+def _insight_cube(filters: NoteFilters) -> CountCube | None:
+    """The note store's count cube, if it's loaded and holds `filters`' columns; else ask BigQuery."""
+    store = _note_store.store if _note_store else None
+    if store is None or not store.can_answer(filters, []):
+        return None
+    return store.cube
+
+
 @app.get("/api/insights/time-series")
-def get_time_series():
-    query = f"""
-    SELECT DATE_TRUNC(published_at, MONTH) as month, COUNT(*) as count
-    FROM `{table_name}`
-    WHERE published_at BETWEEN DATE_SUB(CURRENT_DATE(), INTERVAL 1 YEAR) AND CURRENT_DATE()
-    GROUP BY month ORDER BY month
-    """
-    df = bq_client.query(query).to_dataframe()
+def get_time_series(
+    platform: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    types: list[str] = Query(default=[]),
+    products: list[str] = Query(default=[]),
+):
+    filters = _insight_filters(platform, start_date, end_date, types, products, default_months=12)
+    cube = _insight_cube(filters)
+    if cube is not None:
+        with span("count_cube.time_series"):
+            return cube.time_series(filters)
+    df = run_query(time_series_query(table_name, filters), bq_client)
     df["month"] = df["month"].astype(str)
     return df.to_dict(orient="records")
 
 
 @app.get("/api/insights/type-distribution")
-def get_type_distribution():
-    query = f"""
-    SELECT release_note_type, COUNT(*) as count
-    FROM `{table_name}`
-    WHERE release_note_type IS NOT NULL
-    GROUP BY release_note_type ORDER BY count DESC LIMIT 10
-    """
-    df = bq_client.query(query).to_dataframe()
+def get_type_distribution(
+    platform: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    types: list[str] = Query(default=[]),
+    products: list[str] = Query(default=[]),
+):
+    filters = _insight_filters(platform, start_date, end_date, types, products)
+    cube = _insight_cube(filters)
+    if cube is not None:
+        with span("count_cube.type_distribution"):
+            return cube.type_distribution(filters)
+    df = run_query(type_distribution_query(table_name, filters), bq_client)
     return df.to_dict(orient="records")
 
 
 @app.get("/api/insights/top-products")
-def get_top_products():
-    query = f"""
-    SELECT product_name, COUNT(*) as count
-    FROM `{table_name}`
-    WHERE product_name IS NOT NULL
-    GROUP BY product_name ORDER BY count DESC LIMIT 10
-    """
-    df = bq_client.query(query).to_dataframe()
+def get_top_products(
+    platform: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    types: list[str] = Query(default=[]),
+    products: list[str] = Query(default=[]),
+):
+    filters = _insight_filters(platform, start_date, end_date, types, products)
+    cube = _insight_cube(filters)
+    if cube is not None:
+        with span("count_cube.top_products"):
+            return cube.top_products(filters)
+    df = run_query(top_products_query(table_name, filters), bq_client)
     return df.to_dict(orient="records")
 
 
 @app.get("/api/insights/heatmap")
-def get_heatmap():
-    query = f"""
-    SELECT
-        EXTRACT(DAYOFWEEK FROM published_at) as day_of_week,
-        DATE_TRUNC(published_at, WEEK) as week,
-        COUNT(*) as count
-    FROM `{table_name}`
-    WHERE published_at BETWEEN DATE_SUB(CURRENT_DATE(), INTERVAL 3 MONTH) AND CURRENT_DATE()
-    GROUP BY day_of_week, week
-    ORDER BY week, day_of_week
-    """
-    df = bq_client.query(query).to_dataframe()
-    df["week"] = df["week"].astype(str)
-    return df.to_dict(orient="records")
+def get_heatmap(
+    platform: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    types: list[str] = Query(default=[]),
+    products: list[str] = Query(default=[]),
+):
+    """Notes per day of week (rows, Sunday first) and week (columns), as {"days", "weeks", "counts"}."""
+    filters = _insight_filters(platform, start_date, end_date, types, products, default_months=3)
+    cube = _insight_cube(filters)
+    if cube is not None:
+        with span("count_cube.heatmap"):
+            return cube.heatmap(filters)
+    df = run_query(heatmap_query(table_name, filters), bq_client)
+    cells = df[["day_of_week", "week", "count"]].itertuples(index=False)
+    return heatmap_from_cells(filters.start_date, filters.end_date, cells)
 
 
 # --------------- AI ---------------
@@ -171,7 +520,6 @@ class AIQueryRequest(BaseModel):
 def ai_health():
     """Check that the model runner is reachable and the model is loaded."""
     import requests as _req
-    from src.ai import LLM_MODEL, LLM_ENDPOINT
     print(f"Checking AI health at {LLM_ENDPOINT} for model {LLM_MODEL}...")
     MODEL_ENDPOINT = f"{LLM_ENDPOINT}/v1/models" if LLM_ENDPOINT.endswith("run.app") else f"{LLM_ENDPOINT}/models"
     print(f"Model endpoint: {MODEL_ENDPOINT}")
@@ -189,36 +537,98 @@ def ai_health():
         return {"reachable": False, "model": LLM_MODEL, "url": LLM_ENDPOINT,"error": str(e)}
 
 
+@app.get("/api/ai/scheduler")
+async def ai_scheduler():
+    """Model-runner admission: slots in use, queue length, queue times and rejections (this worker)."""
+    return llm_scheduler.stats()
+
+
+@app.get("/api/ai/answer-cache")
+def ai_answer_cache():
+    """Size of the persistent answer cache for /api/ai/chat (shared by all workers)."""
+    return _answers.stats() if _answers is not None else {"enabled": False}
+
+
 @app.post("/api/ai/generate-sql")
 def generate_sql(request: AIQueryRequest):
     f"""Return the SQL generated for a natural-language question.
     {LLM_MODEL} at {LLM_ENDPOINT}
     """
 #    try:
-    sql = generate_sql_query(request.question, table_name, TABLE_SCHEMA)
+    sql = generate_sql_query(request.question, table_name, _table_schema())
     return {"sql": sql}
 #    except Exception as e:
 #        raise HTTPException(status_code=503, detail=f"AI service unavailable for {get_llm_model_name()}: {e}")
 
 
+def _result_page(df, total: int, job_id: str, location: str | None, start: int) -> dict:
+    """A page of /api/ai/query results, with where the next one starts (None at the end or the cap)."""
+    if "published_at" in df.columns:
+        df["published_at"] = df["published_at"].astype(str)
+    following = start + len(df)
+    return {
+        "rows": df.to_dict(orient="records"),
+        "total": total,
+        "start": start,
+        "job_id": job_id,
+        "location": location,
+        "next_start": following if following < min(total, AI_QUERY_MAX_ROWS) else None,
+        "truncated": total > AI_QUERY_MAX_ROWS,
+    }
+
+
 @app.post("/api/ai/query")
 def ai_query(request: AIQueryRequest):
-    """Generate SQL from a question, execute it, and return the results."""
+    """Generate SQL from a question, execute it, and return the first page of results.
+
+    Questions the intent router recognizes run a parameterized template
+    straight away; only the rest wait for the model to write SQL. Either
+    way the query runs under the AI_QUERY_* limits (src/queries.py), and
+    further pages come from GET /api/ai/query/{job_id}/rows.
+    """
+    routed = _router.route(request.question) if _router else None
+    if routed is not None:
+        query = routed.query(table_name)
+        try:
+            with span("ai.template", intent=routed.intent):
+                df, total, job = run_bounded(query.sql, bq_client, query.job_config())
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Query execution failed: {e}\n\nTemplate SQL:\n{query.sql}")
+        return {
+            "sql": query.sql,
+            "params": {p.name: p.values if hasattr(p, "values") else p.value for p in query.params},
+            **_result_page(df, total, job.job_id, job.location, 0),
+            "route": routed.intent,
+        }
+
     try:
-        sql = generate_sql_query(request.question, table_name, TABLE_SCHEMA)
+        sql = generate_sql_query(request.question, table_name, _table_schema())
+    except LLMBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"AI service unavailable: {e}")
 
     try:
-        df = bq_client.query(sql).to_dataframe()
-        if "published_at" in df.columns:
-            df["published_at"] = df["published_at"].astype(str)
-        records = df.head(50).to_dict(orient="records")
-        return {"sql": sql, "rows": records, "total": len(df)}
+        df, total, job = run_bounded(sql, bq_client)
+        return {"sql": sql, **_result_page(df, total, job.job_id, job.location, 0), "route": "llm"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Query execution failed: {e}\n\nGenerated SQL:\n{sql}")
 
 
+@app.get("/api/ai/query/{job_id}/rows")
+def ai_query_rows(job_id: str, start: int = Query(ge=0), location: Optional[str] = None):
+    """A later page of an /api/ai/query result, read from the finished job (up to AI_QUERY_MAX_ROWS)."""
+    if start >= AI_QUERY_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"Results are capped at {AI_QUERY_MAX_ROWS} rows")
+    try:
+        df, total = query_page(bq_client, job_id, start, location)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NotFound:
+        raise HTTPException(status_code=404, detail=f"No such query job (or its results expired): {job_id}")
+    return _result_page(df, total, job_id, location, start)
+
+
 # --------------- AI Chat (natural-language summarisation) ---------------
 
 
@@ -228,18 +638,39 @@ class AIChatRequest(BaseModel):
     types: list[str] = []
     start_date: Optional[str] = None
     end_date: Optional[str] = None
+    platform: Optional[str] = None
 
 
 @app.post("/api/ai/chat")
 def ai_chat(request: AIChatRequest):
-    """Fetch release notes matching the filters and answer the question in plain language."""
+    """Fetch release notes matching the filters and answer the question in plain language.
+
+    Answers are cached per question, filter scope and data version (src/answer_cache.py).
+    """
+    platform = _resolve_platform(request.platform)
+    version = _data_version()
+    key = None
+    if _answers is not None and version is not None:
+        scope = {
+            "types": request.types,
+            "products": request.products,
+            "start_date": request.start_date,
+            "end_date": request.end_date,
+            "platform": platform,
+        }
+        key = answer_key(request.question, scope, version, LLM_MODEL)
+        with span("answer_cache.get") as current:
+            cached = _answers.get(key)
+            set_attributes(current, **{"answer_cache.hit": cached is not None})
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    llm_scheduler.check(PRIORITY_SUMMARY)  # 429 before fetching notes the model couldn't get to
     # try:
     start = date.fromisoformat(request.start_date) if request.start_date else None
     end   = date.fromisoformat(request.end_date)   if request.end_date   else None
 
-    df, total = query_release_notes(
-        request.types, request.products, start, end, "", 100, 0, bq_client, table_name
-    )
+    df, total = _query_release_notes(request.types, request.products, start, end, "", 100, 0, platform)
 
     if df.empty:
         return {
@@ -255,7 +686,10 @@ def ai_chat(request: AIChatRequest):
         df["published_at"] = df["published_at"].astype(str)
 
     answer = summarize_release_notes(request.question, df, len(df), int(total))
-    return {"answer": answer, "count": len(df), "total": int(total)}
+    result = {"answer": answer, "count": len(df), "total": int(total)}
+    if key is not None:
+        _answers.put(key, result)
+    return {**result, "cached": False}
 
     # except Exception as e:
     #     raise HTTPException(status_code=503, detail=f"AI chat unavailable: {e}, Exception type: {type(e)}")
@@ -6,6 +6,9 @@ import re
 import requests
 from openai import OpenAI
 
+from src.llm_scheduler import PRIORITY_SQL, PRIORITY_SUMMARY, scheduler
+from src.tracing import set_attributes, span
+
 _TAG_RE = re.compile(r"<[^>]+>")
 
 # Injected automatically by Docker Compose when using the `models:` key.
@@ -40,30 +43,72 @@ When answering:
 """
 
 
-def summarize_release_notes(
-    question: str,
-    notes_df,          # pd.DataFrame
-    shown: int,
-    total: int,
-) -> str:
-    """Answer a natural-language question grounded in release note rows."""
+def _chat(operation: str, priority: int, **kwargs):
+    """chat.completions.create() on LLM_MODEL, once the scheduler admits it; traced as one client span.
+
+    Raises llm_scheduler.LLMBusy when the model runner's queue is full.
+    """
+    attributes = {
+        "gen_ai.system": "openai",
+        "gen_ai.operation.name": operation,
+        "gen_ai.request.model": LLM_MODEL,
+        "server.address": LLM_ENDPOINT,
+        "gen_ai.prompt.chars": sum(len(m["content"]) for m in kwargs["messages"]),
+    }
+    with span(f"llm.chat {operation}", kind="client", **attributes) as current, scheduler.slot(priority) as queued:
+        response = client.chat.completions.create(model=LLM_MODEL, **kwargs)
+        usage = getattr(response, "usage", None)
+        set_attributes(
+            current,
+            **{
+                "llm.queue_ms": round(queued * 1000, 1),
+                "gen_ai.response.model": getattr(response, "model", None),
+                "gen_ai.usage.input_tokens": getattr(usage, "prompt_tokens", None),
+                "gen_ai.usage.output_tokens": getattr(usage, "completion_tokens", None),
+            },
+        )
+        return response
+
+
+def build_summary_prompt(question: str, notes_df, shown: int, total: int) -> str:
+    """Assemble the user prompt for summarize_release_notes() from release note rows.
+
+    The notes come first, in a fixed order, and the question last: asking
+    something else about the same notes then sends the same prompt prefix
+    (system prompt + notes), which the model runner's prompt cache reuses.
+    """
+    order = [c for c in ("published_at", "product_name", "release_note_type", "description") if c in notes_df.columns]
+    notes_df = notes_df.sort_values(order, ascending=[c != "published_at" for c in order], kind="stable")
     lines = []
     for _, row in notes_df.iterrows():
         pub = str(row["published_at"])[:10]
-        desc = _TAG_RE.sub("", str(row.get("description", "") or "")).strip()
+        desc = row.get("description_text")
+        if not isinstance(desc, str):
+            desc = _TAG_RE.sub("", str(row.get("description", "") or "")).strip()
         lines.append(
             f"[{row['release_note_type']}] {row['product_name']} ({pub})\n{desc}"
         )
     notes_text = "\n\n---\n\n".join(lines)
 
-    user_prompt = (
+    return (
         f"Here are {shown} GCP release notes (out of {total:,} total matching "
         f"the active filters):\n\n{notes_text}\n\n"
         f"Question: {question}\n\nAnswer:"
     )
 
-    response = client.chat.completions.create(
-        model=LLM_MODEL,
+
+def summarize_release_notes(
+    question: str,
+    notes_df,          # pd.DataFrame
+    shown: int,
+    total: int,
+) -> str:
+    """Answer a natural-language question grounded in release note rows."""
+    with span("llm.build_prompt", rows=len(notes_df)):
+        user_prompt = build_summary_prompt(question, notes_df, shown, total)
+    response = _chat(
+        "summarize",
+        PRIORITY_SUMMARY,
         messages=[
             {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user",   "content": user_prompt},
@@ -87,10 +132,13 @@ Rules:
 - Output only the SQL query, no explanation or markdown fences
 - Wrap the table name in backticks
 - Use standard BigQuery SQL syntax
-- Handle case sensitivity with LOWER() where appropriate"""
+- Handle case sensitivity with LOWER() where appropriate
+- When the question implies a time range, filter published_at against literal DATE bounds
+  (the table may be partitioned on it)"""
 
-    response = client.chat.completions.create(
-        model=LLM_MODEL,
+    response = _chat(
+        "generate_sql",
+        PRIORITY_SQL,
         messages=[
             {"role": "user", "content": prompt}
         ]
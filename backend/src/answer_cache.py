@@ -0,0 +1,117 @@
+"""Persistent cache of /api/ai/chat answers, keyed by question, filter scope and data version.
+
+A summary only depends on the question, the notes it's grounded in and
+the model, and the notes only change with the filters or the table's
+data version. So an answer is stored under a hash of
+
+  the normalized question (lowercased, whitespace collapsed, trailing
+  punctuation dropped), the filter scope (sorted types and products,
+  dates, platform), the data version and LLM_MODEL
+
+and asked again — the Ask AI tab's suggested questions especially — it
+is served from here without querying notes or waking the model. New data
+means a new version and so new keys; old entries age out.
+
+It's a SQLite file (ANSWER_CACHE_PATH), so it survives restarts and is
+shared by every uvicorn worker (WAL mode). Entries are evicted least
+recently used first once the answers add up to ANSWER_CACHE_MAX_MB.
+ANSWER_CACHE=none disables it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE = os.environ.get("ANSWER_CACHE", "sqlite").lower()
+ANSWER_CACHE_PATH = os.environ.get("ANSWER_CACHE_PATH") or str(
+    Path(__file__).resolve().parent.parent / "answer_cache.sqlite"
+)
+ANSWER_CACHE_MAX_MB = float(os.environ.get("ANSWER_CACHE_MAX_MB", "50"))
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    return _SPACE_RE.sub(" ", question).strip().rstrip("?.!").strip().lower()
+
+
+def answer_key(question: str, scope: dict, version: str, model: str) -> str:
+    """Hash of everything an answer depends on; `scope` values may be lists (order doesn't matter)."""
+    canonical = {k: sorted(v) if isinstance(v, (list, tuple)) else v for k, v in sorted(scope.items())}
+    payload = json.dumps([normalize_question(question), canonical, version, model], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    def __init__(self, path: str = ANSWER_CACHE_PATH, max_bytes: int = int(ANSWER_CACHE_MAX_MB * 1024 * 1024)):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS answers_used_at ON answers (used_at)")
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread: FastAPI runs sync endpoints on a threadpool.
+        db = getattr(self._local, "db", None)
+        if db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get(self, key: str) -> dict | None:
+        with self._db() as db:
+            row = db.execute("SELECT value FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE answers SET used_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict) -> None:
+        data = json.dumps(value)
+        now = time.time()
+        with self._db() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO answers (key, value, size, created_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now),
+            )
+            self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM answers").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Least recently used first, down to 90% of the budget so eviction isn't needed on every put.
+        excess, evicted = total - int(self.max_bytes * 0.9), 0
+        for key, size in db.execute("SELECT key, size FROM answers ORDER BY used_at").fetchall():
+            if excess <= 0:
+                break
+            db.execute("DELETE FROM answers WHERE key = ?", (key,))
+            excess -= size
+            evicted += 1
+        logger.info("Answer cache over %d bytes: evicted %d entries", self.max_bytes, evicted)
+
+    def stats(self) -> dict:
+        with self._db() as db:
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM answers").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+
+def answer_cache() -> AnswerCache | None:
+    """The answer cache, or None with ANSWER_CACHE=none."""
+    return None if ANSWER_CACHE == "none" else AnswerCache()
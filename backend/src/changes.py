@@ -0,0 +1,104 @@
+"""Push notification of new release notes: the data behind /api/changes/stream.
+
+Each time the note store swaps in a new snapshot, observe() diffs its
+per-(platform, product) counts against the previous snapshot's and, if
+notes were added, publishes an event to every connected stream:
+
+  {"id": <data version>, "version": ..., "at": ..., "total": 12,
+   "counts": {"GCP": {"BigQuery": 3, ...}, ...}}
+
+Snapshots that add no notes (including the first a worker sees, which is
+only a baseline) publish a bare `version` event instead, so clients can
+follow the data version without polling for it. `notes` events are keyed by
+data version, which every worker agrees on, so a client reconnecting with
+Last-Event-ID — possibly to another worker — is replayed what it missed
+from the last CHANGES_HISTORY events, or told to reset when that version
+is no longer in the history.
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+CHANGES_HISTORY = int(os.environ.get("CHANGES_HISTORY", "50"))
+CHANGES_QUEUE_SIZE = 100
+
+
+class ChangeFeed:
+    def __init__(self, history: int = CHANGES_HISTORY):
+        self.version: str | None = None
+        self._counts: dict[tuple[str, str], int] | None = None
+        self._events: deque[dict] = deque(maxlen=history)
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, version: str, counts: dict[tuple[str, str], int]) -> dict | None:
+        """Record a snapshot's counts and publish it; returns the `notes` event, if notes were added."""
+        with self._lock:
+            previous, self._counts, self.version = self._counts, counts, version
+            added: dict[str, dict[str, int]] = {}
+            for (platform, product), count in counts.items() if previous is not None else ():
+                delta = count - previous.get((platform, product), 0)
+                if delta > 0:
+                    added.setdefault(platform, {})[product] = delta
+            subscribers = list(self._subscribers.items())
+            if not added:
+                self._publish(subscribers, ("version", {"version": version}))
+                return None
+            event = {
+                "id": version,
+                "version": version,
+                "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "total": sum(n for products in added.values() for n in products.values()),
+                "counts": added,
+            }
+            self._events.append(event)
+        self._publish(subscribers, ("notes", event))
+        return event
+
+    @staticmethod
+    def _publish(subscribers, item: tuple[str, dict]) -> None:
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(_offer, queue, item)
+
+    def subscribe(self, last_event_id: str | None = None) -> tuple[asyncio.Queue, list[dict] | None]:
+        """A queue of future (name, data) events, plus the `notes` events after `last_event_id`.
+
+        The backlog is None when `last_event_id` is no longer (or not yet)
+        in the history — the client has to start over from the current version.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CHANGES_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+            if not last_event_id or last_event_id == self.version:
+                return queue, []
+            ids = [e["id"] for e in self._events]
+            if last_event_id not in ids:
+                return queue, None
+            return queue, list(self._events)[ids.index(last_event_id) + 1 :]
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+
+def _offer(queue: asyncio.Queue, item: tuple[str, dict]) -> None:
+    # A client too slow to drain 100 events loses the newest; it can reconnect with Last-Event-ID.
+    if not queue.full():
+        queue.put_nowait(item)
+
+
+def for_platform(event: dict, platform: str | None) -> dict | None:
+    """`event` narrowed to one platform's counts (None if it added none there)."""
+    if platform is None:
+        return event
+    counts = event["counts"].get(platform)
+    if not counts:
+        return None
+    return {**event, "total": sum(counts.values()), "counts": {platform: counts}}
@@ -0,0 +1,273 @@
+"""Note counts per day × product × type, for the insight charts under any filter.
+
+The four insight aggregates (monthly volume, type mix, top products, the
+weekday × week heatmap) are all sums of one dense int32 array:
+
+  counts[day, key, type]      notes published on `day` (days since the
+                              cube's first day) for product key `key`
+                              — a (platform, product) pair, so a platform
+                              filter is a mask over the same axis as a
+                              product filter — and note type `type`
+
+plus `monthly`, the same counts summed per calendar month, and
+`undated`, the notes without a published_at (counted only when there's
+no date window, as the SQL does). NULL products and types get their own
+slot, so totals match COUNT(*) and the charts that exclude them just
+skip it. A filter becomes a day range and two 0/1 masks, and every
+chart is a masked sum over the slice (whole months from `monthly`): no
+rows are touched, so an insight for any combination of platform,
+products, types and dates costs microseconds to a millisecond instead
+of a BigQuery job.
+
+NoteStore builds the cube from its table and, on extend(), updates a
+copy with just the added (and replaced) rows — see CountCube.updated().
+"""
+
+import datetime
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.query_builder import NoteFilters
+
+_EPOCH = datetime.date(1970, 1, 1)
+_NO_DATE = np.iinfo(np.int32).min
+# BigQuery's EXTRACT(DAYOFWEEK) order, and DATE_TRUNC(..., WEEK) starts weeks on Sunday.
+DAY_LABELS = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+
+
+def _day(value: datetime.date) -> int:
+    return (value - _EPOCH).days
+
+
+def _date(day: int) -> datetime.date:
+    return _EPOCH + datetime.timedelta(days=int(day))
+
+
+def _months(days: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 of each day in `days` (days since the epoch)."""
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+
+
+def _column(table: pa.Table, name: str) -> list:
+    if name not in table.column_names:
+        return [None] * len(table)
+    return table.column(name).to_pylist()
+
+
+def _heatmap_matrix(first_day: int, daily: np.ndarray) -> dict:
+    """Per-day counts from `first_day` on as a day-of-week × week matrix, ready for a heatmap.
+
+    Weeks start on Sunday; days before the window in its first week and
+    after it in its last are 0.
+    """
+    lead = (first_day + 4) % 7  # 1970-01-01 was a Thursday
+    weeks = (lead + len(daily) + 6) // 7
+    grid = np.zeros(weeks * 7, dtype=np.int64)
+    grid[lead : lead + len(daily)] = daily
+    week_starts = first_day - lead + 7 * np.arange(weeks)
+    return {
+        "days": DAY_LABELS,
+        "weeks": [str(_date(d)) for d in week_starts],
+        "counts": grid.reshape(weeks, 7).T.tolist(),
+    }
+
+
+def heatmap_from_cells(start: datetime.date, end: datetime.date, cells: Iterable[tuple]) -> dict:
+    """heatmap_query()'s (day_of_week, week, count) rows as the matrix CountCube.heatmap() returns."""
+    first_day = _day(start)
+    daily = np.zeros(max(_day(end) - first_day + 1, 0), dtype=np.int64)
+    for day_of_week, week, count in cells:
+        i = _day(pd.Timestamp(week).date()) + int(day_of_week) - 1 - first_day
+        if 0 <= i < len(daily):
+            daily[i] = count
+    return _heatmap_matrix(first_day, daily)
+
+
+def _rows(table: pa.Table) -> tuple[np.ndarray, list, list]:
+    """Each row's day (_NO_DATE without a published_at), (platform, product) key and type."""
+    days = pc.cast(table.column("published_at"), pa.date32()).cast(pa.int32()).fill_null(_NO_DATE).to_numpy()
+    keys = list(zip(_column(table, "platform"), _column(table, "product_name")))
+    return days, keys, _column(table, "release_note_type")
+
+
+class CountCube:
+    """Immutable; from_table() to build, updated() for a copy with more rows."""
+
+    def __init__(
+        self,
+        first_day: int,
+        counts: np.ndarray,
+        undated: np.ndarray,
+        keys: list[tuple[str | None, str | None]],
+        types: list[str | None],
+    ):
+        self.first_day = first_day
+        self.counts = counts
+        self.undated = undated
+        self.keys = keys
+        self.types = types
+        self._key_index = {key: i for i, key in enumerate(keys)}
+        self._type_index = {t: i for i, t in enumerate(types)}
+        self._products = sorted({p for _, p in keys if p is not None})
+        # Product of each key, as an index into _products (-1: NULL), to merge platforms.
+        product_index = {p: i for i, p in enumerate(self._products)}
+        self._key_product = np.array([product_index.get(p, -1) for _, p in keys], dtype=np.int64)
+        # Month (since 1970-01) of each day; days are contiguous, so is every month in between.
+        self._month = _months(np.arange(first_day, first_day + len(counts)))
+        self.first_month = int(self._month[0]) if len(counts) else 0
+        self._per_day = counts.sum(axis=(1, 2), dtype=np.int64)
+        if len(counts):
+            starts = np.flatnonzero(np.r_[True, self._month[1:] != self._month[:-1]])
+            self.monthly = np.add.reduceat(counts, starts, axis=0)
+        else:
+            self.monthly = np.zeros_like(counts)
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> "CountCube":
+        empty = cls(0, np.zeros((0, 0, 0), dtype=np.int32), np.zeros((0, 0), dtype=np.int32), [], [])
+        return empty.updated(table)
+
+    def updated(self, added: pa.Table, removed: pa.Table | None = None) -> "CountCube":
+        """A new cube with `added`'s rows counted and `removed`'s taken out.
+
+        Only those rows are counted; the arrays are copied into ones grown
+        to any days, products or types the cube hasn't seen.
+        """
+        rows = _rows(added)
+        days, keys, types = rows
+        new_keys = sorted(set(keys) - set(self._key_index), key=lambda k: (k[0] or "", k[1] or ""))
+        new_types = sorted(set(types) - set(self._type_index), key=lambda t: t or "")
+        dated = days[days != _NO_DATE]
+        spans = [(int(dated.min()), int(dated.max()))] if len(dated) else []
+        if len(self.counts):
+            spans.append((self.first_day, self.first_day + len(self.counts) - 1))
+        first_day = min(s[0] for s in spans) if spans else 0
+        last_day = max(s[1] for s in spans) if spans else -1
+
+        counts = np.zeros(
+            (last_day - first_day + 1, len(self.keys) + len(new_keys), len(self.types) + len(new_types)),
+            dtype=np.int32,
+        )
+        before = self.first_day - first_day
+        counts[before : before + len(self.counts), : len(self.keys), : len(self.types)] = self.counts
+        undated = np.zeros(counts.shape[1:], dtype=np.int32)
+        undated[: len(self.keys), : len(self.types)] = self.undated
+        key_index = {key: i for i, key in enumerate(self.keys + new_keys)}
+        type_index = {t: i for i, t in enumerate(self.types + new_types)}
+        for batch, sign in [(rows, 1), (_rows(removed) if removed is not None else None, -1)]:
+            if batch is None or not len(batch[0]):
+                continue
+            days, keys, types = batch
+            key_codes = np.array([key_index[k] for k in keys], dtype=np.int64)
+            type_codes = np.array([type_index[t] for t in types], dtype=np.int64)
+            on = days != _NO_DATE
+            np.add.at(counts, (days[on] - first_day, key_codes[on], type_codes[on]), sign)
+            np.add.at(undated, (key_codes[~on], type_codes[~on]), sign)
+        return CountCube(first_day, counts, undated, self.keys + new_keys, self.types + new_types)
+
+    # --------------- Slicing ---------------
+
+    def _masks(self, filters: NoteFilters) -> tuple[np.ndarray, np.ndarray]:
+        """0/1 weights over the key and type axes for `filters`."""
+        products = set(filters.products)
+        key_mask = np.array(
+            [
+                (not filters.platform or platform == filters.platform) and (not products or product in products)
+                for platform, product in self.keys
+            ],
+            dtype=np.int32,
+        )
+        wanted = set(filters.types)
+        type_mask = np.array([not wanted or t in wanted for t in self.types], dtype=np.int32)
+        return key_mask, type_mask
+
+    def _window(self, filters: NoteFilters) -> tuple[int, int] | None:
+        """Cube rows [lo, hi) inside the filters' dates, or None for no date window."""
+        if not (filters.start_date and filters.end_date):
+            return None
+        lo = min(max(_day(filters.start_date) - self.first_day, 0), len(self.counts))
+        hi = min(max(_day(filters.end_date) - self.first_day + 1, lo), len(self.counts))
+        return lo, hi
+
+    def _daily(self, filters: NoteFilters, lo: int, hi: int) -> np.ndarray:
+        """Notes per day in [lo, hi) matching the filters' platform, products and types."""
+        key_mask, type_mask = self._masks(filters)
+        if key_mask.all() and type_mask.all():
+            return self._per_day[lo:hi]
+        keys = np.flatnonzero(key_mask)
+        if len(keys) * 2 < len(key_mask):
+            # Gather just the wanted keys: a product filter usually leaves a handful.
+            return np.einsum("dkt,t->d", self.counts[lo:hi, keys], type_mask)
+        return np.einsum("dkt,k,t->d", self.counts[lo:hi], key_mask, type_mask)
+
+    def _totals(self, filters: NoteFilters) -> np.ndarray:
+        """Counts per (key, type) over the filters' dates, NULL slots included."""
+        window = self._window(filters)
+        if window is None:
+            return self.monthly.sum(axis=0, dtype=np.int64) + self.undated
+        lo, hi = window
+        if hi <= lo:
+            return np.zeros(self.counts.shape[1:], dtype=np.int64)
+        # Whole months from the monthly sums, the days of partial months at either end one by one.
+        month = self._month
+        month_lo = month[lo] + (0 if lo == 0 or month[lo - 1] != month[lo] else 1)
+        month_hi = month[hi - 1] + (1 if hi == len(month) or month[hi] != month[hi - 1] else 0)
+        if month_hi <= month_lo:
+            return self.counts[lo:hi].sum(axis=0, dtype=np.int64)
+        edge_lo, edge_hi = np.searchsorted(month, [month_lo, month_hi])
+        total = self.monthly[month_lo - self.first_month : month_hi - self.first_month].sum(axis=0, dtype=np.int64)
+        total += self.counts[lo:edge_lo].sum(axis=0, dtype=np.int64)
+        total += self.counts[edge_hi:hi].sum(axis=0, dtype=np.int64)
+        return total
+
+    # --------------- Insights ---------------
+
+    def time_series(self, filters: NoteFilters) -> list[dict]:
+        """Monthly note counts, like time_series_query(): months without notes are left out."""
+        lo, hi = self._window(filters) or (0, len(self.counts))
+        if hi <= lo:
+            return []
+        per_month = np.bincount(
+            self._month[lo:hi] - self._month[lo], weights=self._daily(filters, lo, hi)
+        ).astype(np.int64)
+        first = int(self._month[lo])
+        return [
+            {"month": f"{(first + m) // 12 + 1970:04d}-{(first + m) % 12 + 1:02d}-01", "count": int(n)}
+            for m, n in enumerate(per_month)
+            if n
+        ]
+
+    def type_distribution(self, filters: NoteFilters, limit: int = 10) -> list[dict]:
+        key_mask, type_mask = self._masks(filters)
+        per_type = key_mask @ self._totals(filters) * type_mask
+        return self._top(per_type, self.types, "release_note_type", limit)
+
+    def top_products(self, filters: NoteFilters, limit: int = 10) -> list[dict]:
+        key_mask, type_mask = self._masks(filters)
+        per_key = self._totals(filters) @ type_mask * key_mask
+        named = self._key_product >= 0
+        # Summed over platforms, as GROUP BY product_name does.
+        per_product = np.bincount(self._key_product[named], weights=per_key[named], minlength=len(self._products))
+        return self._top(per_product.astype(np.int64), self._products, "product_name", limit)
+
+    @staticmethod
+    def _top(counts: np.ndarray, labels: list, column: str, limit: int) -> list[dict]:
+        """The `limit` largest non-zero counts with a non-NULL label, largest first (ties by label)."""
+        order = sorted(
+            (i for i in np.flatnonzero(counts) if labels[i] is not None), key=lambda i: (-counts[i], labels[i])
+        )
+        return [{column: labels[i], "count": int(counts[i])} for i in order[:limit]]
+
+    def heatmap(self, filters: NoteFilters) -> dict:
+        """The filters' date window as a day-of-week × week matrix (it needs one: the endpoint defaults it)."""
+        start, end = _day(filters.start_date), _day(filters.end_date)
+        daily = np.zeros(max(end - start + 1, 0), dtype=np.int64)
+        lo, hi = self._window(filters)
+        if hi > lo:
+            offset = self.first_day + lo - start
+            daily[offset : offset + hi - lo] = self._daily(filters, lo, hi)
+        return _heatmap_matrix(start, daily)
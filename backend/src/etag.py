@@ -0,0 +1,66 @@
+"""Conditional GET for the read endpoints: strong ETags from the data version.
+
+A response's ETag hashes the table's data version, the request path and
+its (sorted) query string, and today's date — the insight endpoints
+default to trailing windows ending today. As long as none of those
+change, neither does the response, so a client that sends the ETag back
+in If-None-Match gets an empty 304 instead of a recomputed body.
+
+The data version is the one the background refreshers last saw (see
+app._data_version()); before they have seen one, responses go out
+without an ETag.
+"""
+
+import hashlib
+from datetime import date
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode
+
+
+def make_etag(version: str, path: str, query_string: str) -> str:
+    query = urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+    key = f"{version}\n{date.today().isoformat()}\n{path}?{query}"
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored, `*` matches anything."""
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware: ETag + Cache-Control: no-cache on 200s, 304 on a matching If-None-Match."""
+
+    def __init__(self, app, version: Callable[[], str | None], paths: tuple[str, ...]):
+        self.app = app
+        self.version = version
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+        version = self.version()
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = make_etag(version, scope["path"], scope["query_string"].decode("latin-1"))
+        headers = [(b"etag", etag.encode("latin-1")), (b"cache-control", b"no-cache")]
+        if_none_match = dict(scope["headers"]).get(b"if-none-match")
+        if if_none_match and etag_matches(if_none_match.decode("latin-1"), etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": list(message.get("headers", [])) + headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
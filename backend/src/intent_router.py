@@ -0,0 +1,274 @@
+"""Answer common Ask AI questions from parameterized SQL templates, without the model.
+
+Most questions sent to /api/ai/query have one of a few shapes — "breaking
+changes for Cloud Run in the last 30 days", "how many features per
+product this year", "deprecations by month since January". The
+IntentRouter pulls the pieces out of the question with plain matching:
+
+  - products, from the filter options (plus a few common acronyms),
+  - note types, by name, plural or synonym ("deprecated", "bug fixes");
+    a type named like a plain word for release notes ("changes",
+    "announcements") only when qualified ("change notes"),
+  - a platform, when the table has several,
+  - a date window ("last 30 days", "this year", "in March 2025",
+    "since 2024-06-01", "between ... and ..."),
+  - a grouping ("per product", "by type", "monthly") or a count
+    ("how many"), and "top N";
+
+and turns them into NoteFilters for one of the query_builder templates
+(the listing, the count, or the insight aggregates). It only routes a
+question when every word is accounted for: anything it doesn't
+understand ("... that affect GPUs", "... I need to act on") goes to the
+model as before, so a template never answers a narrower or broader
+question than the one asked. INTENT_ROUTER=off sends everything to the
+model.
+"""
+
+import calendar
+import datetime
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+from src.queries import AI_QUERY_MAX_ROWS
+from src.query_builder import (
+    BuiltQuery,
+    NoteFilters,
+    count_query,
+    release_notes_query,
+    time_series_query,
+    top_products_query,
+    trailing_window,
+    type_distribution_query,
+)
+
+INTENT_ROUTER = os.environ.get("INTENT_ROUTER", "on").lower()
+
+# intent -> (table_name, filters, limit) -> query
+TEMPLATES: dict[str, Callable[[str, NoteFilters, int], BuiltQuery]] = {
+    "list_notes": lambda table, filters, limit: release_notes_query(table, filters, limit, 0),
+    "count": lambda table, filters, limit: count_query(table, filters),
+    "count_by_product": lambda table, filters, limit: top_products_query(table, filters, limit),
+    "count_by_type": lambda table, filters, limit: type_distribution_query(table, filters, limit),
+    "count_by_month": lambda table, filters, limit: time_series_query(table, filters),
+}
+
+_PRODUCT_ALIASES = {
+    "gke": "Google Kubernetes Engine",
+    "gce": "Compute Engine",
+    "gcs": "Cloud Storage",
+    "iam": "Identity and Access Management",
+    "pubsub": "Pub/Sub",
+}
+# Extra ways to name a type, keyed by the type's normalized name ("breaking change").
+_TYPE_SYNONYMS = {
+    "breaking change": ["breaking"],
+    "deprecation": ["deprecated", "deprecating"],
+    "fix": ["fixes", "fixed", "bug fix", "bug fixes", "bugfixes"],
+    "feature": ["new features"],
+    "issue": ["known issue", "known issues", "problems"],
+    "announcement": ["announced"],
+}
+
+_GROUPINGS = [
+    ("count_by_product", re.compile(r"\b(?:per|by|each|every|which|what|top|most)\s+(?:\w+\s+)?(?:products?|services?)\b|\bproducts?\s+(?:with|had|have|has)\s+the\s+most\b")),
+    ("count_by_type", re.compile(r"\b(?:per|by|each|every)\s+(?:note\s+|release\s+)?(?:types?|kinds?|categor(?:y|ies))\b|\btype\s+(?:mix|breakdown)\b")),
+    ("count_by_month", re.compile(r"\b(?:per|by|each|every)\s+month\b|\bmonthly\b|\bover\s+time\b|\btrend\b")),
+]
+_COUNT_RE = re.compile(r"\bhow\s+many\b|\bnumber\s+of\b|\bcount\b|\btotal\b")
+_TOP_RE = re.compile(r"\btop\s+(\d{1,2})\b")
+
+_MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+_MONTH = "(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_ISO = r"(\d{4}-\d{2}-\d{2})"
+_UNIT_DAYS = {"day": 1, "week": 7}
+
+# Words that carry no filter: question scaffolding, and what the templates answer anyway.
+_FILLER = set(
+    """
+    a about all an and any anything are as at be been by can did do does during each every for from
+    get give had has have how i in is it its list many me most much new newest latest recent recently
+    number of on or over per please show since so summarize summary tell that the their there these
+    this those to total count top was were what whats when which with within ago s
+    release releases released note notes update updates change changes changed announcement announcements
+    product products service services type types kind kinds category categories month months monthly
+    time trend breakdown mix
+    google cloud gcp platform
+    """.split()
+)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class RoutedQuestion:
+    """A question the router understood: which template, with which filters."""
+
+    intent: str
+    filters: NoteFilters
+    limit: int = AI_QUERY_MAX_ROWS
+
+    def query(self, table_name: str) -> BuiltQuery:
+        return TEMPLATES[self.intent](table_name, self.filters, self.limit)
+
+
+def _alternation(phrases) -> re.Pattern:
+    # Longest first, so "cloud run functions" can't be eaten as "cloud run" + leftovers.
+    body = "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf"(?<![a-z0-9])(?:{body})(?![a-z0-9])")
+
+
+def _trailing(n: int, unit: str, today: datetime.date) -> tuple[datetime.date, datetime.date]:
+    if unit in _UNIT_DAYS:
+        return today - datetime.timedelta(days=n * _UNIT_DAYS[unit]), today
+    return trailing_window(n * (12 if unit == "year" else 1), today)
+
+
+def _month_start(year: int, month: int) -> datetime.date:
+    return datetime.date(year, month, 1)
+
+
+def _month_end(year: int, month: int) -> datetime.date:
+    return datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+class IntentRouter:
+    def __init__(self, products: list[str], types: list[str], platforms: list[str] | None = None):
+        self._products = {p.lower(): p for p in products}
+        self._products.update({a: p for a, p in _PRODUCT_ALIASES.items() if p in products})
+        self._types = {}
+        # Type variants that are also filler ("what changed" asks about any note,
+        # not the CHANGE type): only "change notes" filters, a bare "changes" goes
+        # to the model.
+        self._ambiguous = set()
+        for note_type in types:
+            name = note_type.lower().replace("_", " ")
+            for variant in [name, name + "s", name + "es"] + _TYPE_SYNONYMS.get(name, []):
+                if variant in _FILLER:
+                    self._ambiguous.add(variant)
+                    for qualified in (f"{variant} note", f"{variant} notes"):
+                        self._types.setdefault(qualified, note_type)
+                else:
+                    self._types.setdefault(variant, note_type)
+        self._platforms = {p.lower(): p for p in platforms or ()}
+        self._product_re = _alternation(self._products) if self._products else None
+        self._type_re = _alternation(self._types) if self._types else None
+        self._platform_re = _alternation(self._platforms) if self._platforms else None
+
+    # --------------- Extraction ---------------
+
+    @staticmethod
+    def _take(pattern: re.Pattern | None, text: str) -> tuple[list[re.Match], str]:
+        """All matches of `pattern`, and `text` with them blanked out."""
+        if pattern is None:
+            return [], text
+        found = list(pattern.finditer(text))
+        return found, pattern.sub(" ", text)
+
+    def _dates(self, text: str, today: datetime.date) -> tuple[tuple | None, str]:
+        """The first date window in `text` ((start, end) or None), and `text` without it."""
+        rules = [
+            (rf"\bbetween\s+{_ISO}\s+and\s+{_ISO}\b|\bfrom\s+{_ISO}\s+to\s+{_ISO}\b", self._between),
+            (r"\b(?:in\s+the\s+|over\s+the\s+|during\s+the\s+)?(?:last|past)\s+(\d{1,3})\s+(day|week|month|year)s?\b", self._trailing),
+            (r"\b(?:in\s+the\s+|over\s+the\s+|during\s+the\s+)?past\s+(day|week|month|year)\b", self._past_one),
+            (r"\b(?:in\s+|during\s+)?(this|last|previous)\s+(week|month|year)\b", self._calendar),
+            (r"\byear\s+to\s+date\b|\bytd\b", lambda m, t: (datetime.date(t.year, 1, 1), t)),
+            (r"\btoday\b", lambda m, t: (t, t)),
+            (r"\byesterday\b", lambda m, t: (t - datetime.timedelta(days=1),) * 2),
+            (rf"\bsince\s+(?:{_ISO}|{_MONTH}\s*(\d{{4}})?|(\d{{4}}))\b", self._since),
+            (rf"\b(?:in|during)\s+{_MONTH}\s*(\d{{4}})?\b", self._in_month),
+            (r"\b(?:in|during)\s+(\d{4})\b", lambda m, t: (datetime.date(int(m[1]), 1, 1), datetime.date(int(m[1]), 12, 31))),
+        ]
+        for pattern, window in rules:
+            match = re.search(pattern, text)
+            if match:
+                return window(match, today), text[: match.start()] + " " + text[match.end():]
+        return None, text
+
+    @staticmethod
+    def _between(m: re.Match, today: datetime.date) -> tuple:
+        first, second = (m[1], m[2]) if m[1] else (m[3], m[4])
+        return datetime.date.fromisoformat(first), datetime.date.fromisoformat(second)
+
+    @staticmethod
+    def _trailing(m: re.Match, today: datetime.date) -> tuple:
+        return _trailing(int(m[1]), m[2], today)
+
+    @staticmethod
+    def _past_one(m: re.Match, today: datetime.date) -> tuple:
+        return _trailing(1, m[1], today)
+
+    @staticmethod
+    def _calendar(m: re.Match, today: datetime.date) -> tuple:
+        which, unit = m[1], m[2]
+        if unit == "week":
+            monday = today - datetime.timedelta(days=today.weekday())
+            if which == "this":
+                return monday, today
+            return monday - datetime.timedelta(days=7), monday - datetime.timedelta(days=1)
+        if unit == "year":
+            year = today.year if which == "this" else today.year - 1
+            return datetime.date(year, 1, 1), min(today, datetime.date(year, 12, 31))
+        if which == "this":
+            return _month_start(today.year, today.month), today
+        year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+        return _month_start(year, month), _month_end(year, month)
+
+    @staticmethod
+    def _since(m: re.Match, today: datetime.date) -> tuple:
+        if m[1]:
+            return datetime.date.fromisoformat(m[1]), today
+        if m[4]:
+            return datetime.date(int(m[4]), 1, 1), today
+        month = _MONTHS[m[2]]
+        year = int(m[3]) if m[3] else (today.year if month <= today.month else today.year - 1)
+        return _month_start(year, month), today
+
+    @staticmethod
+    def _in_month(m: re.Match, today: datetime.date) -> tuple:
+        month = _MONTHS[m[1]]
+        year = int(m[2]) if m[2] else (today.year if month <= today.month else today.year - 1)
+        return _month_start(year, month), min(today, _month_end(year, month))
+
+    # --------------- Routing ---------------
+
+    def route(self, question: str, today: datetime.date | None = None) -> RoutedQuestion | None:
+        """The template and filters for `question`, or None when it needs the model."""
+        today = today or datetime.date.today()
+        text = " " + re.sub(r"[’']", "", question.lower()) + " "
+
+        try:
+            window, text = self._dates(text, today)
+        except ValueError:
+            return None  # an impossible date ("2024-02-30"), left for the model to answer
+        products, text = self._take(self._product_re, text)
+        types, text = self._take(self._type_re, text)
+        platforms, text = self._take(self._platform_re, text)
+        limit = AI_QUERY_MAX_ROWS
+        top = _TOP_RE.search(text)
+        if top:
+            limit = max(1, min(AI_QUERY_MAX_ROWS, int(top[1])))
+            text = text[: top.start(1)] + " " + text[top.end(1):]
+
+        intent = next((name for name, pattern in _GROUPINGS if pattern.search(text)), None)
+        if intent is None:
+            intent = "count" if _COUNT_RE.search(text) else "list_notes"
+            # A bare listing needs something to list by, or it's just "the latest notes".
+            if intent == "list_notes" and not (window or products or types or platforms):
+                return None
+
+        if any(word not in _FILLER or word in self._ambiguous for word in _WORD_RE.findall(text)):
+            return None
+        if len({m[0] for m in platforms}) > 1:
+            return None
+
+        start, end = window or (None, None)
+        filters = NoteFilters.of(
+            types=[self._types[m[0]] for m in types],
+            products=[self._products[m[0]] for m in products],
+            start_date=start,
+            end_date=end,
+            platform=self._platforms[platforms[0][0]] if platforms else None,
+        )
+        return RoutedQuestion(intent, filters, limit)
@@ -0,0 +1,183 @@
+"""Admission control for model-runner calls: a concurrency limit, a bounded priority queue.
+
+The model runner serves very few generations at once well; past that,
+requests only slow each other down. Every chat completion goes through
+LLMScheduler.slot(priority):
+
+  - at most LLM_MAX_CONCURRENCY run at once;
+  - up to LLM_MAX_QUEUE more wait, lowest priority value first (SQL
+    generation, which is short, ahead of summaries), FIFO within a
+    priority;
+  - when the queue is full, a request is rejected at once with LLMBusy —
+    unless it outranks the lowest-priority waiter, which is rejected in
+    its place — and a request that waits LLM_QUEUE_TIMEOUT_SECONDS is
+    rejected too. The API turns LLMBusy into 429 with a Retry-After
+    estimated from recent generation times.
+
+Limits are per process: with several uvicorn workers (WEB_CONCURRENCY)
+each gets its share of LLM_MAX_CONCURRENCY and LLM_MAX_QUEUE (at least
+one). stats() reports queue times and rejections for /api/ai/scheduler.
+"""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.shared_state import WORKERS
+
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "2"))
+LLM_MAX_QUEUE = int(os.environ.get("LLM_MAX_QUEUE", "8"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.environ.get("LLM_QUEUE_TIMEOUT_SECONDS", "60"))
+
+PRIORITY_SQL = 0
+PRIORITY_SUMMARY = 1
+PRIORITY_NAMES = {PRIORITY_SQL: "sql", PRIORITY_SUMMARY: "summary"}
+
+_RECENT = 200  # samples kept for the percentiles and the Retry-After estimate
+
+
+class LLMBusy(Exception):
+    """The model runner is saturated; retry after `retry_after` seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Model runner busy ({reason}); retry in {retry_after} s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "rejected")
+
+    def __init__(self, priority: int, seq: int):
+        self.priority, self.seq, self.rejected = priority, seq, False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+def _percentile(values, q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        max_concurrency: int = max(1, LLM_MAX_CONCURRENCY // WORKERS),
+        max_queue: int = max(1, LLM_MAX_QUEUE // WORKERS),
+        queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._waiting: list[_Ticket] = []  # heap
+        self._seq = itertools.count()
+        self._running = 0
+        self._waits: dict[int, deque] = {p: deque(maxlen=_RECENT) for p in PRIORITY_NAMES}
+        self._service: deque = deque(maxlen=_RECENT)
+        self._admitted = {p: 0 for p in PRIORITY_NAMES}
+        self._rejected: dict[str, int] = {"queue_full": 0, "preempted": 0, "timeout": 0}
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free: the queue ahead, drained at the recent generation rate."""
+        service = sum(self._service) / len(self._service) if self._service else 30.0
+        rounds = (len(self._waiting) + 1) / self.max_concurrency
+        return max(1, math.ceil(service * rounds))
+
+    def _reject(self, reason: str) -> LLMBusy:
+        self._rejected[reason] += 1
+        return LLMBusy(reason, self.retry_after())
+
+    def check(self, priority: int) -> None:
+        """Raise LLMBusy now if a request at `priority` would be rejected (before doing other work)."""
+        with self._cond:
+            if self._running < self.max_concurrency or len(self._waiting) < self.max_queue:
+                return
+            if max(self._waiting).priority > priority:
+                return
+            raise self._reject("queue_full")
+
+    def _acquire(self, priority: int) -> float:
+        """Wait for a slot; returns the seconds spent queued."""
+        started = time.monotonic()
+        with self._cond:
+            if self._running < self.max_concurrency and not self._waiting:
+                self._running += 1
+                self._admitted[priority] += 1
+                self._waits[priority].append(0.0)
+                return 0.0
+            if len(self._waiting) >= self.max_queue:
+                worst = max(self._waiting)
+                if worst.priority <= priority:
+                    raise self._reject("queue_full")
+                self._waiting.remove(worst)
+                heapq.heapify(self._waiting)
+                worst.rejected = True
+                self._cond.notify_all()
+            ticket = _Ticket(priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            deadline = started + self.queue_timeout
+            while True:
+                if ticket.rejected:
+                    raise self._reject("preempted")
+                if self._waiting[0] is ticket and self._running < self.max_concurrency:
+                    heapq.heappop(self._waiting)
+                    self._running += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                    raise self._reject("timeout")
+                self._cond.wait(remaining)
+            waited = time.monotonic() - started
+            self._admitted[priority] += 1
+            self._waits[priority].append(waited * 1000)
+            # The next ticket may be runnable too (several slots freed at once).
+            self._cond.notify_all()
+            return waited
+
+    def _release(self, service_seconds: float) -> None:
+        with self._cond:
+            self._running -= 1
+            self._service.append(service_seconds)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int):
+        """Hold one of the max_concurrency slots for a model call; yields the seconds spent queued."""
+        waited = self._acquire(priority)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self._release(time.monotonic() - started)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": len(self._waiting),
+                "admitted": {PRIORITY_NAMES[p]: n for p, n in self._admitted.items()},
+                "rejected": dict(self._rejected),
+                "queue_ms": {
+                    PRIORITY_NAMES[p]: {"p50": _percentile(w, 0.5), "p95": _percentile(w, 0.95), "max": _percentile(w, 1.0)}
+                    for p, w in self._waits.items()
+                },
+                "generation_s_avg": round(sum(self._service) / len(self._service), 2) if self._service else None,
+                "retry_after_s": self.retry_after(),
+            }
+
+
+scheduler = LLMScheduler()
@@ -0,0 +1,348 @@
+"""In-memory, column-oriented copy of the release-notes table.
+
+The table is small enough to hold in RAM, so the listing and count
+behind /api/release-notes and /api/ai/chat are answered here instead of
+costing two BigQuery jobs per filter combination. NoteStore keeps the
+notes as one Arrow table, rows sorted by published_at:
+
+  published_at                        also as int32 days since 1970-01-01 (`_day`),
+                                      so a date window is two binary searches
+  platform, product_name,             dictionary-encoded to small int codes, with
+  release_note_type                   one packed bitmap (np.packbits) per value
+  every other column                  Arrow arrays, gathered only for the page
+
+A filter is the OR of the bitmaps of its wanted values, ANDed across
+columns, and only over the bytes covering the date window's row range —
+so a narrow window touches a narrow slice of each bitmap. Keyword search
+runs last, over the window, with Arrow's LIKE on a lowercased copy of
+`description` (`_search`) — the same LOWER(description) LIKE '%...%' the
+SQL applies. The render artifacts (render.py) are computed once per note
+on load and kept as columns, so pages served from here skip rendering.
+The insight charts come from `cube`, a day × product × type count cube
+(src/count_cube.py) built alongside and updated with the rows extend()
+adds.
+
+Because it's all Arrow, a snapshot can be written to a file with save()
+and memory-mapped by load(): with several uvicorn workers
+(src/shared_state.py) one worker pulls and writes it, and the rest map
+the same pages instead of each holding a copy.
+
+NoteStoreRefresher keeps it current from a background thread: it polls the
+table's data version and, on ingestion-owned tables (which only ever
+append — see ingestion/src/loader.py), pulls just the rows with
+`ingested_at` after the last pull's newest, less NOTE_STORE_LOOKBACK_MINUTES.
+The lookback covers a MERGE that started before another one committed
+but finished after the pull; rows already held are dropped by row_hash,
+so each new row is added once. Anything that
+still slips past — or a row deleted from the table — is picked up by the
+periodic full reload (NOTE_STORE_FULL_REBUILD_HOURS). The public dataset
+has no `ingested_at`, so there every change reloads the table.
+
+Set NOTE_STORE=none to always query BigQuery.
+"""
+
+import datetime
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.count_cube import CountCube
+from src.queries import get_data_version, get_table_columns, run_query
+from src.query_builder import NoteFilters, note_store_query
+from src.render import RENDERED_COLUMNS, render_columns
+from src.shared_state import PollingRefresher, SharedState
+
+logger = logging.getLogger(__name__)
+
+NOTE_STORE = os.environ.get("NOTE_STORE", "memory").lower()
+NOTE_STORE_REFRESH_SECONDS = float(os.environ.get("NOTE_STORE_REFRESH_SECONDS", "300"))
+NOTE_STORE_LOOKBACK_MINUTES = float(os.environ.get("NOTE_STORE_LOOKBACK_MINUTES", "60"))
+NOTE_STORE_FULL_REBUILD_HOURS = float(os.environ.get("NOTE_STORE_FULL_REBUILD_HOURS", "24"))
+
+ENCODED_COLUMNS = ("platform", "release_note_type", "product_name")
+_HELPER_COLUMNS = ["_day", "_search"]
+_EPOCH = datetime.date(1970, 1, 1)
+_NO_DATE = np.iinfo(np.int32).min  # sorts first, so last under ORDER BY published_at DESC
+
+
+def _to_arrow(df: pd.DataFrame, schema: pa.Schema | None = None) -> pa.Table:
+    """The notes in `df` as Arrow, with the render columns added if the table lacks them."""
+    if "row_hash" in df.columns:
+        df = df.drop_duplicates("row_hash", keep="last")
+    if "description" in df.columns and not all(c in df.columns for c in RENDERED_COLUMNS):
+        df = df.assign(**render_columns(df["description"]))
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _with_helpers(table: pa.Table) -> pa.Table:
+    """`table` plus the _day and _search columns, sorted by published_at."""
+    days = pc.cast(table.column("published_at"), pa.date32()).cast(pa.int32()).fill_null(_NO_DATE)
+    table = table.append_column("_day", days)
+    if "description" in table.column_names:
+        table = table.append_column("_search", pc.utf8_lower(table.column("description")))
+    return table.take(pc.sort_indices(table, [("_day", "ascending")]))
+
+
+class NoteStore:
+    """Immutable snapshot of the table; build a new one (or extend()) to update."""
+
+    def __init__(self, table: pa.Table, cube: CountCube | None = None):
+        self.table = table.combine_chunks()
+        self.dates = self.table.column("_day").to_numpy()
+        self.columns = [c for c in self.table.column_names if c not in _HELPER_COLUMNS]
+        # Code of each value of the encoded columns, and one bitmap per code.
+        self._codes: dict[str, dict[str, int]] = {}
+        self._bitmaps: dict[str, list[np.ndarray]] = {}
+        for name in ENCODED_COLUMNS:
+            if name not in self.columns:
+                continue
+            encoded = pc.dictionary_encode(self.table.column(name)).combine_chunks()
+            codes = encoded.indices.fill_null(-1).to_numpy()
+            self._codes[name] = {value: code for code, value in enumerate(encoded.dictionary.to_pylist())}
+            self._bitmaps[name] = [np.packbits(codes == code) for code in range(len(encoded.dictionary))]
+        self.cube = cube if cube is not None else CountCube.from_table(self.table)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "NoteStore":
+        return cls(_with_helpers(_to_arrow(df)))
+
+    @classmethod
+    def load(cls, path: str | Path, cube: CountCube | None = None) -> "NoteStore":
+        """Memory-map a snapshot written by save(); its buffers are shared, not copied.
+
+        Pass the saved store's `cube` to reuse it instead of counting the rows again.
+        """
+        with pa.memory_map(str(path)) as source:
+            return cls(pa.ipc.open_file(source).read_all(), cube)
+
+    def save(self, path: str | Path) -> None:
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, self.table.schema) as writer:
+            writer.write_table(self.table)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def product_counts(self) -> dict[tuple[str | None, str], int]:
+        """Notes per (platform, product); platform is None on tables without the column."""
+        keys = [c for c in ("platform", "product_name") if c in self.columns]
+        if "product_name" not in keys:
+            return {}
+        grouped = self.table.group_by(keys).aggregate([([], "count_all")]).to_pydict()
+        platforms = grouped.get("platform") or [None] * len(grouped["count_all"])
+        return {
+            (platform, product): count
+            for platform, product, count in zip(platforms, grouped["product_name"], grouped["count_all"])
+            if product is not None
+        }
+
+    def extend(self, df: pd.DataFrame) -> "NoteStore":
+        """A new store with `df`'s rows added (matching row_hash values replaced)."""
+        if df.empty:
+            return self
+        base = self.table.drop_columns(_HELPER_COLUMNS)
+        added = _to_arrow(df[[c for c in df.columns if c in base.column_names]], schema=base.schema)
+        replaced = None
+        if "row_hash" in base.column_names:
+            is_replaced = pc.is_in(base.column("row_hash"), added.column("row_hash"))
+            replaced = base.filter(is_replaced)
+            base = base.filter(pc.invert(is_replaced))
+        return NoteStore(_with_helpers(pa.concat_tables([base, added])), self.cube.updated(added, replaced))
+
+    def _window(self, filters: NoteFilters) -> tuple[int, int]:
+        if not (filters.start_date and filters.end_date):
+            return 0, len(self.dates)
+        lo = np.searchsorted(self.dates, (filters.start_date - _EPOCH).days, side="left")
+        hi = np.searchsorted(self.dates, (filters.end_date - _EPOCH).days, side="right")
+        return int(lo), int(hi)
+
+    def _matching_rows(self, filters: NoteFilters) -> np.ndarray:
+        """Row positions matching `filters`, in ascending published_at order."""
+        lo, hi = self._window(filters)
+        if hi <= lo:
+            return np.empty(0, dtype=np.int64)
+
+        first_byte, last_byte = lo >> 3, (hi + 7) >> 3
+        bitmap = None
+        wanted_by_column = {
+            "platform": (filters.platform,) if filters.platform else (),
+            "release_note_type": filters.types,
+            "product_name": filters.products,
+        }
+        for name, wanted in wanted_by_column.items():
+            if not wanted:
+                continue
+            codes = [self._codes[name][v] for v in wanted if v in self._codes[name]]
+            if not codes:
+                return np.empty(0, dtype=np.int64)
+            union = self._bitmaps[name][codes[0]][first_byte:last_byte]
+            for code in codes[1:]:
+                union = union | self._bitmaps[name][code][first_byte:last_byte]
+            bitmap = union if bitmap is None else bitmap & union
+
+        if bitmap is None:
+            rows = np.arange(lo, hi)
+        else:
+            bits = np.unpackbits(bitmap)[lo - first_byte * 8 : hi - first_byte * 8]
+            rows = np.flatnonzero(bits) + lo
+
+        if filters.search and len(rows):
+            # Match just the surviving rows when the bitmaps left few; else the whole window (no gather).
+            narrow = len(rows) * 4 < hi - lo
+            text = self.table.column("_search")
+            text = text.take(rows) if narrow else text.slice(lo, hi - lo)
+            if any(c in filters.search for c in "%_\\"):
+                matched = pc.match_like(text, f"%{filters.search}%")  # LIKE wildcards, as in the SQL
+            else:
+                matched = pc.match_substring(text, filters.search)
+            matches = matched.fill_null(False).to_numpy(zero_copy_only=False)
+            rows = rows[matches] if narrow else rows[matches[rows - lo]]
+        return rows
+
+    def can_answer(self, filters: NoteFilters, columns: list[str]) -> bool:
+        """False when a filter or column isn't held here — the caller should ask BigQuery."""
+        if any(c not in self.columns for c in columns):
+            return False
+        if filters.platform and "platform" not in self._codes:
+            return False
+        if filters.search and "_search" not in self.table.column_names:
+            return False
+        return True
+
+    def query(
+        self, filters: NoteFilters, limit: int, offset: int, columns: list[str]
+    ) -> tuple[pd.DataFrame, int] | None:
+        """(page, total) like queries.query_release_notes(), or None if can_answer() is False.
+
+        The page also carries the RENDERED_COLUMNS, which attach_render_artifacts() picks up.
+        """
+        if not self.can_answer(filters, columns):
+            return None
+        rows = self._matching_rows(filters)
+        newest_first = rows[::-1]
+        page = self.table.take(newest_first[max(offset, 0) : max(offset, 0) + max(limit, 0)])
+        names = columns + [c for c in RENDERED_COLUMNS if c in self.columns and c not in columns]
+        # dtype=object keeps NULLs as None, as BigQuery's to_dataframe() returns them.
+        df = pd.DataFrame({name: page.column(name).to_pylist() for name in names}, columns=names, dtype=object)
+        return df, len(rows)
+
+
+class NoteStoreRefresher(PollingRefresher):
+    """Owns the current NoteStore and reloads it when the table's data changes.
+
+    With a SharedState, only the worker holding the leader lock queries
+    BigQuery and publishes each snapshot; the others map the published file.
+    on_change(store, version) is called in every worker after it swaps in
+    a new snapshot; on_rows(df, version) only by the worker that pulled
+    them, with every batch pulled from an ingestion-owned table: each
+    incremental batch of new rows, and the whole table on a full load.
+    """
+
+    name = "note-store"
+    interval = NOTE_STORE_REFRESH_SECONDS
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        columns: list[str],
+        shared: SharedState | None = None,
+        on_change: Callable[[NoteStore, str], None] | None = None,
+        on_rows: Callable[[pd.DataFrame, str], None] | None = None,
+    ):
+        super().__init__(shared)
+        self.client = client
+        self.table_name = table_name
+        self.columns = columns
+        self.on_change = on_change
+        self.on_rows = on_rows
+        self.store: NoteStore | None = None
+        self.version: str | None = None
+        self._pull_columns: list[str] | None = None
+        self._incremental = False
+        self._watermark: datetime.datetime | None = None
+        self._full_built_at = 0.0
+        self._serial: int | None = None  # of the last snapshot followed
+
+    def _swap(self, store: NoteStore, version: str) -> None:
+        self.store, self.version = store, version
+        if self.on_change:
+            self.on_change(store, version)
+
+    def _pull(self, ingested_after: datetime.datetime | None = None) -> pd.DataFrame:
+        df = run_query(note_store_query(self.table_name, self._pull_columns, ingested_after), self.client)
+        if self._incremental and not df.empty:
+            newest = df["ingested_at"].max()
+            if pd.notna(newest):
+                self._watermark = max(self._watermark, newest) if self._watermark is not None else newest
+        return df
+
+    def _unseen(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` without the rows the store already holds (by row_hash)."""
+        if df.empty:
+            return df
+        held = pc.is_in(pa.array(df["row_hash"]), self.store.table.column("row_hash"))
+        return df[~held.to_numpy(zero_copy_only=False)]
+
+    def _follow(self) -> bool:
+        """Map the leader's newest snapshot, if this worker doesn't have it yet."""
+        manifest = self.shared.latest("notes")
+        if manifest is None or manifest["serial"] == self._serial:
+            return False
+        self._serial = manifest["serial"]
+        self._watermark = pd.Timestamp(manifest["watermark"]) if manifest["watermark"] else None
+        self._full_built_at = time.monotonic()
+        self._swap(NoteStore.load(manifest["path"]), manifest["version"])
+        return True
+
+    def refresh(self) -> bool:
+        """Bring the store up to date with the table; returns whether it changed."""
+        if self.shared and not self.shared.try_lead():
+            return self._follow()
+        if self.shared and self.store is None:
+            self._follow()  # a new leader carries on from the last published snapshot
+
+        version = get_data_version(self.client, self.table_name)
+        stale = time.monotonic() - self._full_built_at > NOTE_STORE_FULL_REBUILD_HOURS * 3600
+        if self.store is not None and version == self.version and not stale:
+            return False
+
+        started = time.perf_counter()
+        if self._pull_columns is None:
+            available = get_table_columns(self.client, self.table_name)
+            extra = [c for c in ("platform", "row_hash", "ingested_at") if c in available and c not in self.columns]
+            self._pull_columns = self.columns + extra
+            self._incremental = "ingested_at" in available and "row_hash" in available
+
+        incremental = (
+            self.store is not None and self._incremental and self._watermark is not None and not stale
+        )
+        if incremental:
+            lookback = pd.Timedelta(minutes=NOTE_STORE_LOOKBACK_MINUTES)
+            df = self._unseen(self._pull(pd.Timestamp(self._watermark) - lookback))
+            store = self.store.extend(df)
+        else:
+            df = self._pull()
+            store = NoteStore.from_frame(df)
+            self._full_built_at = time.monotonic()
+        if self.shared:
+            path = self.shared.publish("notes", ".arrow", store.save, version=version, watermark=self._watermark)
+            store = NoteStore.load(path, store.cube)
+        self._swap(store, version)
+        logger.info(
+            "Note store %s: %d rows (%d pulled), version %s, %.0f ms",
+            "loaded" if len(df) == len(self.store) else "updated",
+            len(self.store),
+            len(df),
+            version,
+            (time.perf_counter() - started) * 1000,
+        )
+        if self._incremental and self.on_rows and not df.empty:
+            self.on_rows(df, version)
+        return True
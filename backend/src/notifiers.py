@@ -0,0 +1,110 @@
+"""Where subscription notifications go.
+
+Selected by NOTIFIERS, a comma-separated list:
+
+  log      one log line per notification (default)
+  file     appended as JSON lines to NOTIFY_FILE — handy locally and in tests
+  webhook  each notification POSTed as JSON to NOTIFY_WEBHOOK_URL (e.g. a
+           chat incoming webhook, or a small service that sends email)
+
+To add one, subclass Notifier and register a factory in _REGISTRY.
+"""
+
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+NOTIFIERS = os.environ.get("NOTIFIERS", "log")
+NOTIFY_FILE = os.environ.get("NOTIFY_FILE", "notifications.jsonl")
+NOTIFY_WEBHOOK_URL = os.environ.get("NOTIFY_WEBHOOK_URL", "")
+NOTIFY_WEBHOOK_TIMEOUT = float(os.environ.get("NOTIFY_WEBHOOK_TIMEOUT", "10"))
+
+
+@dataclass
+class Notification:
+    subscription_id: str
+    subscriber: str
+    version: str
+    total: int  # matching notes; `notes` holds at most NOTIFY_MAX_NOTES of them
+    notes: list[dict]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class Notifier(ABC):
+    name = "notifier"
+
+    @abstractmethod
+    def send(self, notifications: list[Notification]) -> None: ...
+
+
+class LogNotifier(Notifier):
+    name = "log"
+
+    def send(self, notifications: list[Notification]) -> None:
+        for n in notifications:
+            logger.info("Notify %s: %d new notes (subscription %s)", n.subscriber, n.total, n.subscription_id)
+
+
+class FileNotifier(Notifier):
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, notifications: list[Notification]) -> None:
+        with self._lock, open(self.path, "a") as f:
+            for n in notifications:
+                f.write(json.dumps(n.to_dict(), default=str) + "\n")
+
+
+class WebhookNotifier(Notifier):
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = NOTIFY_WEBHOOK_TIMEOUT):
+        if not url:
+            raise ValueError("NOTIFIERS includes 'webhook' but NOTIFY_WEBHOOK_URL is not set")
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def send(self, notifications: list[Notification]) -> None:
+        failed = 0
+        for n in notifications:
+            try:
+                self._session.post(self.url, json=n.to_dict(), timeout=self.timeout).raise_for_status()
+            except requests.RequestException as e:
+                failed += 1
+                logger.warning("Webhook notification for %s failed: %s", n.subscriber, e)
+        if failed:
+            logger.warning("%d of %d webhook notifications failed", failed, len(notifications))
+
+
+_REGISTRY: dict[str, Callable[[], Notifier]] = {
+    "log": LogNotifier,
+    "file": lambda: FileNotifier(NOTIFY_FILE),
+    "webhook": lambda: WebhookNotifier(NOTIFY_WEBHOOK_URL),
+}
+
+
+def build_notifiers(names: str = NOTIFIERS) -> list[Notifier]:
+    notifiers = []
+    for name in (n.strip().lower() for n in names.split(",")):
+        if not name or name == "none":
+            continue
+        try:
+            factory = _REGISTRY[name]
+        except KeyError:
+            raise ValueError(f"Unknown notifier {name!r}. Known notifiers: {sorted(_REGISTRY)}.") from None
+        notifiers.append(factory())
+    return notifiers
@@ -1,16 +1,112 @@
 """BigQuery queries for release notes."""
 
 import datetime
+import os
 
 import pandas as pd
-from google.cloud.bigquery import Client
+from google.cloud.bigquery import Client, QueryJob, QueryJobConfig
+
+from src.query_builder import (
+    NOTE_COLUMNS,
+    BuiltQuery,
+    NoteFilters,
+    count_query,
+    date_range_query,
+    distinct_values_query,
+    release_notes_query,
+)
+from src.tracing import set_attributes, span
+
+# Limits for queries the backend didn't write itself (/api/ai/query): however broad the
+# SQL, a question can't bill more than this, run longer, or pull more rows into memory.
+AI_QUERY_MAX_BYTES_BILLED = int(os.environ.get("AI_QUERY_MAX_BYTES_BILLED", str(10 * 1024**3)))
+AI_QUERY_TIMEOUT_SECONDS = float(os.environ.get("AI_QUERY_TIMEOUT_SECONDS", "60"))
+AI_QUERY_PAGE_SIZE = int(os.environ.get("AI_QUERY_PAGE_SIZE", "50"))
+AI_QUERY_MAX_ROWS = int(os.environ.get("AI_QUERY_MAX_ROWS", "1000"))
+AI_QUERY_JOB_PREFIX = "ai_query_"
+
+# Written by the ingestion job's normalization stage (ingestion/src/normalize.py).
+# Selected only when the table has them — the public dataset doesn't.
+NORMALIZED_COLUMNS = ["row_hash", "description_text", "description_html_clean", "tracks", "word_count"]
+
+
+def _job_attributes(job) -> dict:
+    return {
+        "bigquery.job_id": getattr(job, "job_id", None),
+        "bigquery.bytes_processed": getattr(job, "total_bytes_processed", None),
+        "bigquery.cache_hit": getattr(job, "cache_hit", None),
+    }
+
+
+def execute_query(query: str, client: Client, job_config=None) -> pd.DataFrame:
+    """Execute a BigQuery query and return a DataFrame."""
+    with span("bigquery.query", kind="client", **{"db.system": "bigquery", "db.query.text": query}) as current:
+        job = client.query(query, job_config=job_config)
+        rows = job.result()
+        set_attributes(current, **_job_attributes(job))
+    with span("pandas.from_rows"):
+        results = [dict(row) for row in rows]
+        return pd.DataFrame(results)
+
+
+def query_dataframe(query: str, client: Client, job_config=None) -> pd.DataFrame:
+    """Run a query and convert the result with to_dataframe(), tracing job wait and conversion apart."""
+    with span("bigquery.query", kind="client", **{"db.system": "bigquery", "db.query.text": query}) as current:
+        job = client.query(query, job_config=job_config)
+        rows = job.result()
+        set_attributes(current, **_job_attributes(job))
+    with span("pandas.to_dataframe") as current:
+        df = rows.to_dataframe()
+        set_attributes(current, rows=len(df))
+    return df
+
+
+def _bounded_config(job_config: QueryJobConfig | None) -> QueryJobConfig:
+    job_config = job_config or QueryJobConfig()
+    job_config.maximum_bytes_billed = AI_QUERY_MAX_BYTES_BILLED
+    job_config.job_timeout_ms = int(AI_QUERY_TIMEOUT_SECONDS * 1000)
+    return job_config
+
+
+def _read_page(job: QueryJob, start: int, page_size: int) -> tuple[pd.DataFrame, int]:
+    with span("bigquery.read_page", start=start) as current:
+        rows = job.result(start_index=start, max_results=page_size, timeout=AI_QUERY_TIMEOUT_SECONDS)
+        df = rows.to_dataframe()
+        set_attributes(current, rows=len(df), total_rows=rows.total_rows)
+    return df, int(rows.total_rows or 0)
+
+
+def run_bounded(
+    query: str, client: Client, job_config: QueryJobConfig | None = None, page_size: int = AI_QUERY_PAGE_SIZE
+) -> tuple[pd.DataFrame, int, QueryJob]:
+    """Run SQL under the AI_QUERY_* limits; returns (first page, total rows, job).
+
+    BigQuery refuses the job if it would bill more than AI_QUERY_MAX_BYTES_BILLED
+    and cancels it after AI_QUERY_TIMEOUT_SECONDS. The result stays in the job's
+    destination table: only the first page is read, and the total comes from the
+    result's metadata rather than from reading (or re-counting) every row.
+    Later pages come from query_page() with the job's id.
+    """
+    with span("bigquery.query", kind="client", **{"db.system": "bigquery", "db.query.text": query}) as current:
+        job = client.query(query, job_config=_bounded_config(job_config), job_id_prefix=AI_QUERY_JOB_PREFIX)
+        df, total = _read_page(job, 0, page_size)
+        set_attributes(current, **_job_attributes(job))
+    return df, total, job
 
 
-def execute_query(query: str, client: Client) -> pd.DataFrame:
-    """Execute a BigQuery query and return a DataFrame."""
-    job = client.query(query)
-    results = [dict(row) for row in job.result()]
-    return pd.DataFrame(results)
+def query_page(
+    client: Client, job_id: str, start: int, location: str | None = None, page_size: int = AI_QUERY_PAGE_SIZE
+) -> tuple[pd.DataFrame, int]:
+    """Rows [start, start + page_size) of a finished run_bounded() job, and its total rows."""
+    if not job_id.startswith(AI_QUERY_JOB_PREFIX):
+        raise ValueError(f"Not an AI query job: {job_id!r}")
+    job = client.get_job(job_id, location=location)
+    return _read_page(job, start, max(0, min(page_size, AI_QUERY_MAX_ROWS - start)))
+
+
+def run_query(query: BuiltQuery, client: Client) -> pd.DataFrame:
+    """query_dataframe() for a query from src.query_builder, parameters attached."""
+    return query_dataframe(query.sql, client, job_config=query.job_config())
 
 
 def query_release_notes(
@@ -23,81 +119,43 @@ def query_release_notes(
     offset: int,
     client: Client,
     table_name: str,
+    columns: list[str] | None = None,
+    platform: str | None = None,
 ) -> tuple[pd.DataFrame, int]:
     """Query release notes with filters; returns (results_df, total_count)."""
-    where_clauses = []
-    query_params = []
-
-    if release_types:
-        placeholders = ", ".join(["?"] * len(release_types))
-        where_clauses.append(f"release_note_type IN ({placeholders})")
-        query_params.extend(release_types)
-    if product_names:
-        placeholders = ", ".join(["?"] * len(product_names))
-        where_clauses.append(f"product_name IN ({placeholders})")
-        query_params.extend(product_names)
-    if start_date and end_date:
-        where_clauses.append("published_at BETWEEN ? AND ?")
-        query_params.extend([start_date.isoformat(), end_date.isoformat()])
-    if search_text:
-        where_clauses.append("LOWER(description) LIKE ?")
-        query_params.append(f"%{search_text.lower()}%")
-
-    where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-    formatted_where = where_clause
-    for param in query_params:
-        if isinstance(param, str):
-            escaped = param.replace("'", "''")
-            formatted_where = formatted_where.replace("?", f"'{escaped}'", 1)
-        else:
-            formatted_where = formatted_where.replace("?", str(param), 1)
-
-    query = f"""
-    SELECT description, release_note_type, published_at, product_name, product_version_name
-    FROM `{table_name}`
-    WHERE {formatted_where}
-    ORDER BY published_at DESC
-    LIMIT {limit}
-    OFFSET {offset}
-    """
-    count_query = f"SELECT COUNT(*) as total FROM `{table_name}` WHERE {formatted_where}"
-
-    results_df = client.query(query).to_dataframe()
-    count_df = client.query(count_query).to_dataframe()
+    filters = NoteFilters.of(release_types, product_names, start_date, end_date, search_text, platform)
+    results_df = run_query(release_notes_query(table_name, filters, limit, offset, columns), client)
+    count_df = run_query(count_query(table_name, filters), client)
     return results_df, count_df["total"][0]
 
 
-def load_release_note_types(client: Client, table_name: str) -> list:
-    """Load distinct release_note_type values."""
-    query = f"""
-    SELECT DISTINCT release_note_type FROM `{table_name}`
-    WHERE release_note_type IS NOT NULL ORDER BY release_note_type
-    """
-    df = execute_query(query, client)
-    if df.empty or "release_note_type" not in df.columns:
+def _load_distinct(client: Client, table_name: str, column: str, platform: str | None) -> list:
+    query = distinct_values_query(table_name, column, platform)
+    df = execute_query(query.sql, client, job_config=query.job_config())
+    if df.empty or column not in df.columns:
         return []
-    return df["release_note_type"].tolist()
+    return df[column].tolist()
+
+
+def load_release_note_types(client: Client, table_name: str, platform: str | None = None) -> list:
+    """Load distinct release_note_type values."""
+    return _load_distinct(client, table_name, "release_note_type", platform)
 
 
-def load_product_names(client: Client, table_name: str) -> list:
+def load_product_names(client: Client, table_name: str, platform: str | None = None) -> list:
     """Load distinct product_name values."""
-    query = f"""
-    SELECT DISTINCT product_name FROM `{table_name}`
-    WHERE product_name IS NOT NULL ORDER BY product_name
-    """
-    df = execute_query(query, client)
-    if df.empty or "product_name" not in df.columns:
-        return []
-    return df["product_name"].tolist()
+    return _load_distinct(client, table_name, "product_name", platform)
 
 
-def get_date_range(client: Client, table_name: str) -> tuple:
+def load_platforms(client: Client, table_name: str) -> list:
+    """Load distinct platform values (ingestion-owned tables only)."""
+    return _load_distinct(client, table_name, "platform", None)
+
+
+def get_date_range(client: Client, table_name: str, platform: str | None = None) -> tuple:
     """Return (min_date, max_date) for published_at in the table."""
-    query = f"""
-    SELECT MIN(published_at) as min_date, MAX(published_at) as max_date
-    FROM `{table_name}`
-    """
-    df = execute_query(query, client)
+    query = date_range_query(table_name, platform)
+    df = execute_query(query.sql, client, job_config=query.job_config())
     today = datetime.date.today()
     default_start = today - datetime.timedelta(days=365)
     if df.empty or "min_date" not in df.columns or "max_date" not in df.columns:
@@ -105,3 +163,27 @@ def get_date_range(client: Client, table_name: str) -> tuple:
     min_date = df["min_date"][0] if pd.notna(df["min_date"][0]) else default_start
     max_date = df["max_date"][0] if pd.notna(df["max_date"][0]) else today
     return min_date, max_date
+
+
+def get_table_columns(client: Client, table_name: str) -> set[str]:
+    """Column names of the table, or an empty set when its schema can't be read."""
+    try:
+        return {field.name for field in client.get_table(table_name).schema}
+    except Exception:
+        return set()
+
+
+def get_data_version(client: Client, table_name: str) -> str | None:
+    """Changes whenever the table's contents do: last-modified time plus row count."""
+    try:
+        table = client.get_table(table_name)
+    except Exception:
+        return None
+    modified = table.modified.isoformat() if table.modified else ""
+    return f"{modified}/{table.num_rows}"
+
+
+def get_note_columns(client: Client, table_name: str) -> list[str]:
+    """Return NOTE_COLUMNS plus whichever NORMALIZED_COLUMNS the table actually has."""
+    available = get_table_columns(client, table_name)
+    return NOTE_COLUMNS + [c for c in NORMALIZED_COLUMNS if c in available]
@@ -0,0 +1,276 @@
+"""Parameterized BigQuery SQL for release notes — the one place query text is built.
+
+Filter values never reach the SQL text: they travel as scalar and array
+query parameters, and list filters are de-duplicated and sorted first.
+So identical filters always produce byte-identical SQL *and* parameters
+(BigQuery's result cache hits, and plans are reusable), and any two
+filter combinations that use the same clauses share the same SQL text.
+
+Queries are shaped for the ingestion job's table (ingestion/src/loader.py),
+which is partitioned on `published_at` and clustered on `platform,
+product_name, release_note_type`: every time window is a DATE parameter
+compared directly with `published_at` (never CURRENT_DATE() arithmetic,
+which also makes a query uncacheable), and platform/product/type filters
+are plain equality or IN UNNEST on the clustering columns, so BigQuery
+can skip whole partitions and storage blocks.
+
+Only depends on google-cloud-bigquery, so the legacy root app can import
+it too (`from backend.src.query_builder import ...`).
+"""
+
+import calendar
+import datetime
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+from google.cloud import bigquery
+
+_TABLE_NAME_RE = re.compile(r"^[A-Za-z0-9_.\-:]+$")
+
+NOTE_COLUMNS = [
+    "description",
+    "release_note_type",
+    "published_at",
+    "product_name",
+    "product_version_name",
+]
+
+
+@dataclass(frozen=True)
+class BuiltQuery:
+    """SQL text plus its query parameters, ready for client.query()."""
+
+    sql: str
+    params: tuple = ()
+
+    def job_config(self, **kwargs) -> bigquery.QueryJobConfig:
+        return bigquery.QueryJobConfig(query_parameters=list(self.params), **kwargs)
+
+    def run(self, client: bigquery.Client, **job_config_kwargs):
+        """client.query() this query; returns the QueryJob."""
+        return client.query(self.sql, job_config=self.job_config(**job_config_kwargs))
+
+
+def _canonical(values: Iterable[str] | None) -> list[str]:
+    return sorted({v for v in values or () if v})
+
+
+@dataclass(frozen=True)
+class NoteFilters:
+    """The release-note filters shared by the listing, count and chat endpoints.
+
+    Construct through `NoteFilters.of(...)`, which canonicalizes list
+    filters, so equal filter sets compare (and hash) equal.
+    """
+
+    types: tuple[str, ...] = ()
+    products: tuple[str, ...] = ()
+    start_date: datetime.date | None = None
+    end_date: datetime.date | None = None
+    search: str = ""
+    platform: str | None = None
+
+    @classmethod
+    def of(
+        cls,
+        types: Iterable[str] | None = None,
+        products: Iterable[str] | None = None,
+        start_date: datetime.date | None = None,
+        end_date: datetime.date | None = None,
+        search: str | None = "",
+        platform: str | None = None,
+    ) -> "NoteFilters":
+        return cls(
+            types=tuple(_canonical(types)),
+            products=tuple(_canonical(products)),
+            start_date=start_date,
+            end_date=end_date,
+            search=(search or "").strip().lower(),
+            platform=(platform or "").strip().upper() or None,
+        )
+
+    def where(self) -> tuple[str, list]:
+        """Return (WHERE clause body, query parameters), clauses in a fixed order."""
+        clauses, params = [], []
+        if self.platform:
+            clauses.append("platform = @platform")
+            params.append(bigquery.ScalarQueryParameter("platform", "STRING", self.platform))
+        if self.types:
+            clauses.append("release_note_type IN UNNEST(@types)")
+            params.append(bigquery.ArrayQueryParameter("types", "STRING", list(self.types)))
+        if self.products:
+            clauses.append("product_name IN UNNEST(@products)")
+            params.append(bigquery.ArrayQueryParameter("products", "STRING", list(self.products)))
+        if self.start_date and self.end_date:
+            clauses.append("published_at BETWEEN @start_date AND @end_date")
+            params.append(bigquery.ScalarQueryParameter("start_date", "DATE", self.start_date))
+            params.append(bigquery.ScalarQueryParameter("end_date", "DATE", self.end_date))
+        if self.search:
+            clauses.append("LOWER(description) LIKE @search")
+            params.append(bigquery.ScalarQueryParameter("search", "STRING", f"%{self.search}%"))
+        return (" AND ".join(clauses) or "TRUE"), params
+
+
+def trailing_window(months: int, end: datetime.date | None = None) -> tuple[datetime.date, datetime.date]:
+    """(start, end) covering the `months` months up to `end` (default today), same day of month."""
+    end = end or datetime.date.today()
+    year, month = divmod(end.year * 12 + end.month - 1 - months, 12)
+    day = min(end.day, calendar.monthrange(year, month + 1)[1])
+    return datetime.date(year, month + 1, day), end
+
+
+def table_ref(table_name: str) -> str:
+    """Backticked table reference; table names can't be parameters, so they're validated instead."""
+    if not _TABLE_NAME_RE.match(table_name or ""):
+        raise ValueError(f"Invalid BigQuery table name: {table_name!r}")
+    return f"`{table_name}`"
+
+
+# --------------- Release notes ---------------
+
+
+def release_notes_query(
+    table_name: str, filters: NoteFilters, limit: int, offset: int, columns: list[str] | None = None
+) -> BuiltQuery:
+    where, params = filters.where()
+    sql = (
+        f"SELECT {', '.join(columns or NOTE_COLUMNS)}\n"
+        f"FROM {table_ref(table_name)}\n"
+        f"WHERE {where}\n"
+        "ORDER BY published_at DESC\n"
+        "LIMIT @limit OFFSET @offset"
+    )
+    params += [
+        bigquery.ScalarQueryParameter("limit", "INT64", int(limit)),
+        bigquery.ScalarQueryParameter("offset", "INT64", int(offset)),
+    ]
+    return BuiltQuery(sql, tuple(params))
+
+
+def count_query(table_name: str, filters: NoteFilters) -> BuiltQuery:
+    where, params = filters.where()
+    return BuiltQuery(f"SELECT COUNT(*) AS total FROM {table_ref(table_name)} WHERE {where}", tuple(params))
+
+
+# --------------- Filter options ---------------
+
+
+def distinct_values_query(table_name: str, column: str, platform: str | None = None) -> BuiltQuery:
+    if column not in ("release_note_type", "product_name", "platform"):
+        raise ValueError(f"No distinct-values query for column {column!r}")
+    where, params = NoteFilters.of(platform=platform).where()
+    return BuiltQuery(
+        f"SELECT DISTINCT {column} FROM {table_ref(table_name)}\n"
+        f"WHERE {where} AND {column} IS NOT NULL ORDER BY {column}",
+        tuple(params),
+    )
+
+
+def date_range_query(table_name: str, platform: str | None = None) -> BuiltQuery:
+    where, params = NoteFilters.of(platform=platform).where()
+    return BuiltQuery(
+        "SELECT MIN(published_at) AS min_date, MAX(published_at) AS max_date\n"
+        f"FROM {table_ref(table_name)} WHERE {where}",
+        tuple(params),
+    )
+
+
+# --------------- Insights ---------------
+#
+# Each takes the same NoteFilters as the listing. The time-bucketed charts
+# expect a date window (see trailing_window()) so they only read its partitions.
+
+
+def time_series_query(table_name: str, filters: NoteFilters) -> BuiltQuery:
+    """Monthly note counts."""
+    where, params = filters.where()
+    return BuiltQuery(
+        "SELECT DATE_TRUNC(published_at, MONTH) AS month, COUNT(*) AS count\n"
+        f"FROM {table_ref(table_name)}\n"
+        f"WHERE {where}\n"
+        "GROUP BY month ORDER BY month",
+        tuple(params),
+    )
+
+
+def type_distribution_query(table_name: str, filters: NoteFilters, limit: int = 10) -> BuiltQuery:
+    where, params = filters.where()
+    return BuiltQuery(
+        "SELECT release_note_type, COUNT(*) AS count\n"
+        f"FROM {table_ref(table_name)}\n"
+        f"WHERE {where} AND release_note_type IS NOT NULL\n"
+        "GROUP BY release_note_type ORDER BY count DESC LIMIT @limit",
+        tuple(params) + (bigquery.ScalarQueryParameter("limit", "INT64", limit),),
+    )
+
+
+def top_products_query(table_name: str, filters: NoteFilters, limit: int = 10) -> BuiltQuery:
+    where, params = filters.where()
+    return BuiltQuery(
+        "SELECT product_name, COUNT(*) AS count\n"
+        f"FROM {table_ref(table_name)}\n"
+        f"WHERE {where} AND product_name IS NOT NULL\n"
+        "GROUP BY product_name ORDER BY count DESC LIMIT @limit",
+        tuple(params) + (bigquery.ScalarQueryParameter("limit", "INT64", limit),),
+    )
+
+
+def heatmap_query(table_name: str, filters: NoteFilters) -> BuiltQuery:
+    """Notes per (week, day of week)."""
+    where, params = filters.where()
+    return BuiltQuery(
+        "SELECT\n"
+        "    EXTRACT(DAYOFWEEK FROM published_at) AS day_of_week,\n"
+        "    DATE_TRUNC(published_at, WEEK) AS week,\n"
+        "    COUNT(*) AS count\n"
+        f"FROM {table_ref(table_name)}\n"
+        f"WHERE {where}\n"
+        "GROUP BY day_of_week, week\n"
+        "ORDER BY week, day_of_week",
+        tuple(params),
+    )
+
+
+# --------------- Suggestions ---------------
+
+
+def suggest_source_query(
+    table_name: str,
+    text_column: str,
+    after: datetime.date,
+    tracked: bool = False,
+    ingested_after: datetime.datetime | None = None,
+) -> BuiltQuery:
+    """Notes published after `after`, with just what the suggestion index counts.
+
+    `tracked` adds row_hash and ingested_at (ingestion-owned tables), and
+    `ingested_after` keeps only the notes ingested after it.
+    """
+    if text_column not in ("description", "description_text"):
+        raise ValueError(f"Can't build suggestions from column {text_column!r}")
+    columns = f"product_name, release_note_type, published_at, {text_column} AS text"
+    where = "published_at > @after"
+    params = [bigquery.ScalarQueryParameter("after", "DATE", after)]
+    if tracked:
+        columns += ", row_hash, ingested_at"
+    if ingested_after is not None:
+        where += " AND ingested_at > @ingested_after"
+        params.append(bigquery.ScalarQueryParameter("ingested_after", "TIMESTAMP", ingested_after))
+    return BuiltQuery(f"SELECT {columns}\nFROM {table_ref(table_name)}\nWHERE {where}", tuple(params))
+
+
+# --------------- In-memory note store ---------------
+
+
+def note_store_query(
+    table_name: str, columns: list[str], ingested_after: datetime.datetime | None = None
+) -> BuiltQuery:
+    """Every note with `columns`, or only those ingested after `ingested_after`."""
+    sql = f"SELECT {', '.join(columns)}\nFROM {table_ref(table_name)}"
+    if ingested_after is None:
+        return BuiltQuery(sql)
+    return BuiltQuery(
+        sql + "\nWHERE ingested_at > @ingested_after",
+        (bigquery.ScalarQueryParameter("ingested_after", "TIMESTAMP", ingested_after),),
+    )
@@ -0,0 +1,121 @@
+"""Pre-rendered description fragments, computed once per note and cached by row_hash or text.
+
+The frontend used to strip tags, drop kramdown attributes and split
+track-name blocks for every card on every Streamlit rerun. The backend now
+does that once per note and ships the results alongside each row, so the
+frontend only has to place the fragments.
+
+The HTML fragments are sanitized (nh3's allowlist, see
+ingestion/src/markup.py): rendered here, or re-sanitized when they come
+from the table's columns, since rows ingested before the job sanitized
+them carry whatever the feed had. strip_html, clean_html, remove_blocks
+and split_tracks are re-exported for the rest of the backend.
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable
+
+# The cleaning rules are the ingestion job's (ingestion/src/markup.py), so
+# rows rendered here match the columns it writes. The image copies that
+# module next to app.py; run from backend/, it's found from the repo root.
+if importlib.util.find_spec("ingestion") is None:
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+from ingestion.src.markup import (  # noqa: E402
+    TRACK_RE as TRACK_PATTERN,
+    clean_html,
+    plain_text,
+    remove_blocks,
+    sanitize_html,
+    split_tracks,
+    strip_html,
+)
+
+RENDER_CACHE_SIZE = int(os.environ.get("RENDER_CACHE_SIZE", "20000"))
+
+# The columns the ingestion job's normalization stage writes, which
+# attach_render_artifacts() uses instead of rendering (see _from_normalized).
+RENDERED_COLUMNS = ["description_text", "description_html_clean", "tracks"]
+
+_cache: OrderedDict[str, dict] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _build(description: str) -> dict:
+    html = clean_html(description)
+    intro, tracks = split_tracks(html)
+    return {
+        "description_text": plain_text(description),
+        "description_html": intro if tracks else html.strip(),
+        "tracks": tracks,
+    }
+
+
+def render_description(description: str | None, row_hash: str | None = None) -> dict:
+    """Return the render artifacts for one note, cached by `row_hash` (or the description itself).
+
+    Without a row_hash (the public dataset) the key is the description
+    string: a dict lookup hashes it natively, far cheaper than digesting
+    every row on every request.
+    """
+    if not description or not isinstance(description, str):
+        return {"description_text": "", "description_html": "", "tracks": []}
+
+    key = row_hash or description
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    rendered = _build(description)
+    with _cache_lock:
+        _cache[key] = rendered
+        if len(_cache) > RENDER_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return rendered
+
+
+def render_columns(descriptions: Iterable[str | None]) -> dict[str, list]:
+    """RENDERED_COLUMNS for notes whose table lacks them, rendered without the cache.
+
+    For bulk loads like the in-memory note store, which keeps the result as
+    columns and so stands in for this module's cache.
+    """
+    columns: dict[str, list] = {name: [] for name in RENDERED_COLUMNS}
+    for description in descriptions:
+        description = description if isinstance(description, str) else ""
+        html = clean_html(description).strip()
+        columns["description_text"].append(plain_text(description))
+        columns["description_html_clean"].append(html)
+        columns["tracks"].append(split_tracks(html)[1])
+    return columns
+
+
+def _from_normalized(record: dict) -> dict | None:
+    """Reuse the columns the ingestion job's normalization stage already wrote, if present."""
+    html = record.pop("description_html_clean", None)
+    tracks = record.pop("tracks", None)
+    text = record.get("description_text")
+    if not isinstance(html, str) or not isinstance(text, str) or tracks is None:
+        return None
+    html = sanitize_html(html)
+    tracks = [{"name": t["name"], "html": sanitize_html(t["html"])} for t in tracks]
+    intro = TRACK_PATTERN.split(html, maxsplit=1)[0].strip() if tracks else html
+    return {"description_text": text, "description_html": intro, "tracks": tracks}
+
+
+def attach_render_artifacts(records: list[dict]) -> list[dict]:
+    """Add description_text / description_html / tracks to each record, in place."""
+    for record in records:
+        rendered = _from_normalized(record)
+        if rendered is None:
+            rendered = render_description(record.get("description"), record.get("row_hash"))
+        record.update(rendered)
+        if "word_count" in record and not isinstance(record["word_count"], int):
+            record["word_count"] = None
+    return records
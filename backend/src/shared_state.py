@@ -0,0 +1,213 @@
+"""State built once per container and shared by every uvicorn worker.
+
+`uvicorn --workers N` (or WEB_CONCURRENCY=N) forks N copies of the app,
+and each would otherwise run its own startup queries, pull its own copy
+of the note store and build its own suggestion index. With WORKERS > 1
+the workers coordinate through files in a directory named after their
+supervisor's pid (so a restarted server never reads a previous one's
+state):
+
+  once(name, build)    the first worker to take `name`'s file lock runs
+                       build() and writes the JSON result; the others
+                       wait on the lock and read it (startup state)
+  try_lead()           one worker at a time holds the leader lock and
+                       refreshes from BigQuery; if it exits, the lock is
+                       released and another worker takes over
+  publish / latest     the leader writes a snapshot file plus a small
+                       JSON manifest; followers poll the manifest and load
+                       the file (the note store memory-maps it, so its
+                       pages are shared rather than copied per worker)
+  request              any worker can ask the leader to refresh early
+
+Everything is local files and fcntl locks, so it only spans the workers
+of one container, which is all uvicorn's --workers can start anyway.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.environ.get("WEB_CONCURRENCY", "1"))
+SHARED_STATE_DIR = os.environ.get("SHARED_STATE_DIR") or os.path.join(tempfile.gettempdir(), "release-notes-backend")
+SHARED_STATE_POLL_SECONDS = float(os.environ.get("SHARED_STATE_POLL_SECONDS", "2"))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedState:
+    """Files shared by the workers of one uvicorn supervisor (this process's parent)."""
+
+    def __init__(self, root: str = SHARED_STATE_DIR, supervisor: int | None = None):
+        supervisor = supervisor or os.getppid()
+        self.root = Path(root)
+        self.directory = self.root / str(supervisor)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._leader_fd: int | None = None
+        self._lock = threading.Lock()
+        self._remove_stale()
+
+    def _remove_stale(self) -> None:
+        """Delete directories left behind by supervisors that are no longer running."""
+        for entry in self.root.iterdir():
+            if entry.is_dir() and entry.name.isdigit() and entry != self.directory and not _pid_alive(int(entry.name)):
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @contextmanager
+    def _locked(self, name: str):
+        fd = os.open(self.directory / f"{name}.lock", os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _write_json(self, name: str, data: dict) -> None:
+        path = self.directory / f"{name}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, default=str))
+        os.replace(tmp, path)
+
+    def _read_json(self, name: str) -> dict | None:
+        try:
+            return json.loads((self.directory / f"{name}.json").read_text())
+        except FileNotFoundError:
+            return None
+
+    def once(self, name: str, build: Callable[[], dict]) -> dict:
+        """build() in the first worker to get here; every worker returns its result."""
+        with self._locked(name):
+            data = self._read_json(name)
+            if data is None:
+                data = build()
+                self._write_json(name, data)
+                logger.info("Shared %s built by worker %d", name, os.getpid())
+            return data
+
+    def try_lead(self) -> bool:
+        """Whether this worker holds the leader lock, taking it if it's free."""
+        with self._lock:
+            if self._leader_fd is not None:
+                return True
+            fd = os.open(self.directory / "leader.lock", os.O_CREAT | os.O_RDWR)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            self._leader_fd = fd
+            logger.info("Worker %d leads shared-state refreshes", os.getpid())
+            return True
+
+    def publish(self, name: str, suffix: str, write: Callable[[Path], None], **meta) -> Path:
+        """Write a new snapshot file via write(path), then point `name`'s manifest at it.
+
+        The previous file is unlinked; workers that still have it open (or
+        memory-mapped) keep reading it until they load the new one.
+        """
+        previous = self.latest(name)
+        serial = (previous or {}).get("serial", 0) + 1
+        path = self.directory / f"{name}-{serial}{suffix}"
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        write(tmp)
+        os.replace(tmp, path)
+        self._write_json(name, {**meta, "serial": serial, "path": str(path)})
+        if previous:
+            Path(previous["path"]).unlink(missing_ok=True)
+        return path
+
+    def request(self, name: str) -> None:
+        """Ask the leader to refresh `name` now; see PollingRefresher."""
+        (self.directory / f"{name}.request").touch()
+
+    def take_request(self, name: str) -> bool:
+        """Whether a refresh of `name` was requested since the last call (consumes the request)."""
+        try:
+            (self.directory / f"{name}.request").unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def latest(self, name: str) -> dict | None:
+        """The manifest of `name`'s newest snapshot: publish()'s meta plus `path`, or None."""
+        return self._read_json(name)
+
+
+def shared_state() -> SharedState | None:
+    """A SharedState when running with more than one worker, else None."""
+    return SharedState() if WORKERS > 1 else None
+
+
+class PollingRefresher:
+    """Base for the background refreshers: a daemon thread that calls refresh().
+
+    It waits `interval` seconds between calls while leading (or running
+    alone), SHARED_STATE_POLL_SECONDS while following another worker, and
+    no longer once request_refresh() is called — in any worker, which
+    leaves a request file the leader picks up on its next poll.
+    """
+
+    name = "refresher"
+    interval = 300.0
+
+    def __init__(self, shared: SharedState | None = None):
+        self.shared = shared
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> bool:
+        raise NotImplementedError
+
+    def request_refresh(self) -> None:
+        """Refresh now rather than at the next interval (e.g. after an ingestion run)."""
+        if self.shared:
+            self.shared.request(self.name)
+        self._wake.set()
+
+    def _sleep(self) -> None:
+        leading = self.shared is None or self.shared.try_lead()
+        deadline = time.monotonic() + (self.interval if leading else SHARED_STATE_POLL_SECONDS)
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self._wake.wait(min(remaining, SHARED_STATE_POLL_SECONDS) if self.shared else remaining):
+                self._wake.clear()
+                return
+            if leading and self.shared and self.shared.take_request(self.name):
+                return
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("%s refresh failed; keeping the previous state", self.name)
+            self._sleep()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
@@ -0,0 +1,323 @@
+"""Watchlist subscriptions, matched against each batch of newly ingested notes.
+
+A subscription names a subscriber and any of products, note types,
+keywords and a platform; a note matches when it satisfies every field
+that's set (any product, any type, any keyword). A keyword matches when
+the note's description has all of its words. Subscriptions live in
+one JSON file (SUBSCRIPTIONS_PATH), written under a file lock so every
+uvicorn worker can add and remove them.
+
+Matching doesn't test every subscription against every note: a
+SubscriptionIndex files each subscription under one key — the rarest
+word of each keyword if it has any, else its products, else its types —
+and a note only looks up its own product, type and words, then checks
+the few candidates it finds. Rarest means the fewest notes in the
+suggestion index's term counts (src/suggest.py); before those are
+loaded, the longest word stands in. The cost grows with the new notes, not with the
+number of subscriptions. Only subscriptions without a product, type or
+indexable keyword are checked against every note.
+
+The note store's leader calls SubscriptionMatcher.on_rows() with every
+batch it pulls from an ingestion-owned table — the incremental pulls and
+the full loads (at startup, and the periodic reload) alike — and the
+matches go to the notifiers (src/notifiers.py). What counts as new is
+decided here, against a MatchCursor kept next to the subscriptions file:
+the newest `ingested_at` matched so far, plus the row_hash of each note
+matched within NOTE_STORE_LOOKBACK_MINUTES of it. So notes ingested
+while the backend was down are matched on the next load, a note is
+matched once however many pulls see it, and the very first load only
+sets the cursor — the notes already in the table aren't news. Delivery is
+at least once: the cursor moves after the notifiers ran.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from src.note_store import NOTE_STORE_LOOKBACK_MINUTES
+from src.notifiers import Notification, Notifier
+from src.render import strip_html
+from src.suggest import SuggestIndexRefresher, tokenize
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTIONS_PATH = os.environ.get("SUBSCRIPTIONS_PATH") or str(
+    Path(__file__).resolve().parent.parent / "subscriptions.json"
+)
+# Notes per notification; a subscription matching more gets the newest ones and the total.
+NOTIFY_MAX_NOTES = int(os.environ.get("NOTIFY_MAX_NOTES", "20"))
+
+NOTE_FIELDS = ["platform", "product_name", "release_note_type", "published_at", "description_text"]
+
+
+@dataclass(frozen=True)
+class Subscription:
+    subscriber: str
+    products: tuple[str, ...] = ()
+    types: tuple[str, ...] = ()
+    keywords: tuple[str, ...] = ()
+    platform: str | None = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Subscription":
+        return cls(
+            subscriber=data["subscriber"],
+            products=tuple(data.get("products") or ()),
+            types=tuple(data.get("types") or ()),
+            keywords=tuple(k.lower() for k in data.get("keywords") or ()),
+            platform=data.get("platform"),
+            **({"id": data["id"]} if data.get("id") else {}),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @cached_property
+    def keyword_words(self) -> list[set[str]]:
+        """Each keyword's words, as suggest.tokenize() splits them (empty for "ai", "s3", ...)."""
+        return [tokenize(k) for k in self.keywords]
+
+    def _has_keyword(self, text: str, words: set[str]) -> bool:
+        return any(
+            kw <= words if kw else re.search(rf"\b{re.escape(k)}\b", text)
+            for k, kw in zip(self.keywords, self.keyword_words)
+        )
+
+    def matches(self, note: dict, text: str, words: set[str]) -> bool:
+        """`text` is the note's lowercased plain-text description, `words` its tokenize()d words."""
+        return (
+            (not self.products or note["product_name"] in self.products)
+            and (not self.types or note["release_note_type"] in self.types)
+            and (not self.platform or (note.get("platform") or "GCP") == self.platform)
+            and (not self.keywords or self._has_keyword(text, words))
+        )
+
+
+class SubscriptionIndex:
+    """Inverted index from product, type and keyword to the subscriptions filed under it."""
+
+    def __init__(self, subscriptions: list[Subscription], word_count: Callable[[str], int] | None = None):
+        """`word_count(word)`: how many notes have the word, to file keywords under their rarest one."""
+        self.by_product: dict[str, list[Subscription]] = defaultdict(list)
+        self.by_type: dict[str, list[Subscription]] = defaultdict(list)
+        self.by_word: dict[str, list[Subscription]] = defaultdict(list)
+        self.unindexed: list[Subscription] = []
+
+        def rarity(word: str) -> tuple:
+            return (word_count(word) if word_count else 0, -len(word), word)
+
+        for sub in subscriptions:
+            # Filed under its most selective field: a word is rarer than a product.
+            if sub.keywords and all(sub.keyword_words):
+                # Any one word per keyword will do, since a matching note has all of
+                # them; the rarest makes the fewest candidates.
+                for word in {min(kw, key=rarity) for kw in sub.keyword_words}:
+                    self.by_word[word].append(sub)
+            elif sub.products:
+                for product in sub.products:
+                    self.by_product[product].append(sub)
+            elif sub.types:
+                for note_type in sub.types:
+                    self.by_type[note_type].append(sub)
+            else:
+                self.unindexed.append(sub)
+        self.size = len(subscriptions)
+
+    def match(self, note: dict, text: str, words: set[str]) -> list[Subscription]:
+        candidates = {}
+        for sub in self.by_product.get(note["product_name"], ()):
+            candidates[sub.id] = sub
+        for sub in self.by_type.get(note["release_note_type"], ()):
+            candidates[sub.id] = sub
+        for word in words if self.by_word else ():
+            for sub in self.by_word.get(word, ()):
+                candidates[sub.id] = sub
+        for sub in self.unindexed:
+            candidates[sub.id] = sub
+        return [sub for sub in candidates.values() if sub.matches(note, text, words)]
+
+
+class SubscriptionStore:
+    """The subscriptions file; re-read when another worker changes it."""
+
+    def __init__(self, path: str = SUBSCRIPTIONS_PATH):
+        self.path = Path(path)
+        self._loaded: tuple[int, list[Subscription]] = (-1, [])
+        self._index: tuple[tuple, SubscriptionIndex] | None = None
+
+    @contextmanager
+    def _locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path.with_suffix(".lock"), os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _mtime(self) -> int:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def all(self) -> list[Subscription]:
+        mtime = self._mtime()
+        if mtime != self._loaded[0]:
+            data = json.loads(self.path.read_text()) if mtime else {}
+            self._loaded = (mtime, [Subscription.from_dict(d) for d in data.get("subscriptions", [])])
+        return self._loaded[1]
+
+    def _write(self, subscriptions: list[Subscription]) -> None:
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"subscriptions": [s.to_dict() for s in subscriptions]}, indent=2))
+        os.replace(tmp, self.path)
+
+    def add(self, subscription: Subscription) -> Subscription:
+        with self._locked():
+            self._write(self.all() + [subscription])
+        return subscription
+
+    def remove(self, subscription_id: str, subscriber: str) -> bool:
+        with self._locked():
+            current = self.all()
+            kept = [s for s in current if not (s.id == subscription_id and s.subscriber == subscriber)]
+            if len(kept) == len(current):
+                return False
+            self._write(kept)
+        return True
+
+    def for_subscriber(self, subscriber: str) -> list[Subscription]:
+        return [s for s in self.all() if s.subscriber == subscriber]
+
+    def index(self, terms: SuggestIndexRefresher | None = None) -> SubscriptionIndex:
+        """The index over the current subscriptions, rebuilt only when the file or `terms`' counts change."""
+        subscriptions = self.all()
+        counted = terms is not None and terms.index is not None
+        key = (self._loaded[0], terms.version if counted else None)
+        if self._index is None or self._index[0] != key:
+            self._index = (key, SubscriptionIndex(subscriptions, terms.term_count if counted else None))
+        return self._index[1]
+
+
+class MatchCursor:
+    """How far matching got: the newest ingested_at matched, and the notes matched just before it.
+
+    A JSON file next to the subscriptions (so on the same volume), written
+    under the same lock.
+    """
+
+    def __init__(self, store: SubscriptionStore):
+        self.store = store
+        self.path = store.path.with_suffix(".cursor.json")
+
+    def load(self) -> tuple[pd.Timestamp | None, dict[str, pd.Timestamp]]:
+        """(matched through, {row_hash: ingested_at} of the recently matched notes)."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return None, {}
+        recent = {h: pd.Timestamp(t) for h, t in data.get("recent", {}).items()}
+        return pd.Timestamp(data["matched_through"]), recent
+
+    def save(self, matched_through: pd.Timestamp, recent: dict[str, pd.Timestamp]) -> None:
+        data = {"matched_through": matched_through.isoformat(), "recent": {h: t.isoformat() for h, t in recent.items()}}
+        with self.store._locked():
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, self.path)
+
+
+def _notes(df: pd.DataFrame) -> list[dict]:
+    notes = df[[c for c in NOTE_FIELDS + ["description"] if c in df.columns]].copy()
+    if "description_text" not in notes.columns:
+        notes["description_text"] = [strip_html(d) for d in notes["description"]]
+    notes["published_at"] = notes["published_at"].astype(str)
+    return notes.drop(columns=["description"], errors="ignore").astype(object).where(notes.notna(), None).to_dict("records")
+
+
+class SubscriptionMatcher:
+    """Matches newly pulled notes against the subscriptions and hands the matches to the notifiers."""
+
+    def __init__(
+        self, store: SubscriptionStore, notifiers: list[Notifier], terms: SuggestIndexRefresher | None = None
+    ):
+        self.store = store
+        self.notifiers = notifiers
+        self.terms = terms  # term counts, to index keywords by their rarest word
+        self.cursor = MatchCursor(store)
+
+    def unmatched(self, df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Timestamp | None, dict[str, pd.Timestamp]]:
+        """The rows of `df` not matched yet, and the cursor to save once they have been."""
+        matched_through, recent = self.cursor.load()
+        stamps = pd.to_datetime(df["ingested_at"], utc=True)
+        newest = stamps.max()
+        if pd.isna(newest):
+            return df.iloc[:0], matched_through, recent
+        if matched_through is None:
+            fresh = pd.Series(False, index=df.index)  # the first load: start from here
+        else:
+            lookback = pd.Timedelta(minutes=NOTE_STORE_LOOKBACK_MINUTES)
+            fresh = (stamps > matched_through - lookback) & ~df["row_hash"].isin(list(recent))
+            newest = max(newest, matched_through)
+        horizon = newest - pd.Timedelta(minutes=NOTE_STORE_LOOKBACK_MINUTES)
+        recent = {h: t for h, t in recent.items() if t > horizon}
+        recent.update((h, t) for h, t in zip(df["row_hash"], stamps) if pd.notna(t) and t > horizon)
+        return df[fresh], newest, recent
+
+    def match(self, df: pd.DataFrame) -> dict[str, tuple[Subscription, list[dict]]]:
+        """Subscription id -> (subscription, matching notes) for a batch of new rows."""
+        index = self.store.index(self.terms)
+        matched: dict[str, tuple[Subscription, list[dict]]] = {}
+        if not index.size or df.empty:
+            return matched
+        for note in _notes(df):
+            text = (note["description_text"] or "").lower()
+            for sub in index.match(note, text, tokenize(text)):
+                matched.setdefault(sub.id, (sub, []))[1].append(note)
+        return matched
+
+    def on_rows(self, df: pd.DataFrame, version: str) -> None:
+        """NoteStoreRefresher's on_rows: notify every subscription the rows not matched yet match."""
+        started = time.perf_counter()
+        pulled = len(df)
+        df, matched_through, recent = self.unmatched(df)
+        matched = self.match(df)
+        notifications = [
+            Notification(
+                subscription_id=sub.id,
+                subscriber=sub.subscriber,
+                version=version,
+                total=len(notes),
+                notes=sorted(notes, key=lambda n: n["published_at"] or "", reverse=True)[:NOTIFY_MAX_NOTES],
+            )
+            for sub, notes in matched.values()
+        ]
+        logger.info(
+            "Matched %d new rows (of %d pulled) against %d subscriptions: %d notifications, %.0f ms",
+            len(df),
+            pulled,
+            self.store.index(self.terms).size,
+            len(notifications),
+            (time.perf_counter() - started) * 1000,
+        )
+        for notifier in self.notifiers if notifications else []:
+            try:
+                notifier.send(notifications)
+            except Exception:
+                logger.exception("Notifier %s failed", notifier.name)
+        if matched_through is not None:
+            self.cursor.save(matched_through, recent)
@@ -0,0 +1,296 @@
+"""Search-as-you-type completions from an in-memory prefix index.
+
+Keyword search used to mean a BigQuery LIKE scan per search, far too slow
+per keystroke. Suggestions come from here instead, without touching
+BigQuery on the request path. The index holds three kinds of completion,
+ranked by how many notes carry them:
+
+  product   product_name values          (the frontend applies a product filter)
+  type      release_note_type values     (applies a type filter)
+  term      frequent description words   (becomes the keyword search)
+
+Every word start of a completion is a key, so "kub" finds "Google
+Kubernetes Engine". Keys live in one sorted list searched with bisect,
+and the ranked completions for every prefix of up to SHORT_PREFIX
+characters — the widest ranges — are precomputed, so a lookup is a dict
+hit or a bisect plus ranking of a short range: well under a millisecond.
+
+SuggestIndexRefresher keeps the index current from a background thread.
+It polls the table's data version (last-modified time and row count);
+when that changes, it pulls only the new notes, merges their counts and
+swaps in a new index. On ingestion-owned tables the new notes are those
+with `ingested_at` after the last pull's newest, less
+SUGGEST_LOOKBACK_MINUTES, published in the last SUGGEST_OVERLAP_DAYS
+before the newest note counted; notes already counted are dropped by
+row_hash, so a day's later syncs (and a product's first notes) count
+as soon as they land. On tables without `ingested_at` they're the notes
+published after the newest one counted. Notes back-dated past the
+overlap are picked up by the periodic full rebuild
+(SUGGEST_FULL_REBUILD_HOURS). With several workers, only the
+leader (src/shared_state.py) queries BigQuery; it publishes the counts
+and the other workers build their index from them.
+"""
+
+import bisect
+import datetime
+import heapq
+import logging
+import os
+import pickle
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.queries import get_data_version, get_table_columns, run_query
+from src.query_builder import suggest_source_query
+from src.render import remove_blocks
+from src.shared_state import PollingRefresher, SharedState
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_REFRESH_SECONDS = float(os.environ.get("SUGGEST_REFRESH_SECONDS", "300"))
+SUGGEST_FULL_REBUILD_HOURS = float(os.environ.get("SUGGEST_FULL_REBUILD_HOURS", "24"))
+SUGGEST_LOOKBACK_MINUTES = float(os.environ.get("SUGGEST_LOOKBACK_MINUTES", "60"))
+SUGGEST_OVERLAP_DAYS = int(os.environ.get("SUGGEST_OVERLAP_DAYS", "7"))
+SUGGEST_WINDOW_DAYS = int(os.environ.get("SUGGEST_WINDOW_DAYS", "730"))
+SUGGEST_MAX_TERMS = int(os.environ.get("SUGGEST_MAX_TERMS", "20000"))
+SUGGEST_MIN_TERM_COUNT = int(os.environ.get("SUGGEST_MIN_TERM_COUNT", "3"))
+
+SHORT_PREFIX = 3
+MAX_LIMIT = 20
+KIND_WEIGHT = {"product": 3.0, "type": 3.0, "term": 1.0}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+_STOPWORDS = frozenset(
+    """
+    the and for with that this from are was were will can you your not but all any has have had into
+    its than then them they their there these those when which while who why how what also more most
+    such via per use used using now new may only other some each same been being see our out over
+    about after before under between both does did done just like make makes must should would could
+    nbsp amp quot http https www com html href
+    """.split()
+)
+
+
+def tokenize(text: str) -> set[str]:
+    """Distinct lowercase words of `text` worth suggesting (3+ chars, no stopwords).
+
+    Tags become spaces (not "", as in render.strip_html) so words either side don't fuse.
+    """
+    plain = _TAG_RE.sub(" ", remove_blocks(text)).lower()
+    return {w for w in _WORD_RE.findall(plain) if len(w) >= 3 and w not in _STOPWORDS}
+
+
+@dataclass(frozen=True)
+class Completion:
+    text: str
+    kind: str
+    count: int
+
+
+class PrefixIndex:
+    """Immutable prefix index over counted completions; build a new one to update."""
+
+    def __init__(self, counts: Counter):
+        # A term that is also a product or type name ("bigquery") would just duplicate it.
+        names = {text.lower() for kind, text in counts if kind != "term"}
+        terms = [
+            (key, n)
+            for key, n in counts.items()
+            if key[0] == "term" and n >= SUGGEST_MIN_TERM_COUNT and key[1] not in names
+        ]
+        terms = heapq.nlargest(SUGGEST_MAX_TERMS, terms, key=lambda item: item[1])
+        entries = [(key, n) for key, n in counts.items() if key[0] != "term" and n > 0] + terms
+
+        self.completions = [Completion(text, kind, n) for (kind, text), n in entries]
+        self._score = [n * KIND_WEIGHT[kind] for (kind, _), n in entries]
+
+        keyed = []
+        for i, completion in enumerate(self.completions):
+            words = completion.text.lower().split()
+            for start in range(len(words)):
+                # Matches on a later word ("kub" -> Google Kubernetes Engine) rank at half weight.
+                keyed.append((" ".join(words[start:]), i, 1.0 if start == 0 else 0.5))
+        keyed.sort()
+        self._keys = [key for key, _, _ in keyed]
+        self._entries = [(i, weight) for _, i, weight in keyed]
+
+        short: dict[str, dict[int, float]] = {}
+        for key, i, weight in keyed:
+            rank = self._score[i] * weight
+            for n in range(1, min(SHORT_PREFIX, len(key)) + 1):
+                ranks = short.setdefault(key[:n], {})
+                if rank > ranks.get(i, 0.0):
+                    ranks[i] = rank
+        self._short = {
+            prefix: sorted(ranks, key=lambda i: (-ranks[i], self.completions[i].text))
+            for prefix, ranks in short.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.completions)
+
+    def complete(self, prefix: str, limit: int = 8, kinds: list[str] | None = None) -> list[Completion]:
+        """Up to `limit` completions of `prefix`, best first, optionally only of `kinds`."""
+        query = " ".join(prefix.lower().split())
+        if not query:
+            return []
+        wanted = set(kinds) if kinds else None
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        if len(query) <= SHORT_PREFIX and query in self._short:
+            ids = (i for i in self._short[query] if wanted is None or self.completions[i].kind in wanted)
+            return [self.completions[i] for _, i in zip(range(limit), ids)]
+
+        lo = bisect.bisect_left(self._keys, query)
+        hi = bisect.bisect_left(self._keys, query + "\uffff", lo)
+        ranks: dict[int, float] = {}
+        for i, weight in self._entries[lo:hi]:
+            if wanted is not None and self.completions[i].kind not in wanted:
+                continue
+            rank = self._score[i] * weight
+            if rank > ranks.get(i, 0.0):
+                ranks[i] = rank
+        best = heapq.nsmallest(limit, ranks, key=lambda i: (-ranks[i], self.completions[i].text))
+        return [self.completions[i] for i in best]
+
+
+def count_rows(df: pd.DataFrame) -> Counter:
+    """Completion counts for a batch of notes: one per note per product, type and distinct term."""
+    counts: Counter = Counter()
+    if df.empty:
+        return counts
+    counts.update(("product", p) for p in df["product_name"].dropna())
+    counts.update(("type", t) for t in df["release_note_type"].dropna())
+    for text in df["text"].dropna():
+        counts.update(("term", word) for word in tokenize(text))
+    return counts
+
+
+class SuggestIndexRefresher(PollingRefresher):
+    """Owns the current PrefixIndex and rebuilds it when the table's data changes."""
+
+    name = "suggest-index"
+    interval = SUGGEST_REFRESH_SECONDS
+
+    def __init__(self, client, table_name: str, text_column: str, shared: SharedState | None = None):
+        super().__init__(shared)
+        self.client = client
+        self.table_name = table_name
+        # "description_text" on ingestion-owned tables, raw HTML "description" otherwise;
+        # tokenize() copes with both.
+        self.text_column = text_column
+        self.index: PrefixIndex | None = None
+        self.version: str | None = None
+        self._counts: Counter = Counter()
+        self._watermark: datetime.date | None = None
+        # Ingestion-owned tables only: the newest ingested_at counted, and the
+        # row_hash of each note counted within SUGGEST_LOOKBACK_MINUTES of it.
+        self._tracked: bool | None = None
+        self._ingested: pd.Timestamp | None = None
+        self._recent: dict[str, pd.Timestamp] = {}
+        self._full_built_at = 0.0
+        self._serial: int | None = None  # of the last snapshot followed
+
+    def term_count(self, word: str) -> int:
+        """Notes (in the window) whose text has `word`; 0 before the index is built."""
+        return self._counts.get(("term", word), 0)
+
+    def _pull(
+        self, after: datetime.date, ingested_after: pd.Timestamp | None = None
+    ) -> tuple[Counter, datetime.date | None]:
+        query = suggest_source_query(self.table_name, self.text_column, after, self._tracked, ingested_after)
+        df = run_query(query, self.client)
+        if self._tracked:
+            df = self._uncounted(df)
+        if df.empty:
+            return Counter(), None
+        return count_rows(df), max(df["published_at"])
+
+    def _uncounted(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` without the notes already counted; moves the ingested_at watermark past the rest."""
+        stamps = pd.to_datetime(df["ingested_at"], utc=True)
+        fresh = ~df["row_hash"].isin(list(self._recent))
+        newest = stamps.max()
+        if pd.notna(newest):
+            self._ingested = max(self._ingested, newest) if self._ingested is not None else newest
+        if self._ingested is not None:
+            horizon = self._ingested - pd.Timedelta(minutes=SUGGEST_LOOKBACK_MINUTES)
+            self._recent = {h: t for h, t in self._recent.items() if t > horizon}
+            self._recent.update(
+                (h, t) for h, t in zip(df["row_hash"][fresh], stamps[fresh]) if pd.notna(t) and t > horizon
+            )
+        return df[fresh]
+
+    def _follow(self) -> bool:
+        """Index the leader's newest published counts, if this worker hasn't yet."""
+        manifest = self.shared.latest("suggest")
+        if manifest is None or manifest["serial"] == self._serial:
+            return False
+        self._serial = manifest["serial"]
+        with open(manifest["path"], "rb") as f:
+            self._counts, self._ingested, self._recent = pickle.load(f)
+        self._watermark = datetime.date.fromisoformat(manifest["watermark"])
+        self._full_built_at = time.monotonic()
+        self.index = PrefixIndex(self._counts)
+        self.version = manifest["version"]
+        return True
+
+    def _publish(self) -> None:
+        def write(path):
+            with open(path, "wb") as f:
+                pickle.dump((self._counts, self._ingested, self._recent), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.shared.publish("suggest", ".pickle", write, version=self.version, watermark=self._watermark)
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the table; returns whether it was rebuilt."""
+        if self.shared and not self.shared.try_lead():
+            return self._follow()
+        if self.shared and self.index is None:
+            self._follow()  # a new leader carries on from the last published counts
+
+        version = get_data_version(self.client, self.table_name)
+        full = (
+            self.index is None
+            or time.monotonic() - self._full_built_at > SUGGEST_FULL_REBUILD_HOURS * 3600
+        )
+        if not full and version == self.version:
+            return False
+
+        started = time.perf_counter()
+        if self._tracked is None:
+            self._tracked = {"ingested_at", "row_hash"} <= get_table_columns(self.client, self.table_name)
+        if full:
+            after = datetime.date.today() - datetime.timedelta(days=SUGGEST_WINDOW_DAYS)
+            self._ingested, self._recent = None, {}
+            counts, watermark = self._pull(after)
+            self._counts, self._watermark = counts, watermark or after
+            self._full_built_at = time.monotonic()
+        else:
+            if self._tracked and self._ingested is not None:
+                lookback = pd.Timedelta(minutes=SUGGEST_LOOKBACK_MINUTES)
+                after = self._watermark - datetime.timedelta(days=SUGGEST_OVERLAP_DAYS)
+                counts, watermark = self._pull(after, pd.Timestamp(self._ingested) - lookback)
+            else:
+                counts, watermark = self._pull(self._watermark)
+            self._counts.update(counts)
+            self._watermark = max(self._watermark, watermark) if watermark else self._watermark
+
+        self.index = PrefixIndex(self._counts)
+        self.version = version
+        if self.shared:
+            self._publish()
+        logger.info(
+            "Suggest index %s: %d completions, %d counted, version %s, %.0f ms",
+            "built" if full else "updated",
+            len(self.index),
+            sum(counts.values()),
+            version,
+            (time.perf_counter() - started) * 1000,
+        )
+        return True
@@ -0,0 +1,128 @@
+"""OpenTelemetry tracing — off unless an exporter is configured.
+
+Configured with the standard OTEL_* variables, plus one of our own:
+
+  OTEL_TRACES_EXPORTER          "otlp" (to OTEL_EXPORTER_OTLP_ENDPOINT, e.g. a
+                                local collector on :4318), "console", or "none"
+  OTEL_SERVICE_NAME             defaults to "release-notes-backend"
+  OTEL_TRACES_FILE              also append every span as a JSON line to this file
+
+With none of them set (or without the SDK installed), span() is a no-op,
+so the instrumentation below costs nothing in production.
+"""
+
+import contextlib
+import json
+import logging
+import os
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # tracing is optional
+    propagate = trace = None
+
+logger = logging.getLogger(__name__)
+
+_tracer = None
+
+
+def init_tracing(default_service_name: str) -> bool:
+    """Install a tracer provider from the OTEL_* env vars. Returns whether tracing is on."""
+    global _tracer
+    if _tracer is not None:
+        return True
+    exporter = os.environ.get("OTEL_TRACES_EXPORTER", "none").lower()
+    path = os.environ.get("OTEL_TRACES_FILE")
+    if trace is None or (exporter == "none" and not path):
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("OTEL_TRACES_EXPORTER is set but opentelemetry-sdk isn't installed; tracing is off")
+        return False
+
+    service_name = os.environ.get("OTEL_SERVICE_NAME", default_service_name)
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    elif exporter == "console":
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    if path:
+        out = open(path, "a", buffering=1)
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                ConsoleSpanExporter(out=out, formatter=lambda s: json.dumps(json.loads(s.to_json())) + "\n")
+            )
+        )
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(service_name)
+    logger.info("Tracing on: service=%s exporter=%s file=%s", service_name, exporter, path)
+    return True
+
+
+@contextlib.contextmanager
+def span(name: str, kind: str = "internal", context=None, **attributes):
+    """Start a span as a child of the current one (or of `context`); yields it, or None when off."""
+    if _tracer is None:
+        yield None
+        return
+    span_kind = getattr(trace.SpanKind, kind.upper())
+    attrs = {k: v for k, v in attributes.items() if v is not None}
+    with _tracer.start_as_current_span(name, context=context, kind=span_kind, attributes=attrs) as current:
+        yield current
+
+
+def set_attributes(current, **attributes) -> None:
+    """Set attributes on a span yielded by span(), skipping None values; no-op when off."""
+    if current is not None:
+        current.set_attributes({k: v for k, v in attributes.items() if v is not None})
+
+
+def extract_context(headers):
+    """Parent context from incoming W3C `traceparent` headers, for a server span."""
+    if _tracer is None:
+        return None
+    return propagate.extract(headers)
+
+
+def fastapi_traces_requests() -> bool:
+    """Whether this FastAPI emits its own server spans once a tracer provider is set."""
+    try:
+        import fastapi.telemetry  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class TracingMiddleware:
+    """ASGI middleware: one server span per HTTP request, parented to the caller's traceparent.
+
+    Only needed on FastAPI versions without built-in telemetry.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        name = f"{scope['method']} {scope['path']}"
+        with span(
+            name,
+            kind="server",
+            context=extract_context(headers),
+            **{"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as current:
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    set_attributes(current, **{"http.response.status_code": message["status"]})
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
@@ -0,0 +1,61 @@
+"""Shared helpers for the benchmark scripts: timing, peak memory, JSON results."""
+
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def use_component(name: str) -> None:
+    """Put backend/, frontend/ or ingestion/ first on sys.path.
+
+    Each component has its own top-level `src` package, so a benchmark
+    process may only import one of them — the runner starts one process
+    per component.
+    """
+    sys.path.insert(0, str(REPO_ROOT / name))
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> dict:
+    """Run `fn` repeatedly; return wall-time stats (ms) and peak traced memory (KiB)."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def write_results(name: str, results: dict, out: str | None) -> None:
+    """Print `results` as JSON and, if `out` is set, write them there too."""
+    payload = {
+        "benchmark": name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    text = json.dumps(payload, indent=2, default=str)
+    print(text)
+    if out:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        Path(out).write_text(text + "\n")
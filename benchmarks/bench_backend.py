@@ -0,0 +1,480 @@
+"""
+Benchmark: backend query building, prompt assembly, rendering and endpoints.
+
+Everything runs against a synthetic corpus (corpus.py) loaded into
+FakeBigQueryClient (fake_bq.py), so no GCP access or LLM is needed:
+
+  query_release_notes   SQL building for common filter shapes, with a
+                        client that returns instantly (building cost only)
+  summary_prompt        build_summary_prompt() over a 100-row chat context
+  render                attach_render_artifacts() on a page, cold and warm cache
+  suggest               prefix index: full build, incremental refresh after
+                        new rows land, and lookups (budget: 5 ms)
+  note_store            in-memory store: full load, incremental refresh by
+                        ingested_at, and the filter shapes above answered
+                        from it vs. through the fake client (same totals
+                        and page dates, checked)
+  count_cube            the insight charts from the day × product × type
+                        count cube, per filter shape, vs. their SQL through
+                        the fake client (same counts, checked); plus the
+                        cube's build and an incremental update
+  subscriptions         matching a day's new notes against 1k / 10k
+                        subscriptions through the inverted index (keywords
+                        filed under their longest word, or their rarest by
+                        the suggest index's term counts) vs. testing each
+                        subscription (same matches, checked)
+  intent_router         routing sample Ask AI questions to SQL templates, and
+                        running the routed ones (instead of an LLM round trip)
+  endpoints             FastAPI routes through TestClient, app lifespan
+                        included, with the fake client behind them; plus
+                        the 304 revalidation of each with its ETag
+
+    python benchmarks/bench_backend.py [--rows 20000] [--out results/backend.json]
+"""
+
+import argparse
+import datetime as dt
+import logging
+import random
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from _common import measure, use_component, write_results
+from corpus import generate
+from fake_bq import FakeBigQueryClient
+
+use_component("backend")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app as backend_app  # noqa: E402
+from src import render  # noqa: E402
+from src.ai import build_summary_prompt  # noqa: E402
+from src.count_cube import CountCube, heatmap_from_cells  # noqa: E402
+from src.intent_router import IntentRouter  # noqa: E402
+from src.note_store import NoteStore, NoteStoreRefresher  # noqa: E402
+from src.queries import NOTE_COLUMNS, query_release_notes, run_query  # noqa: E402
+from src.query_builder import (  # noqa: E402
+    NoteFilters,
+    heatmap_query,
+    time_series_query,
+    top_products_query,
+    trailing_window,
+    type_distribution_query,
+)
+from src.subscriptions import Subscription, SubscriptionIndex, SubscriptionMatcher, SubscriptionStore  # noqa: E402
+from src.suggest import SuggestIndexRefresher, tokenize  # noqa: E402
+
+TABLE_NAME = "bench-project.bench_dataset.release_notes"
+
+
+class _InstantClient:
+    """Returns the same tiny result for every query, so only SQL building is timed."""
+
+    _page = pd.DataFrame({c: [] for c in NOTE_COLUMNS})
+    _count = pd.DataFrame({"total": [0]})
+
+    def query(self, sql, job_config=None, **kwargs):
+        df = self._count if "COUNT(*)" in sql else self._page
+        rows = type("Rows", (), {"to_dataframe": lambda _self, *a, **k: df})()
+        return type("Job", (), {"result": lambda _self, *a, **k: rows})()
+
+
+def _filter_shapes(corpus: pd.DataFrame) -> dict[str, dict]:
+    products = corpus["product_name"].value_counts().index.tolist()
+    end = corpus["published_at"].max()
+    return {
+        "no_filters": {},
+        "one_product": {"product_names": products[:1]},
+        "types_and_products": {"release_types": ["FEATURE", "FIX"], "product_names": products[:5]},
+        "date_range": {"start_date": end - dt.timedelta(days=90), "end_date": end},
+        "search": {"search_text": "migration"},
+        "everything": {
+            "release_types": ["BREAKING_CHANGE", "DEPRECATION"],
+            "product_names": products[:40],
+            "start_date": end - dt.timedelta(days=365),
+            "end_date": end,
+            "search_text": "region",
+        },
+    }
+
+
+def _query(client, shape: dict):
+    return query_release_notes(
+        shape.get("release_types", []),
+        shape.get("product_names", []),
+        shape.get("start_date"),
+        shape.get("end_date"),
+        shape.get("search_text", ""),
+        10,
+        0,
+        client,
+        TABLE_NAME,
+    )
+
+
+def bench_queries(corpus: pd.DataFrame, fake: FakeBigQueryClient, repeat: int) -> dict:
+    instant = _InstantClient()
+    results = {}
+    for label, shape in _filter_shapes(corpus).items():
+        fake.queries.clear()
+        rows, total = _query(fake, shape)
+        results[label] = {
+            "rows": len(rows),
+            "total": int(total),
+            "bytes_processed": sum(q["bytes"] for q in fake.queries),
+            "build": measure(lambda: _query(instant, shape), repeat * 20),
+            "fake_bq": measure(lambda: _query(fake, shape), repeat),
+        }
+    return results
+
+
+def bench_summary_prompt(corpus: pd.DataFrame, repeat: int) -> dict:
+    notes = corpus.head(100).copy()
+    notes["published_at"] = notes["published_at"].astype(str)
+    with_text = notes.copy()
+    with_text["description_text"] = with_text["description"].str.replace(r"<[^>]+>", "", regex=True)
+    question = "What breaking changes should I plan for this quarter?"
+    return {
+        "rows": len(notes),
+        "prompt_chars": len(build_summary_prompt(question, notes, len(notes), 5000)),
+        "raw_description": measure(lambda: build_summary_prompt(question, notes, len(notes), 5000), repeat),
+        "description_text": measure(lambda: build_summary_prompt(question, with_text, len(notes), 5000), repeat),
+    }
+
+
+def bench_render(corpus: pd.DataFrame, repeat: int) -> dict:
+    results = {}
+    for size in (10, 100):
+        records = corpus.head(size).to_dict(orient="records")
+
+        def cold():
+            render._cache.clear()
+            render.attach_render_artifacts([dict(r) for r in records])
+
+        def warm():
+            render.attach_render_artifacts([dict(r) for r in records])
+
+        results[f"page_{size}"] = {"cold": measure(cold, repeat), "warm": measure(warm, repeat)}
+    return results
+
+
+def bench_suggest(corpus: pd.DataFrame, repeat: int) -> dict:
+    fake = FakeBigQueryClient(corpus)
+    refresher = SuggestIndexRefresher(fake, TABLE_NAME, "description")
+    started = time.perf_counter()
+    refresher.refresh()
+    full_ms = (time.perf_counter() - started) * 1000
+
+    newer = generate(rows=max(len(corpus) // 100, 10), seed=7, end_date=dt.date.today() + dt.timedelta(days=2), days=2)
+    fake.load(pd.concat([newer, corpus], ignore_index=True))
+    started = time.perf_counter()
+    refresher.refresh()
+    incremental_ms = (time.perf_counter() - started) * 1000
+
+    index = refresher.index
+    lookups = {
+        prefix: measure(lambda: index.complete(prefix, 8), repeat * 200)
+        for prefix in ("c", "clo", "cloud", "cloud run", "kub", "migr", "zzz")
+    }
+    return {
+        "completions": len(index),
+        "full_build_ms": round(full_ms, 1),
+        "incremental_refresh_ms": round(incremental_ms, 1),
+        "lookup": lookups,
+    }
+
+
+def bench_note_store(corpus: pd.DataFrame, repeat: int) -> dict:
+    # As the ingestion job writes it: row_hash plus an ingested_at per sync.
+    corpus = corpus.assign(row_hash=[f"row-{i}" for i in range(len(corpus))], ingested_at=pd.Timestamp("2024-01-01", tz="UTC"))
+    fake = FakeBigQueryClient(corpus)
+    refresher = NoteStoreRefresher(fake, TABLE_NAME, NOTE_COLUMNS)
+    started = time.perf_counter()
+    refresher.refresh()
+    full_ms = (time.perf_counter() - started) * 1000
+
+    newer = generate(rows=max(len(corpus) // 100, 10), seed=7, end_date=dt.date.today(), days=2)
+    newer = newer.assign(row_hash=[f"new-{i}" for i in range(len(newer))], ingested_at=pd.Timestamp.now(tz="UTC"))
+    fake.load(pd.concat([newer, corpus], ignore_index=True))
+    started = time.perf_counter()
+    refresher.refresh()
+    incremental_ms = (time.perf_counter() - started) * 1000
+
+    store = refresher.store
+    shapes = {}
+    for label, shape in _filter_shapes(corpus).items():
+        filters = NoteFilters.of(
+            shape.get("release_types"),
+            shape.get("product_names"),
+            shape.get("start_date"),
+            shape.get("end_date"),
+            shape.get("search_text", ""),
+        )
+        page, total = store.query(filters, 10, 0, NOTE_COLUMNS)
+        sql_page, sql_total = _query(fake, shape)
+        assert total == int(sql_total), f"{label}: store total {total} != SQL total {sql_total}"
+        # Ties on published_at may come back in either order; the dates may not.
+        assert list(page["published_at"]) == list(pd.to_datetime(sql_page["published_at"]).dt.date), (
+            f"{label}: store page differs from SQL page"
+        )
+        shapes[label] = {
+            "total": total,
+            "store": measure(lambda: store.query(filters, 10, 0, NOTE_COLUMNS), repeat * 20),
+            "fake_bq": measure(lambda: _query(fake, shape), repeat),
+        }
+    return {
+        "rows": len(store),
+        "full_load_ms": round(full_ms, 1),
+        "incremental_refresh_ms": round(incremental_ms, 1),
+        "query_release_notes": shapes,
+    }
+
+
+def _chart_via_sql(chart: str, query, filters: NoteFilters, fake: FakeBigQueryClient):
+    """A chart through the fake client, shaped as the endpoint returns it without the cube."""
+    df = run_query(query(TABLE_NAME, filters), fake)
+    if chart == "heatmap":
+        cells = df[["day_of_week", "week", "count"]].itertuples(index=False)
+        return heatmap_from_cells(filters.start_date, filters.end_date, cells)
+    if chart == "time_series":
+        df["month"] = df["month"].astype(str)
+    return df.to_dict(orient="records")
+
+
+def _comparable(chart: str, records):
+    """What must match between cube and SQL: everything but the order of tied counts."""
+    if chart == "heatmap":
+        return records
+    if chart == "top_products":
+        # LIMIT over tied counts may keep different products; the counts must agree.
+        return sorted(int(r["count"]) for r in records)
+    key = "month" if chart == "time_series" else "release_note_type"
+    return sorted((r[key], int(r["count"])) for r in records)
+
+
+def bench_count_cube(corpus: pd.DataFrame, fake: FakeBigQueryClient, repeat: int) -> dict:
+    store = NoteStore.from_frame(corpus)
+    newer = generate(rows=max(len(corpus) // 100, 10), seed=7, end_date=dt.date.today(), days=2)
+    added = pa.Table.from_pandas(newer, preserve_index=False)
+    charts = {
+        "time_series": (lambda cube, f: cube.time_series(f), time_series_query),
+        "type_distribution": (lambda cube, f: cube.type_distribution(f), type_distribution_query),
+        "top_products": (lambda cube, f: cube.top_products(f), top_products_query),
+        "heatmap": (lambda cube, f: cube.heatmap(f), heatmap_query),
+    }
+    shapes = {}
+    for label, shape in _filter_shapes(corpus).items():
+        if shape.get("search_text"):
+            continue  # not an insight filter
+        # The charts over time need a window; the endpoint defaults one.
+        start, end = shape.get("start_date"), shape.get("end_date")
+        if not (start and end):
+            start, end = trailing_window(12)
+        filters = NoteFilters.of(shape.get("release_types"), shape.get("product_names"), start, end)
+        for chart, (answer, query) in charts.items():
+            assert _comparable(chart, answer(store.cube, filters)) == _comparable(
+                chart, _chart_via_sql(chart, query, filters, fake)
+            ), f"{label}: cube and SQL disagree on {chart}"
+        shapes[label] = {
+            chart: {
+                "cube": measure(lambda: answer(store.cube, filters), repeat * 20),
+                "fake_bq": measure(lambda: run_query(query(TABLE_NAME, filters), fake), repeat),
+            }
+            for chart, (answer, query) in charts.items()
+        }
+    return {
+        "shape": list(store.cube.counts.shape),
+        "bytes": store.cube.counts.nbytes,
+        "build": measure(lambda: CountCube.from_table(store.table), repeat),
+        "incremental_update": measure(lambda: store.cube.updated(added), repeat),
+        "insights": shapes,
+    }
+
+
+def _random_subscriptions(corpus: pd.DataFrame, n: int, seed: int) -> list[Subscription]:
+    """Mostly a small stack of products, often narrowed by a keyword; some keyword- or type-only."""
+    rng = random.Random(seed)
+    products = sorted(corpus["product_name"].dropna().unique())
+    types = sorted(corpus["release_note_type"].dropna().unique())
+    words = sorted({w for text in corpus["description"].head(2000) for w in tokenize(text)})
+    subscriptions = []
+    for i in range(n):
+        kind = rng.random()
+        subscriptions.append(
+            Subscription(
+                subscriber=f"user-{i}",
+                products=tuple(rng.sample(products, rng.randint(1, 3))) if kind < 0.8 else (),
+                types=tuple(rng.sample(types, 1)) if kind >= 0.95 else (),
+                keywords=tuple(rng.sample(words, rng.randint(1, 2))) if 0.4 <= kind < 0.95 else (),
+            )
+        )
+    return subscriptions
+
+
+def _note_dicts(df: pd.DataFrame) -> list[dict]:
+    """New rows as the matcher sees them: the note fields plus tag-free description text."""
+    return [
+        {
+            "product_name": product,
+            "release_note_type": note_type,
+            "published_at": str(published_at),
+            "description_text": render.strip_html(description),
+        }
+        for product, note_type, published_at, description in zip(
+            df["product_name"], df["release_note_type"], df["published_at"], df["description"]
+        )
+    ]
+
+
+def bench_subscriptions(corpus: pd.DataFrame, repeat: int) -> dict:
+    new_rows = corpus.head(50)  # about a day's worth of GCP notes
+    notes = _note_dicts(new_rows)
+    terms = SuggestIndexRefresher(FakeBigQueryClient(corpus), TABLE_NAME, "description")
+    terms.refresh()
+    results = {}
+    for n in (1_000, 10_000):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SubscriptionStore(f"{tmp}/subscriptions.json")
+            subscriptions = _random_subscriptions(corpus, n, seed=n)
+            store._write(subscriptions)  # one write instead of n store.add() calls
+            matcher = SubscriptionMatcher(store, [])
+            counted = SubscriptionMatcher(store, [], terms=terms)
+
+            def brute_force():
+                matched = {}
+                for note in notes:
+                    text = (note["description_text"] or "").lower()
+                    words = tokenize(text)
+                    for sub in subscriptions:
+                        if sub.matches(note, text, words):
+                            matched.setdefault(sub.id, []).append(note)
+                return matched
+
+            indexed = {k: v[1] for k, v in matcher.match(new_rows).items()}
+            assert indexed == brute_force(), "index and brute force disagree"
+            assert {k: v[1] for k, v in counted.match(new_rows).items()} == indexed, "term-count index disagrees"
+            results[f"{n}_subscriptions"] = {
+                "new_rows": len(new_rows),
+                "matched_subscriptions": len(indexed),
+                "index_build": measure(lambda: SubscriptionIndex(subscriptions), repeat),
+                "indexed": measure(lambda: matcher.match(new_rows), repeat),
+                "indexed_by_term_counts": measure(lambda: counted.match(new_rows), repeat),
+                "brute_force": measure(brute_force, max(repeat // 2, 1)),
+            }
+    return results
+
+
+_QUESTIONS = [
+    "Breaking changes for Cloud Run in the last 30 days",
+    "How many features per product this year?",
+    "Deprecations by month since January",
+    "Which products had the most deprecations last year?",
+    "How many BigQuery notes in the past 6 months?",
+    "Known issues with GKE this month",
+    "Breakdown by type for Dataflow",
+    "Are there breaking changes I need to act on?",
+    "Which GPU features were added to Compute Engine?",
+]
+# Questions where a type that is also a plain word ("changes") must not become a
+# type filter, with the types each should be routed with (None: to the model).
+_AMBIGUOUS_TYPE_QUESTIONS = {
+    "How many changes per type in the past year": None,
+    "What is the latest change for Compute Engine?": None,
+    "Change notes for Compute Engine this month": ("CHANGE",),
+    "Breaking changes for Cloud Run in the last 30 days": ("BREAKING_CHANGE",),
+}
+
+
+def check_ambiguous_types(corpus: pd.DataFrame) -> None:
+    types = sorted(set(corpus["release_note_type"].unique()) | {"CHANGE"})
+    router = IntentRouter(sorted(corpus["product_name"].unique()), types)
+    for question, expected in _AMBIGUOUS_TYPE_QUESTIONS.items():
+        routed = router.route(question)
+        got = routed.filters.types if routed else None
+        assert got == expected, f"{question!r} routed with types {got}, expected {expected}"
+
+
+def bench_intent_router(corpus: pd.DataFrame, fake: FakeBigQueryClient, repeat: int) -> dict:
+    check_ambiguous_types(corpus)
+    router = IntentRouter(sorted(corpus["product_name"].unique()), sorted(corpus["release_note_type"].unique()))
+    results = {}
+    for question in _QUESTIONS:
+        routed = router.route(question)
+        results[question] = {
+            "intent": routed.intent if routed else None,
+            "route": measure(lambda: router.route(question), repeat * 20),
+            **({"template_query": measure(lambda: run_query(routed.query(TABLE_NAME), fake), repeat)} if routed else {}),
+        }
+    return {"routed": sum(r["intent"] is not None for r in results.values()), "questions": results}
+
+
+def bench_endpoints(fake: FakeBigQueryClient, repeat: int) -> dict:
+    backend_app.init_bq_client = lambda: fake
+    backend_app.get_table_name = lambda: TABLE_NAME
+    routes = {
+        "filter_options": "/api/filter-options",
+        "release_notes_page1": "/api/release-notes",
+        "release_notes_filtered": "/api/release-notes?types=FEATURE&types=FIX&products=BigQuery",
+        "release_notes_search": "/api/release-notes?search=migration",
+        "release_notes_page50": "/api/release-notes?page=50",
+        "insights_time_series": "/api/insights/time-series",
+        "insights_type_distribution": "/api/insights/type-distribution",
+        "insights_top_products": "/api/insights/top-products",
+        "insights_heatmap": "/api/insights/heatmap",
+        "insights_top_products_filtered": "/api/insights/top-products?types=FEATURE&products=BigQuery&products=Cloud+Run",
+        "suggest": "/api/suggest?q=clo",
+    }
+    results = {}
+    with TestClient(backend_app.app) as client:
+        while not client.get("/api/suggest").json()["ready"] or backend_app._note_store.store is None:
+            time.sleep(0.05)
+        for label, url in routes.items():
+            response = client.get(url)
+            response.raise_for_status()
+            results[label] = {
+                "response_bytes": len(response.content),
+                **measure(lambda: client.get(url), repeat),
+            }
+            etag = response.headers.get("ETag")
+            if etag:
+                results[label]["not_modified"] = measure(lambda: client.get(url, headers={"If-None-Match": etag}), repeat)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000, help="synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the JSON results to this path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    # Relative to today, so the insights endpoints' trailing windows have data.
+    corpus = generate(rows=args.rows, seed=args.seed, end_date=dt.date.today())
+    fake = FakeBigQueryClient(corpus)
+
+    write_results(
+        "backend",
+        {
+            "corpus_rows": len(corpus),
+            "query_release_notes": bench_queries(corpus, fake, args.repeat),
+            "summary_prompt": bench_summary_prompt(corpus, args.repeat),
+            "render": bench_render(corpus, args.repeat),
+            "suggest": bench_suggest(corpus, args.repeat),
+            "note_store": bench_note_store(corpus, args.repeat),
+            "count_cube": bench_count_cube(corpus, fake, args.repeat),
+            "subscriptions": bench_subscriptions(corpus, args.repeat),
+            "intent_router": bench_intent_router(corpus, fake, args.repeat),
+            "endpoints": bench_endpoints(fake, args.repeat),
+        },
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: the frontend's per-card description formatting.
+
+Times one page of cards through both frontend paths in src/utils.py:
+
+  format_description   regex cleanup + track splitting in the frontend,
+                       what every card did on every Streamlit rerun
+  render_description   placing the backend's pre-rendered fragments
+
+Streamlit runs in "bare mode" here (no script runner), so st.markdown /
+st.tabs build their protobuf deltas but nothing is sent anywhere — the
+numbers are the Python-side cost of a rerun. The pre-rendered fragments
+come from backend/src/render.py, loaded by path since it only needs the
+standard library.
+
+    python benchmarks/bench_frontend.py [--rows 2000] [--out results/frontend.json]
+"""
+
+import argparse
+import importlib.util
+
+from _common import REPO_ROOT, measure, use_component, write_results
+from corpus import generate
+
+use_component("frontend")
+
+import streamlit.logger  # noqa: E402
+
+from src.utils import format_description, render_description  # noqa: E402
+
+
+def _load_backend_render():
+    spec = importlib.util.spec_from_file_location("backend_render", REPO_ROOT / "backend" / "src" / "render.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000, help="synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the JSON results to this path")
+    args = parser.parse_args()
+    # Bare-mode Streamlit warns about the missing ScriptRunContext on every call.
+    streamlit.logger.set_log_level("error")
+
+    backend_render = _load_backend_render()
+    corpus = generate(rows=args.rows, seed=args.seed, track_fraction=0.2)
+    notes = corpus.to_dict(orient="records")
+
+    results = {"corpus_rows": len(notes)}
+    for size in (10, 100):
+        page = notes[:size]
+        rendered = backend_render.attach_render_artifacts([dict(n) for n in page])
+        results[f"page_{size}"] = {
+            "notes_with_tracks": sum(1 for n in rendered if n["tracks"]),
+            "format_description": measure(lambda: [format_description(n["description"]) for n in page], args.repeat),
+            "render_description": measure(lambda: [render_description(n) for n in rendered], args.repeat),
+        }
+    write_results("frontend", results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: ingestion batch preparation and the local Parquet sink.
+
+  row_hash              per-row reference (DataFrame.apply) vs the columnar
+                        row_hashes() the loader uses
+  normalize             normalize_descriptions() on one load chunk
+  prepare_chunk         everything merge_new_rows() does to a chunk before
+                        it's staged: tag, hash, dedup, normalize — with an
+                        empty destination and with every row already loaded
+  parquet_sink          ParquetSink.merge() into a temp dir: the first load,
+                        then a re-run over the same rows (all deduped)
+
+    python benchmarks/bench_ingestion.py [--rows 20000] [--out results/ingestion.json]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+import pandas as pd
+
+from _common import measure, use_component, write_results
+from corpus import generate
+
+use_component("ingestion")
+
+from src import config  # noqa: E402
+from src.batches import prepare_chunk, row_hash, row_hashes  # noqa: E402
+from src.normalize import normalize_descriptions  # noqa: E402
+from src.sinks.parquet import ParquetSink  # noqa: E402
+
+
+def bench_hashing(chunk: pd.DataFrame, repeat: int) -> dict:
+    tagged = chunk.assign(platform="GCP")
+    return {
+        "rows": len(tagged),
+        "digests_match": tagged.apply(row_hash, axis=1).tolist() == row_hashes(tagged),
+        "per_row": measure(lambda: tagged.apply(row_hash, axis=1), repeat),
+        "columnar": measure(lambda: row_hashes(tagged), repeat),
+    }
+
+
+def bench_prepare(chunk: pd.DataFrame, repeat: int) -> dict:
+    ingested_at = pd.Timestamp.now(tz="UTC")
+    first, _ = prepare_chunk(chunk, "GCP", "bench", ingested_at, set(), set())
+    loaded = set(first["row_hash"])
+    return {
+        "rows": len(chunk),
+        "normalize": measure(lambda: normalize_descriptions(chunk.copy()), repeat),
+        "empty_destination": measure(
+            lambda: prepare_chunk(chunk, "GCP", "bench", ingested_at, set(), set()), repeat
+        ),
+        "all_already_loaded": measure(
+            lambda: prepare_chunk(chunk, "GCP", "bench", ingested_at, set(loaded), loaded), repeat
+        ),
+    }
+
+
+def bench_parquet_sink(corpus: pd.DataFrame) -> dict:
+    # One sample each: a merge changes the sink's state, so it can't be repeated as-is.
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        sink = ParquetSink(root, "release_notes")
+        sink.ensure()
+        for label in ("first_load", "rerun_all_deduped"):
+            started = time.perf_counter()
+            result = sink.merge(corpus, "GCP", "bench")
+            results[label] = {
+                "inserted": result.inserted,
+                "already_loaded": result.already_loaded,
+                "ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+        results["files"] = len(sink.files())
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000, help="synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the JSON results to this path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    corpus = generate(rows=args.rows, seed=args.seed)
+    chunk = corpus.head(config.LOAD_CHUNK_ROWS)
+
+    write_results(
+        "ingestion",
+        {
+            "corpus_rows": len(corpus),
+            "load_chunk_rows": config.LOAD_CHUNK_ROWS,
+            "row_hash": bench_hashing(chunk, args.repeat),
+            "prepare_chunk": bench_prepare(chunk, args.repeat),
+            "parquet_sink": bench_parquet_sink(corpus),
+        },
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: streaming feed parser vs feedparser for GCPRssSource.
+
+Runs both parse paths of ingestion/src/providers/gcp.py over every
+recorded feed in benchmarks/fixtures/*.xml plus two synthetic feeds (Atom
+and RSS 2.0, newest-first), once for the whole feed and once for a short
+watermark window — the normal daily case, where the streaming parser
+stops reading early.
+
+    python benchmarks/bench_rss_parser.py [--entries 3000] [--out results/rss_parser.json]
+"""
+
+import argparse
+import datetime as dt
+import random
+from html import escape
+from pathlib import Path
+
+from _common import measure, use_component, write_results
+
+use_component("ingestion")
+
+from src.providers.gcp import GCPRssSource  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+CHUNK_BYTES = 64 * 1024
+_PRODUCTS = ["BigQuery", "Cloud Run", "Compute Engine", "Cloud Storage", "GKE", "Vertex AI"]
+_KINDS = ["Feature", "Fix", "Deprecation", "Announcement", "Breaking change", "Known issue"]
+
+
+def synthetic_feed(entries: int, fmt: str, seed: int = 7, newest: dt.date = dt.date(2025, 6, 1)) -> bytes:
+    """A newest-first feed shaped like Google's release-notes feeds, one entry per day from `newest`."""
+    rng = random.Random(seed)
+    today = newest
+    items = []
+    for i in range(entries):
+        day = today - dt.timedelta(days=i)
+        body = "".join(
+            f"<h2>{rng.choice(_PRODUCTS)}</h2><h3>{rng.choice(_KINDS)}</h3>"
+            f"<p>{' '.join(rng.choice(['update', 'region', 'preview', 'GA', 'quota', 'API']) for _ in range(40))}</p>"
+            for _ in range(rng.randint(1, 6))
+        )
+        title = day.strftime("%B %d, %Y")
+        if fmt == "atom":
+            items.append(
+                f"<entry><title>{title}</title><id>tag:{i}</id>"
+                f"<updated>{day.isoformat()}T00:00:00-07:00</updated>"
+                f'<content type="html">{escape(body)}</content></entry>'
+            )
+        else:
+            items.append(
+                f"<item><title>{title}</title><guid>{i}</guid>"
+                f"<pubDate>{day.strftime('%a, %d %b %Y')} 00:00:00 -0700</pubDate>"
+                f"<description>{escape(body)}</description></item>"
+            )
+    if fmt == "atom":
+        doc = f'<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>{"".join(items)}</feed>'
+    else:
+        doc = f'<rss version="2.0"><channel><title>t</title>{"".join(items)}</channel></rss>'
+    return ('<?xml version="1.0" encoding="UTF-8"?>' + doc).encode("utf-8")
+
+
+def _chunks(content: bytes):
+    return (content[i : i + CHUNK_BYTES] for i in range(0, len(content), CHUNK_BYTES))
+
+
+def bench_feed(content: bytes, repeat: int) -> dict:
+    source = GCPRssSource()
+    full_rows, _ = source.rows_from_feedparser(content, dt.date.min)
+    newest = max((r["published_at"] for r in full_rows), default=dt.date.today())
+    windows = {"full_feed": dt.date.min, "last_7_days": newest - dt.timedelta(days=7)}
+
+    results = {"bytes": len(content), "entries": len(full_rows)}
+    for label, since in windows.items():
+        fp_rows, _ = source.rows_from_feedparser(content, since)
+        st_rows, read = source.rows_from_stream(_chunks(content), since)
+        results[label] = {
+            "rows": len(st_rows),
+            "rows_match": fp_rows == st_rows,
+            "streaming_entries_read": read,
+            "feedparser": measure(lambda: source.rows_from_feedparser(content, since), repeat),
+            "streaming": measure(lambda: source.rows_from_stream(_chunks(content), since), repeat),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=3000, help="entries per synthetic feed")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the JSON results to this path")
+    args = parser.parse_args()
+
+    feeds = {f"fixture:{p.name}": p.read_bytes() for p in sorted(FIXTURES_DIR.glob("*.xml"))}
+    feeds["synthetic:atom"] = synthetic_feed(args.entries, "atom")
+    feeds["synthetic:rss"] = synthetic_feed(args.entries, "rss")
+
+    write_results(
+        "rss_parser",
+        {name: bench_feed(content, args.repeat) for name, content in feeds.items()},
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
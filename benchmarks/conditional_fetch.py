@@ -0,0 +1,113 @@
+"""
+Conditional-fetch check for the ingestion job's RSS source.
+
+Serves a synthetic feed from standins.FakeFeedServer, which answers
+If-None-Match / If-Modified-Since with 304, and runs the job's own
+per-platform step (main._ingest_platform) twice against it with
+GCP_SOURCE_MODE=rss and a Parquet sink in a temp dir. The first run must
+fetch the whole feed and store its validators; the second must send them,
+get a 304, parse nothing, merge nothing — and still save the source's
+state (last_run_at moves, the ETag is kept for the next run). Exits 1
+when any of that doesn't hold.
+
+    python benchmarks/conditional_fetch.py [--entries 200] [--out results/conditional_fetch.json]
+"""
+
+import argparse
+import datetime as dt
+import logging
+import sys
+import tempfile
+
+from _common import use_component, write_results
+from bench_rss_parser import synthetic_feed
+from standins import FakeFeedServer
+
+use_component("ingestion")
+
+import main as job  # noqa: E402
+from src import config  # noqa: E402
+from src.providers.gcp import GCPRssSource  # noqa: E402
+from src.sinks.parquet import ParquetSink  # noqa: E402
+
+
+def _count_parses(counts: dict) -> None:
+    """Wrap both of GCPRssSource's parse paths so the check sees every call."""
+    for name in ("rows_from_stream", "rows_from_feedparser"):
+        original = getattr(GCPRssSource, name)
+
+        def counted(self, *args, _original=original, **kwargs):
+            counts["parses"] += 1
+            return _original(self, *args, **kwargs)
+
+        setattr(GCPRssSource, name, counted)
+
+
+def _run(sink: ParquetSink, server: FakeFeedServer, counts: dict) -> dict:
+    counts["parses"] = 0
+    before = (server.full, server.not_modified)
+    fetched, inserted = job._ingest_platform(None, sink, "GCP")
+    state = sink.load_state("GCP", GCPRssSource.source_id)
+    return {
+        "fetched": fetched,
+        "inserted": inserted,
+        "parses": counts["parses"],
+        "served_200": server.full - before[0],
+        "served_304": server.not_modified - before[1],
+        "etag": state.etag,
+        "last_run_at": state.last_run_at.isoformat() if state.last_run_at else None,
+    }
+
+
+def check(first: dict, second: dict, etag: str) -> list[str]:
+    failures = []
+    if not (first["served_200"] == 1 and first["parses"] == 1 and first["inserted"] > 0):
+        failures.append(f"first run should fetch and load the feed: {first}")
+    if first["etag"] != etag:
+        failures.append(f"first run should store the feed's ETag {etag}, stored {first['etag']!r}")
+    if second["served_304"] != 1 or second["served_200"] != 0:
+        failures.append(f"second run should get a 304: {second}")
+    if second["parses"] or second["fetched"] or second["inserted"]:
+        failures.append(f"second run should parse and merge nothing: {second}")
+    if second["etag"] != etag:
+        failures.append(f"second run should keep the ETag {etag}, state has {second['etag']!r}")
+    if not second["last_run_at"] or second["last_run_at"] <= (first["last_run_at"] or ""):
+        failures.append(f"second run should save the state (last_run_at {first['last_run_at']} -> {second['last_run_at']})")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200, help="days in the synthetic feed")
+    parser.add_argument("--parser", choices=("streaming", "feedparser"), default=config.GCP_RSS_PARSER)
+    parser.add_argument("--out", help="also write the JSON results to this path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    server = FakeFeedServer(synthetic_feed(args.entries, "atom", newest=dt.date.today())).start()
+    config.GCP_SOURCE_MODE = "rss"
+    config.GCP_RSS_FEED_URL = server.url
+    config.GCP_RSS_PARSER = args.parser
+    counts = {"parses": 0}
+    _count_parses(counts)
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            sink = ParquetSink(root, "release_notes")
+            sink.ensure()
+            first = _run(sink, server, counts)
+            second = _run(sink, server, counts)
+    finally:
+        server.stop()
+
+    failures = check(first, second, server.etag)
+    write_results(
+        "conditional_fetch",
+        {"parser": args.parser, "entries": args.entries, "first_run": first, "second_run": second, "failures": failures},
+        args.out,
+    )
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Synthetic release-note corpora for the benchmarks.
+
+Rows have the public dataset's shape (ROW_COLUMNS: description,
+release_note_type, published_at, product_name, product_version_name) and
+are tuned to look like it where it matters for performance:
+
+  - products and note types follow a Zipf-like skew (a few products
+    dominate, BREAKING_CHANGE/DEPRECATION are rare), controlled by
+    `product_skew` / `type_skew` — 0 means uniform;
+  - descriptions are HTML with headings, lists, links carrying kramdown
+    `{: .external ...}` attributes, and a `description_words` median length
+    drawn from a log-normal, so there's a long tail of very long notes;
+  - a `track_fraction` of notes carry `* {Name}{: track-name='...'}`
+    blocks, the shape the frontend renders as tabs;
+  - with `platforms` set (e.g. ("GCP", "AWS", "AZURE")), a `platform`
+    column is added, Zipf-skewed by `platform_skew` — the shape of the
+    ingestion job's multi-platform table.
+
+Generation is deterministic for a given seed. No component's `src`
+package is imported here, so every benchmark process can use it.
+
+    python benchmarks/corpus.py --rows 50000 --out corpus.parquet
+"""
+
+import argparse
+import datetime as dt
+import math
+import random
+from dataclasses import dataclass
+
+import pandas as pd
+
+ROW_COLUMNS = ["description", "release_note_type", "published_at", "product_name", "product_version_name"]
+
+PRODUCTS = [
+    "BigQuery", "Cloud Run", "Compute Engine", "Google Kubernetes Engine", "Cloud Storage",
+    "Vertex AI", "Cloud SQL", "Dataflow", "Pub/Sub", "Cloud Functions", "Spanner",
+    "Looker", "Dataproc", "Cloud Build", "Artifact Registry", "Cloud Logging",
+    "Cloud Monitoring", "Firestore", "Bigtable", "AlloyDB for PostgreSQL",
+    "Apigee", "Cloud Armor", "Cloud CDN", "Cloud DNS", "Cloud Load Balancing",
+    "Identity and Access Management", "Secret Manager", "Cloud Composer",
+    "Dataplex", "Memorystore", "Batch", "Cloud Deploy", "Security Command Center",
+    "Anthos", "Chronicle", "Workflows", "Eventarc", "Cloud Tasks", "Cloud Scheduler",
+    "Dialogflow", "Document AI", "Speech-to-Text", "Translation AI", "Vision AI",
+]
+TYPES = ["FEATURE", "FIX", "ANNOUNCEMENT", "ISSUE", "DEPRECATION", "BREAKING_CHANGE"]
+
+_WORDS = (
+    "region preview generally available support instance cluster quota API "
+    "console query table dataset job pipeline endpoint service account policy "
+    "version release update migration latency throughput replication backup "
+    "encryption network subnet firewall bucket object model training inference "
+    "deployment container image node pool autoscaling metric alert log export "
+    "schema partition index connector workload configure enable disable limit"
+).split()
+_TRACK_NAMES = ["Python", "Java", "Go", "Node.js", "C#", "Ruby", "PHP", "C++", "Console", "gcloud"]
+_EXTERNAL_ATTR = '{: .external target="_blank" rel="noreferrer noopener"}'
+
+
+@dataclass
+class CorpusSpec:
+    rows: int = 10_000
+    seed: int = 42
+    end_date: dt.date = dt.date(2025, 6, 1)
+    days: int = 730
+    product_skew: float = 1.1
+    type_skew: float = 1.3
+    description_words: int = 60
+    track_fraction: float = 0.05
+    platforms: tuple[str, ...] = ()
+    platform_skew: float = 1.0
+
+
+def _zipf_weights(n: int, skew: float) -> list[float]:
+    return [1 / (rank ** skew) for rank in range(1, n + 1)]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(max(words, 1)))
+    return text[0].upper() + text[1:] + "."
+
+
+def _description(rng: random.Random, product: str, words: int, tracks: bool) -> str:
+    paragraphs = []
+    remaining = words
+    while remaining > 0:
+        take = min(remaining, rng.randint(12, 40))
+        paragraphs.append(f"<p>{_sentence(rng, take)}</p>")
+        remaining -= take
+    if rng.random() < 0.4:
+        slug = product.lower().replace(" ", "-").replace("/", "")
+        paragraphs.append(
+            f'<p>For details, see <a href="https://cloud.google.com/{slug}/docs">the {product} '
+            f"documentation</a>{_EXTERNAL_ATTR}.</p>"
+        )
+    if rng.random() < 0.3:
+        items = "".join(f"<li>{_sentence(rng, rng.randint(4, 10))}</li>" for _ in range(rng.randint(2, 5)))
+        paragraphs.append(f"<ul>{items}</ul>")
+    html = "\n".join(paragraphs)
+    if not tracks:
+        return html
+    blocks = [
+        f"* {{{name}}}{{: track-name='{name.lower()}'}}\n<p>{_sentence(rng, rng.randint(8, 30))}</p>"
+        for name in rng.sample(_TRACK_NAMES, rng.randint(2, 5))
+    ]
+    return html + "\n" + "\n".join(blocks)
+
+
+def generate(spec: CorpusSpec | None = None, **overrides) -> pd.DataFrame:
+    """Return a DataFrame of `spec.rows` synthetic notes, newest first."""
+    spec = spec or CorpusSpec()
+    for key, value in overrides.items():
+        setattr(spec, key, value)
+
+    rng = random.Random(spec.seed)
+    product_weights = _zipf_weights(len(PRODUCTS), spec.product_skew)
+    type_weights = _zipf_weights(len(TYPES), spec.type_skew)
+    platform_weights = _zipf_weights(len(spec.platforms), spec.platform_skew)
+    sigma = 0.6
+    mu = math.log(max(spec.description_words, 1))
+
+    records = []
+    for _ in range(spec.rows):
+        product = rng.choices(PRODUCTS, product_weights)[0]
+        words = max(3, int(rng.lognormvariate(mu, sigma)))
+        record = {
+            "description": _description(rng, product, words, rng.random() < spec.track_fraction),
+            "release_note_type": rng.choices(TYPES, type_weights)[0],
+            "published_at": spec.end_date - dt.timedelta(days=rng.randrange(spec.days)),
+            "product_name": product,
+            "product_version_name": f"{rng.randint(1, 9)}.{rng.randint(0, 40)}.0" if rng.random() < 0.1 else None,
+        }
+        if spec.platforms:
+            record["platform"] = rng.choices(spec.platforms, platform_weights)[0]
+        records.append(record)
+    columns = ROW_COLUMNS + (["platform"] if spec.platforms else [])
+    df = pd.DataFrame.from_records(records, columns=columns)
+    return df.sort_values("published_at", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=CorpusSpec.rows)
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    parser.add_argument("--days", type=int, default=CorpusSpec.days)
+    parser.add_argument("--product-skew", type=float, default=CorpusSpec.product_skew)
+    parser.add_argument("--type-skew", type=float, default=CorpusSpec.type_skew)
+    parser.add_argument("--description-words", type=int, default=CorpusSpec.description_words)
+    parser.add_argument("--track-fraction", type=float, default=CorpusSpec.track_fraction)
+    parser.add_argument("--platforms", default="", help="comma-separated, e.g. GCP,AWS,AZURE (adds a platform column)")
+    parser.add_argument("--out", required=True, help="output path (.parquet, .csv or .jsonl)")
+    args = parser.parse_args()
+
+    df = generate(
+        CorpusSpec(
+            rows=args.rows,
+            seed=args.seed,
+            days=args.days,
+            product_skew=args.product_skew,
+            type_skew=args.type_skew,
+            description_words=args.description_words,
+            track_fraction=args.track_fraction,
+            platforms=tuple(p.strip() for p in args.platforms.split(",") if p.strip()),
+        )
+    )
+    if args.out.endswith(".parquet"):
+        df.to_parquet(args.out, index=False)
+    elif args.out.endswith(".csv"):
+        df.to_csv(args.out, index=False)
+    else:
+        df.to_json(args.out, orient="records", lines=True, date_format="iso")
+    print(f"wrote {len(df)} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+An in-process stand-in for google.cloud.bigquery.Client, backed by SQLite.
+
+Loads a corpus DataFrame into an in-memory SQLite table and answers the
+queries the backend actually sends: BigQuery-only syntax used in this
+repo (backticked table names, DATE_TRUNC, EXTRACT(DAYOFWEEK ...),
+DATE_SUB(CURRENT_DATE(), INTERVAL ...), @named / UNNEST(@array) query
+parameters) is rewritten to SQLite first. Only the client surface the
+components use is implemented:
+
+  client.query(sql, job_config=None) -> job
+      job.result(start_index=, max_results=) (iterable of dict rows,
+          .total_rows of the whole result, .to_dataframe())
+      job.to_dataframe(), job.total_bytes_processed, job.job_id
+  client.get_job(job_id) -> the job, for the last 100 queries
+      dry runs (job_config.dry_run) return no rows, only the byte estimate
+  client.get_table(name) -> .schema (fields with .name/.field_type),
+      .modified, .num_rows, .num_bytes, .time_partitioning, .clustering_fields
+
+`total_bytes_processed` is an estimate in BigQuery's billing model —
+the stored size of every column the query references — so benchmarks can
+compare how much a query shape would scan. The table is modelled as
+partitioned on `partition_field` and clustered on `clustering_fields`
+(by default the ingestion job's layout): the estimate is scaled by the
+share of rows that the WHERE clause's top-level conjuncts on those
+columns select. Dry runs apply partition pruning only, as BigQuery's
+do; executed queries also apply cluster pruning, modelled optimistically
+as perfectly clustered blocks. For load tests, `latency_s`
+adds a per-query delay (a number, or a callable such as
+standins.LatencyModel returning one per call) and `failure_rate` makes
+that share of queries raise ServiceUnavailable, like a transient
+BigQuery 503.
+"""
+
+import datetime as dt
+import itertools
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from types import SimpleNamespace
+from typing import Callable
+
+import pandas as pd
+
+try:
+    from google.api_core.exceptions import NotFound, ServiceUnavailable
+except ImportError:  # the frontend's environment doesn't install google-cloud-*
+    class ServiceUnavailable(Exception):
+        pass
+
+    class NotFound(Exception):
+        pass
+
+_TABLE = "notes"
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_FIELD_TYPES = {"published_at": "DATE", "word_count": "INT64", "ingested_at": "TIMESTAMP", "tracks": "RECORD"}
+
+_REWRITES = [
+    (re.compile(r"`[^`]+`"), _TABLE),
+    (re.compile(r"DATE_TRUNC\((\w+),\s*MONTH\)", re.I), r"date(\1, 'start of month')"),
+    (re.compile(r"DATE_TRUNC\((\w+),\s*WEEK\)", re.I), r"date(\1, '-' || strftime('%w', \1) || ' days')"),
+    (re.compile(r"DATE_TRUNC\((\w+),\s*YEAR\)", re.I), r"date(\1, 'start of year')"),
+    (re.compile(r"EXTRACT\(DAYOFWEEK FROM (\w+)\)", re.I), r"(CAST(strftime('%w', \1) AS INTEGER) + 1)"),
+    (re.compile(r"EXTRACT\(YEAR FROM (\w+)\)", re.I), r"CAST(strftime('%Y', \1) AS INTEGER)"),
+    (re.compile(r"EXTRACT\(MONTH FROM (\w+)\)", re.I), r"CAST(strftime('%m', \1) AS INTEGER)"),
+    (
+        re.compile(r"DATE_SUB\(CURRENT_DATE\(\),\s*INTERVAL (\d+) (DAY|MONTH|YEAR)\)", re.I),
+        lambda m: f"date('now', '-{m.group(1)} {m.group(2).lower()}s')",
+    ),
+    (re.compile(r"CURRENT_DATE\(\)", re.I), "date('now')"),
+    (re.compile(r"\bSAFE_DIVIDE\(([^,]+),([^)]+)\)", re.I), r"(1.0 * (\1) / NULLIF(\2, 0))"),
+]
+_UNNEST_RE = re.compile(r"IN\s+UNNEST\(@(\w+)\)", re.I)
+_PARAM_RE = re.compile(r"@(\w+)")
+_WHERE_RE = re.compile(r"\bWHERE\b(.*?)(?=\bGROUP\s+BY\b|\bORDER\s+BY\b|\bHAVING\b|\bLIMIT\b|$)", re.I | re.S)
+_CONJUNCT_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\(|\)|\bAND\b|\bOR\b", re.I)
+
+
+def _to_sqlite_value(value):
+    # Same text form pandas' to_sql gives TIMESTAMP columns, so they compare as strings.
+    if isinstance(value, dt.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def to_sqlite(sql: str, params: dict) -> tuple[str, dict]:
+    """Rewrite one BigQuery query (and its named parameters) for SQLite."""
+    bound: dict = {}
+
+    def expand(match: re.Match) -> str:
+        values = params.get(match.group(1)) or []
+        names = [f"{match.group(1)}_{i}" for i in range(len(values))]
+        bound.update({n: _to_sqlite_value(v) for n, v in zip(names, values)})
+        return f"IN ({', '.join(':' + n for n in names)})" if names else "IN (NULL)"
+
+    sql = _UNNEST_RE.sub(expand, sql)
+    for pattern, repl in _REWRITES:
+        sql = pattern.sub(repl, sql)
+    for name, value in params.items():
+        if not isinstance(value, (list, tuple)):
+            bound[name] = _to_sqlite_value(value)
+    return _PARAM_RE.sub(r":\1", sql), bound
+
+
+def _conjuncts(where: str) -> list[str]:
+    """Split a WHERE clause at its top-level ANDs; [] if it has a top-level OR."""
+    parts, depth, start = [], 0, 0
+    for match in _CONJUNCT_TOKEN_RE.finditer(where):
+        token = match.group(0).upper()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token == "OR":
+            return []
+        elif depth == 0 and token == "AND":
+            parts.append(where[start : match.start()].strip())
+            start = match.end()
+    parts.append(where[start:].strip())
+
+    conjuncts, between_open = [], False
+    for part in parts:
+        if between_open:  # the AND was BETWEEN's own
+            conjuncts[-1] += " AND " + part
+            between_open = False
+        else:
+            conjuncts.append(part)
+            between_open = bool(re.search(r"\bBETWEEN\b", part, re.I))
+    return [c for c in conjuncts if c]
+
+
+def _job_params(job_config) -> dict:
+    params = {}
+    for p in getattr(job_config, "query_parameters", None) or []:
+        params[p.name] = list(p.values) if hasattr(p, "values") else p.value
+    return params
+
+
+def _is_date_column(values: pd.Series) -> bool:
+    first = values.iloc[0] if not values.empty else None
+    return isinstance(first, str) and bool(_DATE_RE.match(first)) and values.str.match(_DATE_RE).all()
+
+
+def _decode_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn ISO date strings back into datetime.date, JSON `tracks` back into lists,
+    and NULL strings into None (as BigQuery's to_dataframe() returns them)."""
+    for col in df.columns:
+        if pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+        if col == "tracks":
+            df[col] = df[col].astype(object).map(lambda v: json.loads(v) if isinstance(v, str) else v)
+        elif _is_date_column(df[col].dropna()):
+            df[col] = df[col].astype(object).map(lambda v: dt.date.fromisoformat(v) if isinstance(v, str) else v)
+    return df
+
+
+class FakeRowIterator:
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self.total_rows = len(df)
+
+    def __iter__(self):
+        return iter(self._df.to_dict(orient="records"))
+
+    def to_dataframe(self, *args, **kwargs) -> pd.DataFrame:
+        return self._df.copy()
+
+    def to_dataframe_iterable(self, *args, **kwargs):
+        yield self._df.copy()
+
+
+class FakeQueryJob:
+    def __init__(self, df: pd.DataFrame, total_bytes_processed: int, sql: str, job_id: str = ""):
+        self._df = df
+        self.total_bytes_processed = total_bytes_processed
+        self.total_bytes_billed = total_bytes_processed
+        self.cache_hit = False
+        self.query = sql
+        self.job_id = job_id
+        self.location = "US"
+
+    def result(self, *args, start_index: int | None = None, max_results: int | None = None, **kwargs) -> FakeRowIterator:
+        start = start_index or 0
+        rows = FakeRowIterator(self._df.iloc[start : None if max_results is None else start + max_results].reset_index(drop=True))
+        rows.total_rows = len(self._df)
+        return rows
+
+    def to_dataframe(self, *args, **kwargs) -> pd.DataFrame:
+        return self._df.copy()
+
+
+class FakeBigQueryClient:
+    """Answers backend queries from an in-memory SQLite copy of `df`."""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        latency_s: float | Callable[[], float] = 0.0,
+        failure_rate: float = 0.0,
+        project: str = "fake-project",
+        partition_field: str | None = "published_at",
+        clustering_fields: tuple[str, ...] = ("platform", "product_name", "release_note_type"),
+    ):
+        self.project = project
+        self.partition_field = partition_field
+        self.clustering_fields = clustering_fields
+        self.latency_s = latency_s
+        self.failure_rate = failure_rate
+        self.queries: deque[dict] = deque(maxlen=1000)
+        self._jobs: OrderedDict[str, FakeQueryJob] = OrderedDict()
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._columns = list(df.columns)
+        self.load(df)
+
+    def load(self, df: pd.DataFrame) -> None:
+        """Replace the table's contents with `df` (bumps get_table().modified)."""
+        stored = df.copy()
+        for col in stored.columns:
+            if stored[col].dtype == object:
+                stored[col] = stored[col].map(_to_sqlite_value)
+        with self._lock:
+            self._columns = list(df.columns)
+            stored.to_sql(_TABLE, self._conn, index=False, if_exists="replace")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_published_at ON {_TABLE}(published_at)")
+            self._column_bytes = {
+                col: int(stored[col].astype(str).str.len().sum()) if len(stored) else 0
+                for col in stored.columns
+            }
+            self._num_rows = len(stored)
+            self._modified = dt.datetime.now(dt.timezone.utc)
+
+    def estimate_bytes(self, sql: str, params: dict | None = None, cluster_pruning: bool = True) -> int:
+        """Stored size of every column `sql` references, scaled by partition/cluster pruning."""
+        referenced = sum(size for col, size in self._column_bytes.items() if re.search(rf"\b{col}\b", sql))
+        return int(referenced * self._scanned_fraction(sql, params or {}, cluster_pruning))
+
+    def _scanned_fraction(self, sql: str, params: dict, cluster_pruning: bool) -> float:
+        prunable = {self.partition_field} if self.partition_field in self._columns else set()
+        if cluster_pruning:
+            prunable |= set(self.clustering_fields) & set(self._columns)
+        match = _WHERE_RE.search(sql)
+        if not prunable or not self._num_rows or not match or len(re.findall(r"\bSELECT\b", sql, re.I)) != 1:
+            return 1.0
+
+        def prunes(conjunct: str) -> bool:
+            columns = {c for c in self._columns if re.search(rf"\b{c}\b", _PARAM_RE.sub("", conjunct))}
+            return bool(columns) and columns <= prunable
+
+        pruning = [c for c in _conjuncts(match.group(1)) if prunes(c)]
+        if not pruning:
+            return 1.0
+        count_sql = f"SELECT COUNT(*) FROM `t` WHERE {' AND '.join(f'({c})' for c in pruning)}"
+        sqlite_sql, bound = to_sqlite(count_sql, params)
+        with self._lock:
+            (selected,) = self._conn.execute(sqlite_sql, bound).fetchone()
+        return selected / self._num_rows
+
+    def query(self, sql: str, job_config=None, job_id_prefix: str | None = None, **kwargs) -> FakeQueryJob:
+        delay = self.latency_s() if callable(self.latency_s) else self.latency_s
+        if delay:
+            time.sleep(delay)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ServiceUnavailable("injected failure (FakeBigQueryClient.failure_rate)")
+        params = _job_params(job_config)
+        dry_run = getattr(job_config, "dry_run", False)
+        scanned = self.estimate_bytes(sql, params, cluster_pruning=not dry_run)
+        self.queries.append({"sql": sql, "params": params, "bytes": scanned})
+        if dry_run:
+            return FakeQueryJob(pd.DataFrame(), scanned, sql)
+
+        sqlite_sql, bound = to_sqlite(sql, params)
+        with self._lock:
+            df = pd.read_sql_query(sqlite_sql, self._conn, params=bound)
+            job = FakeQueryJob(_decode_columns(df), scanned, sql, f"{job_id_prefix or 'job_'}{next(self._job_ids)}")
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > 100:
+                self._jobs.popitem(last=False)
+        return job
+
+    def get_job(self, job_id: str, location: str | None = None, **kwargs) -> FakeQueryJob:
+        with self._lock:
+            if job_id not in self._jobs:
+                raise NotFound(f"Not found: Job {job_id}")
+            return self._jobs[job_id]
+
+    def get_table(self, table_ref) -> SimpleNamespace:
+        return SimpleNamespace(
+            schema=[SimpleNamespace(name=c, field_type=_FIELD_TYPES.get(c, "STRING")) for c in self._columns],
+            modified=self._modified,
+            num_rows=self._num_rows,
+            num_bytes=sum(self._column_bytes.values()),
+            time_partitioning=SimpleNamespace(field=self.partition_field) if self.partition_field else None,
+            clustering_fields=[c for c in self.clustering_fields if c in self._columns] or None,
+        )
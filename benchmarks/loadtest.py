@@ -0,0 +1,285 @@
+"""
+Load test: how many concurrent users one backend instance handles.
+
+Runs backend/app.py under uvicorn in this process, with stand-ins behind
+it: FakeBigQueryClient (fake_bq.py) over a synthetic corpus and
+FakeLLMServer (standins.py), each with a configurable latency
+distribution and failure rate. Closed-loop virtual users then replay the
+request mix the Streamlit frontend sends:
+
+  list            /api/release-notes, one page of cards (fetch_release_notes)
+  count           /api/release-notes?page_size=1, "N new since last visit"
+  breaking        /api/release-notes, BREAKING_CHANGE/DEPRECATION, 200 rows
+  insights        one of the four /api/insights/* charts
+  filter_options  /api/filter-options
+  ai_chat         POST /api/ai/chat (BigQuery + LLM)
+  ai_query        POST /api/ai/query (LLM, then BigQuery)
+
+For each concurrency level it reports throughput, p50/p95/p99 latency and
+error counts per request kind, plus threadpool saturation: the backend's
+sync endpoints run on AnyIO's default thread limiter, which is sampled
+from inside the event loop while the load runs. `borrowed` at `total` with
+`waiting` > 0 means requests are queueing for a worker thread, not for
+BigQuery or the model.
+
+    python benchmarks/loadtest.py --users 1,10,40,80 --duration 20 \\
+        --bq-latency lognormal:0.4,0.5 --llm-latency lognormal:3,0.4 \\
+        --bq-failure-rate 0.01 [--out results/loadtest.json]
+"""
+
+import argparse
+import datetime as dt
+import os
+import random
+import socket
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+
+from _common import use_component, write_results
+from corpus import generate
+from fake_bq import FakeBigQueryClient
+from standins import FakeLLMServer, LatencyModel
+
+DEFAULT_MIX = "list=45,count=15,breaking=8,insights=15,filter_options=5,ai_chat=8,ai_query=4"
+_INSIGHTS = ["time-series", "type-distribution", "top-products", "heatmap"]
+_QUESTIONS = [
+    "What changed in the last month?",
+    "Are there breaking changes I need to act on?",
+    "Summarize the deprecations by product.",
+]
+
+
+def _parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - {"list", "count", "breaking", "insights", "filter_options", "ai_chat", "ai_query"}
+    if unknown:
+        raise SystemExit(f"unknown request kinds in --mix: {sorted(unknown)}")
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Workload:
+    """Builds one request of a given kind, with filters drawn like a real session's."""
+
+    def __init__(self, options: dict, rng: random.Random):
+        self.products = options["products"]
+        self.types = options["types"]
+        self.max_date = dt.date.fromisoformat(options["max_date"])
+        self.rng = rng
+
+    def _window(self) -> tuple[str, str]:
+        days = self.rng.choice([30, 90, 365])
+        return str(self.max_date - dt.timedelta(days=days)), str(self.max_date)
+
+    def _products(self, k_max: int = 3) -> list[tuple[str, str]]:
+        k = self.rng.choice([0, 0, 1, 1, 2, k_max])
+        return [("products", p) for p in self.rng.sample(self.products[:15], k)]
+
+    def build(self, kind: str) -> tuple[str, str, dict]:
+        rng = self.rng
+        start, end = self._window()
+        if kind == "list":
+            params = [("start_date", start), ("end_date", end), ("page", rng.choice([1, 1, 1, 2, 3])), ("page_size", 10)]
+            params += [("types", t) for t in rng.sample(self.types, rng.choice([0, 0, 1, 2]))]
+            params += self._products()
+            if rng.random() < 0.2:
+                params.append(("search", rng.choice(["region", "preview", "migration", "quota"])))
+            return "GET", "/api/release-notes", {"params": params}
+        if kind == "count":
+            params = [("start_date", str(self.max_date - dt.timedelta(days=7))), ("end_date", end), ("page", 1), ("page_size", 1)]
+            return "GET", "/api/release-notes", {"params": params + self._products()}
+        if kind == "breaking":
+            params = [("types", "BREAKING_CHANGE"), ("types", "DEPRECATION"), ("start_date", start), ("end_date", end)]
+            return "GET", "/api/release-notes", {"params": params + [("page", 1), ("page_size", 200)] + self._products()}
+        if kind == "insights":
+            return "GET", f"/api/insights/{rng.choice(_INSIGHTS)}", {}
+        if kind == "filter_options":
+            return "GET", "/api/filter-options", {}
+        if kind == "ai_chat":
+            body = {
+                "question": rng.choice(_QUESTIONS),
+                "products": [p for _, p in self._products()],
+                "types": [],
+                "start_date": start,
+                "end_date": end,
+            }
+            return "POST", "/api/ai/chat", {"json": body}
+        return "POST", "/api/ai/query", {"json": {"question": rng.choice(_QUESTIONS)}}
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index], 2)
+
+
+def _summarize(samples: list[tuple[str, float, int]], seconds: float) -> dict:
+    by_kind: dict[str, list[tuple[float, int]]] = defaultdict(list)
+    for kind, ms, status in samples:
+        by_kind[kind].append((ms, status))
+        by_kind["all"].append((ms, status))
+    report = {}
+    for kind, values in sorted(by_kind.items()):
+        latencies = sorted(ms for ms, _ in values)
+        report[kind] = {
+            "requests": len(values),
+            "errors": sum(1 for _, status in values if status >= 400 or status == 0),
+            "rps": round(len(values) / seconds, 2),
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "max_ms": round(latencies[-1], 2),
+        }
+    return report
+
+
+def run_level(base_url: str, workload_options: dict, mix: dict, users: int, duration: float, warmup: float) -> dict:
+    kinds, weights = list(mix), list(mix.values())
+    samples: list[tuple[str, float, int]] = []
+    pool_samples: list[dict] = []
+    lock = threading.Lock()
+    started = time.monotonic()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    def user(seed: int) -> None:
+        rng = random.Random(seed)
+        workload = Workload(workload_options, rng)
+        with httpx.Client(base_url=base_url, timeout=300) as client:
+            while time.monotonic() < deadline:
+                kind = rng.choices(kinds, weights)[0]
+                method, path, kwargs = workload.build(kind)
+                t0 = time.monotonic()
+                try:
+                    status = client.request(method, path, **kwargs).status_code
+                except httpx.HTTPError:
+                    status = 0
+                t1 = time.monotonic()
+                if t0 >= measure_from:
+                    with lock:
+                        samples.append((kind, (t1 - t0) * 1000, status))
+
+    def sample_threadpool() -> None:
+        with httpx.Client(base_url=base_url, timeout=5) as client:
+            while time.monotonic() < deadline:
+                if time.monotonic() >= measure_from:
+                    try:
+                        pool_samples.append(client.get("/__loadtest/threadpool").json())
+                    except httpx.HTTPError:
+                        pass
+                time.sleep(0.05)
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    threads.append(threading.Thread(target=sample_threadpool, daemon=True))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    total = pool_samples[0]["total"] if pool_samples else 0
+    borrowed = [s["borrowed"] for s in pool_samples]
+    waiting = [s["waiting"] for s in pool_samples]
+    return {
+        "users": users,
+        "requests": _summarize(samples, duration),
+        "threadpool": {
+            "total_tokens": total,
+            "borrowed_mean": round(statistics.fmean(borrowed), 1) if borrowed else 0,
+            "borrowed_max": max(borrowed, default=0),
+            "saturated_pct": round(100 * sum(1 for b in borrowed if total and b >= total) / len(borrowed), 1) if borrowed else 0,
+            "waiting_max": max(waiting, default=0),
+            "samples": len(pool_samples),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", default="1,10,40,80", help="comma-separated concurrency levels to run in turn")
+    parser.add_argument("--duration", type=float, default=20, help="measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before each level")
+    parser.add_argument("--rows", type=int, default=20_000, help="synthetic corpus size")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="request kind weights")
+    parser.add_argument("--bq-latency", default="lognormal:0.4,0.5", help="per-query delay, see standins.LatencyModel")
+    parser.add_argument("--bq-failure-rate", type=float, default=0.0)
+    parser.add_argument("--llm-latency", default="lognormal:3,0.4", help="per-completion delay")
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="also write the JSON results to this path")
+    args = parser.parse_args()
+    mix = _parse_mix(args.mix)
+
+    llm = FakeLLMServer(LatencyModel.parse(args.llm_latency), args.llm_failure_rate).start()
+    os.environ["LLM_URL"] = llm.url  # read by backend/src/ai.py at import
+    use_component("backend")
+
+    import anyio.to_thread
+    import uvicorn
+
+    import app as backend_app
+
+    corpus = generate(rows=args.rows, seed=args.seed, end_date=dt.date.today())
+    fake = FakeBigQueryClient(corpus)
+    backend_app.init_bq_client = lambda: fake
+    backend_app.get_table_name = lambda: "loadtest-project.loadtest.release_notes"
+
+    @backend_app.app.get("/__loadtest/threadpool", include_in_schema=False)
+    async def threadpool_stats():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        stats = limiter.statistics()
+        return {"total": limiter.total_tokens, "borrowed": stats.borrowed_tokens, "waiting": stats.tasks_waiting}
+
+    port = _free_port()
+    # Injected failures surface as unhandled 500s; they're counted in the report, not logged.
+    log_level = "critical" if args.bq_failure_rate or args.llm_failure_rate else "error"
+    server = uvicorn.Server(uvicorn.Config(backend_app.app, host="127.0.0.1", port=port, log_level=log_level))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    base_url = f"http://127.0.0.1:{port}"
+    options = httpx.get(f"{base_url}/api/filter-options").json()
+
+    # Stand-in latency and failures apply from here on; startup ran against a fast, healthy fake.
+    fake.latency_s = LatencyModel.parse(args.bq_latency)
+    fake.failure_rate = args.bq_failure_rate
+
+    levels = []
+    for users in (int(u) for u in args.users.split(",")):
+        print(f"running {users} user(s) for {args.duration:.0f}s ...", flush=True)
+        levels.append(run_level(base_url, options, mix, users, args.duration, args.warmup))
+
+    server.should_exit = True
+    llm.stop()
+    write_results(
+        "loadtest",
+        {
+            "config": {
+                "corpus_rows": args.rows,
+                "mix": mix,
+                "bq_latency": args.bq_latency,
+                "bq_failure_rate": args.bq_failure_rate,
+                "llm_latency": args.llm_latency,
+                "llm_failure_rate": args.llm_failure_rate,
+                "duration_s": args.duration,
+            },
+            "levels": levels,
+        },
+        args.out,
+    )
+
+
+if __name__ == "__main__":
+    main()
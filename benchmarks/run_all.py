@@ -0,0 +1,70 @@
+"""
+Run every benchmark and record the results for regression tracking.
+
+Each bench_*.py runs in its own process (backend/, frontend/ and
+ingestion/ each have their own top-level `src` package). Results land in
+benchmarks/results/<name>.json, and one line per run — git commit plus
+every benchmark's results — is appended to
+benchmarks/results/history.jsonl, so two runs can be diffed over time:
+
+    python benchmarks/run_all.py [--only backend,ingestion] [--repeat 3]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from _common import REPO_ROOT
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / "results"
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", help="comma-separated benchmark names, e.g. backend,ingestion")
+    parser.add_argument("--repeat", type=int, help="passed through to every benchmark")
+    args = parser.parse_args()
+
+    scripts = sorted(BENCH_DIR.glob("bench_*.py"))
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(",")}
+        scripts = [s for s in scripts if s.stem.removeprefix("bench_") in wanted]
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    run = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "commit": _git_commit(), "results": {}}
+    failed = []
+    for script in scripts:
+        name = script.stem.removeprefix("bench_")
+        out = RESULTS_DIR / f"{name}.json"
+        cmd = [sys.executable, str(script), "--out", str(out)]
+        if args.repeat:
+            cmd += ["--repeat", str(args.repeat)]
+        print(f"running {script.name} ...", file=sys.stderr)
+        proc = subprocess.run(cmd, cwd=BENCH_DIR, stdout=subprocess.DEVNULL)
+        if proc.returncode != 0:
+            failed.append(name)
+            continue
+        run["results"][name] = json.loads(out.read_text())["results"]
+
+    with open(RESULTS_DIR / "history.jsonl", "a") as f:
+        f.write(json.dumps(run, default=str) + "\n")
+    print(f"wrote {RESULTS_DIR}/*.json and appended to history.jsonl", file=sys.stderr)
+    if failed:
+        sys.exit(f"failed: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
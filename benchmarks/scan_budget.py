@@ -0,0 +1,131 @@
+"""
+Bytes-scanned regression check for the backend's queries.
+
+Dry-runs every query shape the backend sends — the listing and count for
+the frontend's filter shapes, the filter-option loaders and the four
+insight charts, all built by backend/src/query_builder.py — against
+FakeBigQueryClient over a synthetic multi-platform corpus laid out like
+the ingestion job's table (partitioned on published_at, clustered on
+platform, product_name, release_note_type). Each shape's scan is taken as
+a share of the whole table, so budgets don't depend on corpus size, and
+compared with scan_budgets.json. Exits 1 when a shape scans more than its
+budget plus `--tolerance` — e.g. when a change drops the published_at
+bound or the platform filter from a query.
+
+Dry runs count partition pruning only, like BigQuery's; the report's
+`executed_share` also applies (optimistic) cluster pruning.
+
+    python benchmarks/scan_budget.py [--update] [--out results/scan_budget.json]
+"""
+
+import argparse
+import datetime as dt
+import json
+import sys
+from pathlib import Path
+
+from _common import use_component, write_results
+from corpus import generate
+from fake_bq import FakeBigQueryClient
+
+use_component("backend")
+
+from google.cloud import bigquery  # noqa: E402
+
+from src.query_builder import (  # noqa: E402
+    NoteFilters,
+    count_query,
+    date_range_query,
+    distinct_values_query,
+    heatmap_query,
+    release_notes_query,
+    time_series_query,
+    top_products_query,
+    trailing_window,
+    type_distribution_query,
+)
+
+BUDGETS_PATH = Path(__file__).resolve().parent / "scan_budgets.json"
+TABLE_NAME = "scan-project.cloud_release_notes.release_notes"
+PLATFORMS = ("GCP", "AWS", "AZURE")
+
+
+def _shapes(today: dt.date, products: list[str]) -> dict:
+    """The queries one frontend session sends, keyed by a stable name."""
+    days = lambda n: (today - dt.timedelta(days=n), today)  # noqa: E731
+    recent = NoteFilters.of(start_date=days(30)[0], end_date=today, platform="GCP")
+    with_products = NoteFilters.of(products=products[:3], start_date=days(90)[0], end_date=today, platform="GCP")
+    breaking = NoteFilters.of(["BREAKING_CHANGE", "DEPRECATION"], start_date=days(365)[0], end_date=today, platform="GCP")
+    new_since = NoteFilters.of(products=products[:3], start_date=days(7)[0], end_date=today, platform="GCP")
+    search = NoteFilters.of(search="migration", start_date=days(90)[0], end_date=today, platform="GCP")
+    year = NoteFilters.of(start_date=trailing_window(12, today)[0], end_date=today, platform="GCP")
+    quarter = NoteFilters.of(start_date=trailing_window(3, today)[0], end_date=today, platform="GCP")
+    return {
+        "list_30d": release_notes_query(TABLE_NAME, recent, 10, 0),
+        "count_30d": count_query(TABLE_NAME, recent),
+        "list_90d_products": release_notes_query(TABLE_NAME, with_products, 10, 0),
+        "count_90d_products": count_query(TABLE_NAME, with_products),
+        "list_breaking_365d": release_notes_query(TABLE_NAME, breaking, 200, 0),
+        "count_new_since_7d": count_query(TABLE_NAME, new_since),
+        "list_search_90d": release_notes_query(TABLE_NAME, search, 10, 0),
+        "count_search_90d": count_query(TABLE_NAME, search),
+        "options_types": distinct_values_query(TABLE_NAME, "release_note_type", "GCP"),
+        "options_products": distinct_values_query(TABLE_NAME, "product_name", "GCP"),
+        "options_date_range": date_range_query(TABLE_NAME, "GCP"),
+        "insight_time_series": time_series_query(TABLE_NAME, year),
+        "insight_type_distribution": type_distribution_query(TABLE_NAME, NoteFilters.of(platform="GCP")),
+        "insight_top_products": top_products_query(TABLE_NAME, NoteFilters.of(platform="GCP")),
+        "insight_heatmap": heatmap_query(TABLE_NAME, quarter),
+    }
+
+
+def measure_shapes(rows: int, seed: int) -> dict:
+    today = dt.date.today()
+    corpus = generate(rows=rows, seed=seed, end_date=today, days=1095, platforms=PLATFORMS)
+    fake = FakeBigQueryClient(corpus)
+    table_bytes = fake.get_table(TABLE_NAME).num_bytes
+    products = corpus["product_name"].value_counts().index.tolist()
+
+    report = {}
+    for name, query in _shapes(today, products).items():
+        dry = fake.query(query.sql, job_config=query.job_config(dry_run=True)).total_bytes_processed
+        executed = fake.query(query.sql, job_config=query.job_config()).total_bytes_processed
+        report[name] = {
+            "dry_run_bytes": dry,
+            "dry_run_share": round(dry / table_bytes, 4),
+            "executed_share": round(executed / table_bytes, 4),
+        }
+    return {"corpus_rows": rows, "table_bytes": table_bytes, "shapes": report}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000, help="synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="allowed share above budget")
+    parser.add_argument("--update", action="store_true", help="rewrite scan_budgets.json from this run")
+    parser.add_argument("--out", help="also write the JSON results to this path")
+    args = parser.parse_args()
+
+    results = measure_shapes(args.rows, args.seed)
+    shares = {name: r["dry_run_share"] for name, r in results["shapes"].items()}
+    if args.update:
+        BUDGETS_PATH.write_text(json.dumps(shares, indent=2, sort_keys=True) + "\n")
+        print(f"wrote {len(shares)} budgets to {BUDGETS_PATH.name}", file=sys.stderr)
+
+    budgets = json.loads(BUDGETS_PATH.read_text()) if BUDGETS_PATH.exists() else {}
+    over = {
+        name: {"share": share, "budget": budgets[name]}
+        for name, share in shares.items()
+        if name in budgets and share > budgets[name] + args.tolerance
+    }
+    results["missing_budgets"] = sorted(set(shares) - set(budgets))
+    results["over_budget"] = over
+    write_results("scan_budget", results, args.out)
+    if over:
+        print(f"{len(over)} query shape(s) over their scan budget: {', '.join(sorted(over))}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Latency-injecting stand-ins for the backend's external dependencies.
+
+  LatencyModel   a delay distribution parsed from a short spec string,
+                 used for both stand-ins:
+                   "0"                          no delay
+                   "fixed:0.2"                  always 200 ms
+                   "uniform:0.1,0.5"            uniform between 100 and 500 ms
+                   "lognormal:0.4,0.6"          median 400 ms, sigma 0.6 (long tail)
+  FakeLLMServer  an OpenAI-compatible HTTP endpoint (/v1/models,
+                 /v1/chat/completions) on a local port, with a LatencyModel
+                 and a failure rate. Point the backend at it with
+                 LLM_URL=<server.url> before importing it.
+  FakeFeedServer a release-notes feed on a local port that validates like
+                 a real one: every response carries an ETag and a
+                 Last-Modified, and a matching If-None-Match (or an
+                 If-Modified-Since no older than the feed) gets
+                 304 Not Modified with no body. Point the ingestion job
+                 at it with GCP_RSS_FEED_URL=<server.url>.
+
+The BigQuery stand-in is fake_bq.FakeBigQueryClient, which takes the
+same latency callable and failure rate.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_TABLE_RE = re.compile(r"Table: `([^`]+)`")
+
+
+@dataclass
+class LatencyModel:
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        kind, _, args = spec.partition(":")
+        if not args:
+            return cls("fixed", float(kind))
+        values = [float(v) for v in args.split(",")]
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"unknown latency distribution {kind!r} in {spec!r}")
+        return cls(kind, *values)
+
+    def __call__(self) -> float:
+        if self.kind == "uniform":
+            return random.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return random.lognormvariate(0, self.b) * self.a if self.a else 0.0
+        return self.a
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.a},{self.b}" if self.kind != "fixed" else f"fixed:{self.a}"
+
+
+def _completion(prompt: str, words: int) -> str:
+    if prompt.startswith("Generate a BigQuery SQL query"):
+        match = _TABLE_RE.search(prompt)
+        table = match.group(1) if match else "release_notes"
+        return (
+            f"SELECT product_name, COUNT(*) AS count FROM `{table}` "
+            "GROUP BY product_name ORDER BY count DESC LIMIT 10"
+        )
+    return "### Summary\n\n" + " ".join(random.choice(["update", "region", "GA", "quota", "API"]) for _ in range(words))
+
+
+class FakeLLMServer:
+    """OpenAI-compatible chat completions endpoint with injected latency and failures."""
+
+    def __init__(self, latency: LatencyModel, failure_rate: float = 0.0, model: str = "ai/llama3.2", words: int = 120):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.model = model
+        self.words = words
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._json(200, {"object": "list", "data": [{"id": stand_in.model, "object": "model"}]})
+                else:
+                    self._json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                stand_in.requests += 1
+                time.sleep(stand_in.latency())
+                if stand_in.failure_rate and random.random() < stand_in.failure_rate:
+                    self._json(503, {"error": {"message": "injected failure", "type": "server_error"}})
+                    return
+                prompt = request.get("messages", [{}])[-1].get("content", "")
+                self._json(
+                    200,
+                    {
+                        "id": f"chatcmpl-{random.getrandbits(32):08x}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": request.get("model", stand_in.model),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": _completion(prompt, stand_in.words)},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": stand_in.words, "total_tokens": 0},
+                    },
+                )
+
+        return Handler
+
+
+class FakeFeedServer:
+    """A feed endpoint that answers conditional GETs with 304, counting what it served."""
+
+    def __init__(self, body: bytes, content_type: str = "application/atom+xml"):
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        self.modified = int(time.time())
+        self.full = 0
+        self.not_modified = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/feed.xml"
+
+    def start(self) -> "FakeFeedServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _fresh(self, headers) -> bool:
+        if headers.get("If-None-Match"):
+            return self.etag in [tag.strip() for tag in headers["If-None-Match"].split(",")]
+        if headers.get("If-Modified-Since"):
+            try:
+                return parsedate_to_datetime(headers["If-Modified-Since"]).timestamp() >= self.modified
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if stand_in._fresh(self.headers):
+                    stand_in.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", stand_in.etag)
+                    self.end_headers()
+                    return
+                stand_in.full += 1
+                self.send_response(200)
+                self.send_header("Content-Type", stand_in.content_type)
+                self.send_header("Content-Length", str(len(stand_in.body)))
+                self.send_header("ETag", stand_in.etag)
+                self.send_header("Last-Modified", formatdate(stand_in.modified, usegmt=True))
+                self.end_headers()
+                self.wfile.write(stand_in.body)
+
+        return Handler
@@ -9,16 +9,20 @@ from urllib.parse import quote as urlquote
 
 import pandas as pd
 import plotly.graph_objects as go
-import requests
 import streamlit as st
 import streamlit.components.v1 as components
 from dotenv import load_dotenv
 
-from src.utils import format_description, get_badge_class, get_type_css_class
+from src.api import data_version, get_json
+from src.tracing import backend_delete, backend_get, backend_post, end_script_span, init_tracing, start_script_span
+from src.utils import get_badge_class, get_type_css_class, render_description
 
 load_dotenv()
 
 BACKEND_URL = os.environ.get("BACKEND_URL", "http://back:8000")
+# Sent as `platform` on every read, so the backend's queries prune on the
+# table's leading clustering column.
+PLATFORM = os.environ.get("PLATFORM", "GCP")
 WATCHLIST_PATH = Path(__file__).parent / "watchlist.json"
 
 
@@ -39,6 +43,7 @@ def save_watchlist(products: list[str]) -> None:
 
 
 LAST_VISIT_PATH = Path(__file__).parent / "last_visit.json"
+LAST_VISIT_REFRESH_SECONDS = float(os.environ.get("LAST_VISIT_REFRESH_SECONDS", "15"))
 
 
 def load_last_visit() -> str | None:
@@ -65,6 +70,10 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# --------------- Tracing ---------------
+init_tracing("release-notes-frontend")
+start_script_span()
+
 # --------------- Load Custom CSS ---------------
 CSS_PATH = Path(__file__).parent / "assets" / "style.css"
 if CSS_PATH.exists():
@@ -149,23 +158,26 @@ components.html(
 
 # --------------- Backend Connection Check ---------------
 try:
-    requests.get(f"{BACKEND_URL}/health", timeout=10).raise_for_status()
+    backend_get(f"{BACKEND_URL}/health", timeout=10).raise_for_status()
 except Exception as e:
     st.error(f"Cannot reach backend at {BACKEND_URL}: {e}")
+    end_script_span()
     st.stop()
 
+# Part of every cached fetcher's key: entries live long, but new data means new keys.
+DATA_VERSION = data_version(BACKEND_URL)
+
 # --------------- API Helpers ---------------
 
 
-@st.cache_data(ttl=3600, show_spinner="Loading filters...")
-def load_filter_options() -> dict:
-    resp = requests.get(f"{BACKEND_URL}/api/filter-options", timeout=30)
-    resp.raise_for_status()
-    return resp.json()
+@st.cache_data(ttl=86400, show_spinner="Loading filters...")
+def load_filter_options(data_version: str) -> dict:
+    return get_json(f"{BACKEND_URL}/api/filter-options", params={"platform": PLATFORM}, timeout=30)
 
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=21600, max_entries=500)
 def fetch_release_notes(
+    data_version: str,
     types_key: tuple,
     products_key: tuple,
     start_date_str: str,
@@ -180,6 +192,7 @@ def fetch_release_notes(
         "search": search,
         "page": page,
         "page_size": page_size,
+        "platform": PLATFORM,
     }
     # requests repeats the key for list params
     for t in types_key:
@@ -191,33 +204,44 @@ def fetch_release_notes(
         if isinstance(params["products"], list):
             params["products"].append(p)
 
-    resp = requests.get(f"{BACKEND_URL}/api/release-notes", params=params, timeout=60)
-    resp.raise_for_status()
-    return resp.json()
+    return get_json(f"{BACKEND_URL}/api/release-notes", params=params, timeout=60)
+
 
+def _insight_params(types_key: tuple, products_key: tuple, start_date_str: str, end_date_str: str) -> list:
+    """The sidebar filters as /api/insights/* params; no dates keeps each chart's default window."""
+    params = [("platform", PLATFORM)]
+    if start_date_str and end_date_str:
+        params += [("start_date", start_date_str), ("end_date", end_date_str)]
+    params += [("types", t) for t in types_key] + [("products", p) for p in products_key]
+    return params
 
-@st.cache_data(ttl=3600)
-def fetch_time_series() -> list:
-    return requests.get(f"{BACKEND_URL}/api/insights/time-series", timeout=30).json()
 
+@st.cache_data(ttl=86400, max_entries=200)
+def fetch_time_series(data_version: str, types_key: tuple, products_key: tuple, start: str, end: str) -> list:
+    params = _insight_params(types_key, products_key, start, end)
+    return get_json(f"{BACKEND_URL}/api/insights/time-series", params=params, timeout=30)
 
-@st.cache_data(ttl=3600)
-def fetch_type_distribution() -> list:
-    return requests.get(f"{BACKEND_URL}/api/insights/type-distribution", timeout=30).json()
 
+@st.cache_data(ttl=86400, max_entries=200)
+def fetch_type_distribution(data_version: str, types_key: tuple, products_key: tuple, start: str, end: str) -> list:
+    params = _insight_params(types_key, products_key, start, end)
+    return get_json(f"{BACKEND_URL}/api/insights/type-distribution", params=params, timeout=30)
 
-@st.cache_data(ttl=3600)
-def fetch_top_products() -> list:
-    return requests.get(f"{BACKEND_URL}/api/insights/top-products", timeout=30).json()
 
+@st.cache_data(ttl=86400, max_entries=200)
+def fetch_top_products(data_version: str, types_key: tuple, products_key: tuple, start: str, end: str) -> list:
+    params = _insight_params(types_key, products_key, start, end)
+    return get_json(f"{BACKEND_URL}/api/insights/top-products", params=params, timeout=30)
 
-@st.cache_data(ttl=3600)
-def fetch_heatmap() -> list:
-    return requests.get(f"{BACKEND_URL}/api/insights/heatmap", timeout=30).json()
 
+@st.cache_data(ttl=86400, max_entries=200)
+def fetch_heatmap(data_version: str, types_key: tuple, products_key: tuple, start: str, end: str) -> dict:
+    params = _insight_params(types_key, products_key, start, end)
+    return get_json(f"{BACKEND_URL}/api/insights/heatmap", params=params, timeout=30)
 
-@st.cache_data(ttl=300)
-def fetch_new_count(since_date: str, products_key: tuple) -> int:
+
+@st.cache_data(ttl=21600, max_entries=500)
+def fetch_new_count(data_version: str, since_date: str, products_key: tuple) -> int:
     """Count notes published strictly after since_date (day+1 onwards)."""
     from datetime import timedelta
     try:
@@ -231,19 +255,19 @@ def fetch_new_count(since_date: str, products_key: tuple) -> int:
         ("end_date", str(date.today())),
         ("page", 1),
         ("page_size", 1),
+        ("platform", PLATFORM),
     ]
     for p in products_key:
         params.append(("products", p))
     try:
-        resp = requests.get(f"{BACKEND_URL}/api/release-notes", params=params, timeout=10)
-        resp.raise_for_status()
-        return int(resp.json()["total"])
+        return int(get_json(f"{BACKEND_URL}/api/release-notes", params=params, timeout=10)["total"])
     except Exception:
         return 0
 
 
-@st.cache_data(ttl=1800)
+@st.cache_data(ttl=21600, max_entries=500)
 def fetch_breaking_changes(
+    data_version: str,
     products_key: tuple = (),
     start_date_str: str = "",
     end_date_str: str = "",
@@ -255,16 +279,16 @@ def fetch_breaking_changes(
         ("end_date", end_date_str),
         ("page", 1),
         ("page_size", 200),
+        ("platform", PLATFORM),
     ]
     for p in products_key:
         params.append(("products", p))
-    resp = requests.get(f"{BACKEND_URL}/api/release-notes", params=params, timeout=30)
-    resp.raise_for_status()
-    return resp.json()
+    return get_json(f"{BACKEND_URL}/api/release-notes", params=params, timeout=30)
 
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=21600, max_entries=100)
 def fetch_export_notes(
+    data_version: str,
     types_key: tuple,
     products_key: tuple,
     start_date_str: str,
@@ -278,23 +302,38 @@ def fetch_export_notes(
         ("search", search),
         ("page", 1),
         ("page_size", max_rows),
+        ("platform", PLATFORM),
     ]
     for t in types_key:
         params.append(("types", t))
     for p in products_key:
         params.append(("products", p))
-    resp = requests.get(f"{BACKEND_URL}/api/release-notes", params=params, timeout=60)
-    resp.raise_for_status()
-    return pd.DataFrame(resp.json()["data"])
+    return pd.DataFrame(get_json(f"{BACKEND_URL}/api/release-notes", params=params, timeout=60)["data"])
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_suggestions(prefix: str) -> list[dict]:
+    """Completions for the search box — served from the backend's in-memory index, not BigQuery."""
+    try:
+        resp = backend_get(f"{BACKEND_URL}/api/suggest", params={"q": prefix, "limit": 6}, timeout=2)
+        resp.raise_for_status()
+        return resp.json()["suggestions"]
+    except Exception:
+        return []
 
 
 _TAG_RE = re.compile(r"<[^>]+>")
 
 
-def to_markdown_digest(df: pd.DataFrame, platform: str, start: date, end: date) -> str:
-    def strip_html(text: str) -> str:
-        return _TAG_RE.sub("", str(text or "")).strip()
+def _plain_text(row) -> str:
+    """Tag-free description — precomputed by the backend, stripped here only as a fallback."""
+    text = row.get("description_text")
+    if isinstance(text, str):
+        return text
+    return _TAG_RE.sub("", str(row.get("description", "") or "")).strip()
+
 
+def to_markdown_digest(df: pd.DataFrame, platform: str, start: date, end: date) -> str:
     lines = [
         f"# {platform} Release Notes Digest",
         "",
@@ -314,7 +353,7 @@ def to_markdown_digest(df: pd.DataFrame, platform: str, start: date, end: date)
             rtype = row.get("release_note_type", "")
             lines.append(f"**[{rtype}]** `{pub}`")
             lines.append("")
-            lines.append(strip_html(row.get("description", "")))
+            lines.append(_plain_text(row))
             lines.append("")
         lines.append("---")
         lines.append("")
@@ -340,13 +379,30 @@ if "_watchlist_applied" not in st.session_state:
 if st.session_state.pop("_apply_stack", False):
     st.session_state["_products_select"] = list(st.session_state.watchlist)
 
+def _apply_suggestion() -> None:
+    """Pills callback: a product or type suggestion becomes a filter, a term becomes the keyword."""
+    picked = st.session_state.pop("_suggestion_pick", None)
+    if not picked:
+        return
+    kind, _, text = picked.partition(":")
+    if kind == "product":
+        st.session_state["_products_select"] = sorted({*st.session_state.get("_products_select", []), text})
+        st.session_state["_search_text"] = ""
+    elif kind == "type":
+        st.session_state["_types_select"] = sorted({*st.session_state.get("_types_select", []), text})
+        st.session_state["_search_text"] = ""
+    else:
+        st.session_state["_search_text"] = text
+    st.session_state.page = 1
+
+
 if "_products_select" not in st.session_state:
     st.session_state["_products_select"] = []
 if "_types_select" not in st.session_state:
     st.session_state["_types_select"] = []
 
 # --------------- Load Filter Options ---------------
-filter_options = load_filter_options()
+filter_options = load_filter_options(DATA_VERSION)
 release_note_types = filter_options.get("types", ["Feature", "Issue", "Announcement"])
 product_names = filter_options.get("products", ["Compute Engine", "BigQuery", "Cloud Storage"])
 min_date = date.fromisoformat(filter_options["min_date"])
@@ -400,14 +456,31 @@ with st.sidebar:
     # )
     selected_platform = "Google Cloud"
 
-    # st.markdown("### Search")
-    # search_text = st.text_input(
-    #     "Keyword",
-    #     "",
-    #     placeholder="e.g. Kubernetes, IAM, BigQuery...",
-    #     label_visibility="collapsed",
-    # )
-    search_text = ""
+    st.markdown("### Search")
+    search_text = st.text_input(
+        "Keyword",
+        placeholder="e.g. Kubernetes, IAM, BigQuery...",
+        label_visibility="collapsed",
+        key="_search_text",
+    ).strip()
+    _suggestions = fetch_suggestions(search_text) if len(search_text) >= 2 else []
+    _suggestions = [
+        s for s in _suggestions
+        if (s["kind"] == "product" and s["text"] in product_names)
+        or (s["kind"] == "type" and s["text"] in release_note_types)
+        or (s["kind"] == "term" and s["text"] != search_text.lower())
+    ]
+    if _suggestions:
+        _kind_labels = {"product": "product", "type": "type", "term": "keyword"}
+        st.pills(
+            "Suggestions",
+            options=[f"{s['kind']}:{s['text']}" for s in _suggestions],
+            format_func=lambda o: f"{o.partition(':')[2]} · {_kind_labels.get(o.partition(':')[0], '')}",
+            selection_mode="single",
+            label_visibility="collapsed",
+            key="_suggestion_pick",
+            on_change=_apply_suggestion,
+        )
 
     st.markdown("### Filters")
     selected_products = st.multiselect(
@@ -488,41 +561,86 @@ with st.sidebar:
             st.session_state["_apply_stack"] = True
             st.rerun()
 
+    # ---- Notifications ----
+    with st.expander("Notify me about new notes"):
+        _sub_who = st.text_input("Email or handle", placeholder="you@example.com", key="sub_subscriber").strip()
+        _sub_keywords = [k.strip() for k in st.text_input("Keywords (optional, comma-separated)", key="sub_keywords").split(",") if k.strip()]
+        st.caption("Notes matching your stack" + (" and any of these keywords" if _sub_keywords else "") + " are sent after each ingestion run.")
+        if st.button(
+            "Subscribe",
+            use_container_width=True,
+            key="sub_create",
+            disabled=not (_sub_who and (watchlist or _sub_keywords)),
+        ):
+            try:
+                resp = backend_post(
+                    f"{BACKEND_URL}/api/subscriptions",
+                    json={"subscriber": _sub_who, "products": watchlist, "keywords": _sub_keywords, "platform": PLATFORM},
+                    timeout=10,
+                )
+                if resp.status_code == 201:
+                    st.success("Subscribed")
+                else:
+                    st.error(f"**Error {resp.status_code}:** {resp.json().get('detail', resp.text)}")
+            except Exception as e:
+                st.error(f"Request failed: {e}")
+        if _sub_who:
+            try:
+                _subs = backend_get(
+                    f"{BACKEND_URL}/api/subscriptions", params={"subscriber": _sub_who}, timeout=10
+                ).json()["subscriptions"]
+            except Exception:
+                _subs = []
+            for _sub in _subs:
+                _sub_col1, _sub_col2 = st.columns([4, 1])
+                _sub_col1.caption(" · ".join(_sub["products"] + [f'"{k}"' for k in _sub["keywords"]] + _sub["types"]))
+                if _sub_col2.button("✕", key=f"sub_del_{_sub['id']}", help="Unsubscribe"):
+                    backend_delete(
+                        f"{BACKEND_URL}/api/subscriptions/{_sub['id']}", params={"subscriber": _sub_who}, timeout=10
+                    )
+                    st.rerun()
+
     st.markdown("---")
 
     # ---- Last Visit ----
-    _prev = st.session_state["_prev_last_visit"]
-    if _prev:
-        try:
-            _prev_fmt = date.fromisoformat(_prev).strftime("%b %d, %Y")
-        except Exception:
-            _prev_fmt = _prev
-
-        _lv_products = tuple(st.session_state.watchlist or [])
-        _lv_new = fetch_new_count(_prev, _lv_products)
-
-        if _lv_new > 0:
-            _scope_txt = "for your stack" if _lv_products else "across all products"
-            st.markdown(
-                f'<div class="lv-bar lv-bar-new">'
-                f'<span class="lv-count-badge">{_lv_new}</span>'
-                f'<span class="lv-text">new notes {_scope_txt}</span>'
-                f'<span class="lv-since">since {_prev_fmt}</span>'
-                f'</div>',
-                unsafe_allow_html=True,
-            )
-            if st.button("Mark as seen", use_container_width=True, key="lv_mark_seen"):
-                save_last_visit(str(date.today()))
-                st.session_state["_prev_last_visit"] = str(date.today())
-                st.rerun()
-        else:
-            st.markdown(
-                f'<div class="lv-bar lv-bar-current">'
-                f'<span class="lv-text">Up to date</span>'
-                f'<span class="lv-since">last visit {_prev_fmt}</span>'
-                f'</div>',
-                unsafe_allow_html=True,
-            )
+    # A fragment on a timer: when the data version moves (pushed over the
+    # change stream), the badge updates without waiting for a full rerun.
+    @st.fragment(run_every=LAST_VISIT_REFRESH_SECONDS)
+    def last_visit_bar():
+        _prev = st.session_state["_prev_last_visit"]
+        if _prev:
+            try:
+                _prev_fmt = date.fromisoformat(_prev).strftime("%b %d, %Y")
+            except Exception:
+                _prev_fmt = _prev
+
+            _lv_products = tuple(st.session_state.watchlist or [])
+            _lv_new = fetch_new_count(data_version(BACKEND_URL), _prev, _lv_products)
+
+            if _lv_new > 0:
+                _scope_txt = "for your stack" if _lv_products else "across all products"
+                st.markdown(
+                    f'<div class="lv-bar lv-bar-new">'
+                    f'<span class="lv-count-badge">{_lv_new}</span>'
+                    f'<span class="lv-text">new notes {_scope_txt}</span>'
+                    f'<span class="lv-since">since {_prev_fmt}</span>'
+                    f'</div>',
+                    unsafe_allow_html=True,
+                )
+                if st.button("Mark as seen", use_container_width=True, key="lv_mark_seen"):
+                    save_last_visit(str(date.today()))
+                    st.session_state["_prev_last_visit"] = str(date.today())
+                    st.rerun()
+            else:
+                st.markdown(
+                    f'<div class="lv-bar lv-bar-current">'
+                    f'<span class="lv-text">Up to date</span>'
+                    f'<span class="lv-since">last visit {_prev_fmt}</span>'
+                    f'</div>',
+                    unsafe_allow_html=True,
+                )
+
+    last_visit_bar()
 
     st.markdown("---")
     with st.expander("About this app"):
@@ -597,6 +715,7 @@ start_date, end_date = _date_range_bounds(date_range, min_date, max_date)
 
 # --------------- Fetch Release Notes ---------------
 raw = fetch_release_notes(
+    DATA_VERSION,
     tuple(selected_types),
     tuple(selected_products),
     str(start_date),
@@ -623,6 +742,7 @@ active_filters = sum([
 _active_watchlist = st.session_state.watchlist
 bc_products_key = tuple(_active_watchlist) if _active_watchlist else tuple(selected_products)
 bc_raw = fetch_breaking_changes(
+    DATA_VERSION,
     products_key=bc_products_key,
     start_date_str=str(start_date),
     end_date_str=str(end_date),
@@ -698,7 +818,7 @@ if bc_total > 0 and not bc_df.empty:
                 """,
                 unsafe_allow_html=True,
             )
-            format_description(row["description"])
+            render_description(row)
             st.markdown("<div style='height:0.25rem'></div>", unsafe_allow_html=True)
 
 # --------------- Share Dialog ---------------
@@ -740,7 +860,7 @@ def share_dialog():
 
 # --------------- Tabs ---------------
 _prev_lv = st.session_state["_prev_last_visit"]
-_tab_new_count = fetch_new_count(_prev_lv, bc_products_key) if _prev_lv else 0
+_tab_new_count = fetch_new_count(DATA_VERSION, _prev_lv, bc_products_key) if _prev_lv else 0
 _notes_tab_label = f"Release Notes  ·  {_tab_new_count} new ↑" if _tab_new_count else "Release Notes"
 tab_notes, tab_insights, tab_ai = st.tabs([_notes_tab_label, "Insights & Analytics", "Ask AI"])
 
@@ -770,6 +890,7 @@ with tab_notes:
 
     if total_count > 0:
         export_df = fetch_export_notes(
+            DATA_VERSION,
             tuple(selected_types),
             tuple(selected_products),
             str(start_date),
@@ -810,7 +931,7 @@ with tab_notes:
             type_class = get_type_css_class(row["release_note_type"])
             badge_class = get_badge_class(row["release_note_type"])
             pub_date = row["published_at"].strftime("%b %d, %Y")
-            plain_desc = _TAG_RE.sub("", str(row.get("description", ""))).strip()
+            plain_desc = _plain_text(row)
             copy_text = urlquote(
                 f"{row['product_name']}\n"
                 f"Type: {row['release_note_type']}\n"
@@ -839,7 +960,7 @@ with tab_notes:
                 unsafe_allow_html=True,
             )
             with st.container():
-                format_description(row["description"])
+                render_description(row)
             st.markdown("<div style='height: 0.25rem'></div>", unsafe_allow_html=True)
     else:
         st.markdown(
@@ -904,15 +1025,28 @@ CHART_COLORS = [
 ]
 
 with tab_insights:
+    # The charts follow the sidebar filters; without a date range each keeps its own window.
+    _dates_narrowed = start_date != min_date or end_date != max_date
+    _insight_args = (
+        DATA_VERSION,
+        tuple(selected_types),
+        tuple(selected_products),
+        str(start_date) if _dates_narrowed else "",
+        str(end_date) if _dates_narrowed else "",
+    )
+    _window_label = (
+        f"{start_date.strftime('%b %d, %Y')} – {end_date.strftime('%b %d, %Y')}" if _dates_narrowed else None
+    )
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown(
             '<div class="insights-title">Release Activity</div>'
-            '<div class="insights-subtitle">Monthly volume over the last 12 months</div>',
+            '<div class="insights-subtitle">'
+            f'Monthly volume {"· " + _window_label if _window_label else "over the last 12 months"}</div>',
             unsafe_allow_html=True,
         )
-        time_df = pd.DataFrame(fetch_time_series())
+        time_df = pd.DataFrame(fetch_time_series(*_insight_args))
         fig1 = go.Figure()
         if not time_df.empty:
             fig1.add_trace(go.Scatter(
@@ -939,7 +1073,7 @@ with tab_insights:
             '<div class="insights-subtitle">Breakdown by release note category</div>',
             unsafe_allow_html=True,
         )
-        types_df = pd.DataFrame(fetch_type_distribution())
+        types_df = pd.DataFrame(fetch_type_distribution(*_insight_args))
         fig2 = go.Figure()
         if not types_df.empty:
             fig2.add_trace(go.Pie(
@@ -963,7 +1097,7 @@ with tab_insights:
             '<div class="insights-subtitle">Most active products by release note count</div>',
             unsafe_allow_html=True,
         )
-        top_df = pd.DataFrame(fetch_top_products())
+        top_df = pd.DataFrame(fetch_top_products(*_insight_args))
         fig3 = go.Figure()
         if not top_df.empty:
             fig3.add_trace(go.Bar(
@@ -989,22 +1123,21 @@ with tab_insights:
     with col4:
         st.markdown(
             '<div class="insights-title">Recent Activity Heatmap</div>'
-            '<div class="insights-subtitle">Daily release note activity (last 3 months)</div>',
+            '<div class="insights-subtitle">'
+            f'Daily release note activity ({_window_label or "last 3 months"})</div>',
             unsafe_allow_html=True,
         )
-        heatmap_data = fetch_heatmap()
-        heatmap_df = pd.DataFrame(heatmap_data)
-        if not heatmap_df.empty:
-            pivot_df = heatmap_df.pivot_table(
-                index="day_of_week", columns="week", values="count", fill_value=0
-            )
-            day_labels = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-            week_labels = [f"W{pd.Timestamp(w).isocalendar()[1]}" for w in pivot_df.columns]
+        heatmap = fetch_heatmap(*_insight_args)
+        if any(any(row) for row in heatmap["counts"]):
+            # Week numbers repeat after a year; longer windows are labelled by the week's Sunday.
+            week_labels = heatmap["weeks"]
+            if len(week_labels) <= 52:
+                week_labels = [f"W{pd.Timestamp(w).isocalendar()[1]}" for w in week_labels]
 
             fig4 = go.Figure(data=go.Heatmap(
-                z=pivot_df.values,
+                z=heatmap["counts"],
                 x=week_labels,
-                y=[day_labels[int(d) - 1] for d in pivot_df.index],
+                y=heatmap["days"],
                 colorscale=[[0, "#F8FAFE"], [0.5, "#A8C7FA"], [1, "#1A73E8"]],
                 showscale=False,
                 hovertemplate="<b>%{x} · %{y}</b><br>%{z} notes<extra></extra>",
@@ -1027,7 +1160,7 @@ with tab_insights:
 with tab_ai:
     # Model health check
     try:
-        ai_status = requests.get(f"{BACKEND_URL}/api/ai/health", timeout=5).json()
+        ai_status = backend_get(f"{BACKEND_URL}/api/ai/health", timeout=5).json()
         model_ready = ai_status.get("ready", False)
         if model_ready:
             st.success(f"Model **{ai_status['model']}** is ready.", icon="✅")
@@ -1109,7 +1242,7 @@ with tab_ai:
     if st.button("Ask", type="primary", disabled=not (question or "").strip() or not model_ready):
         with st.spinner("Reading release notes and generating answer…"):
             try:
-                resp = requests.post(
+                resp = backend_post(
                     f"{BACKEND_URL}/api/ai/chat",
                     json={
                         "question": question,
@@ -1117,6 +1250,7 @@ with tab_ai:
                         "types": selected_types,
                         "start_date": str(start_date),
                         "end_date": str(end_date),
+                        "platform": PLATFORM,
                     },
                     timeout=180,
                 )
@@ -1132,6 +1266,11 @@ with tab_ai:
                         f"Based on {data['count']} release notes"
                         + (f" (of {data['total']:,} matching your filters)" if data["total"] > data["count"] else "")
                         + f" · {start_date} – {end_date}"
+                        + (" · cached answer" if data.get("cached") else "")
+                    )
+                elif resp.status_code == 429:
+                    st.warning(
+                        f"The model is busy with other questions — try again in {resp.headers.get('Retry-After', 'a few')} s."
                     )
                 else:
                     st.error(f"**Error {resp.status_code}:** {resp.json().get('detail', resp.text)}")
@@ -1148,3 +1287,5 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+end_script_span()
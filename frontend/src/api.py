@@ -0,0 +1,81 @@
+"""Backend reads that revalidate instead of refetching.
+
+get_json() remembers each response's ETag and body (per process, shared
+by all sessions) and sends the ETag back as If-None-Match; when nothing
+changed the backend answers 304 with no body and the remembered one is
+returned. data_version() is the backend's current data version — pushed
+over the change stream (src/changes.py) while that's connected, otherwise
+checked at most every DATA_VERSION_CHECK_SECONDS. main.py passes it to
+its st.cache_data fetchers as part of the key, so their TTLs can be long:
+new data means a new key, not an expired entry. In embedded mode
+(src/embedded.py) there's nothing to revalidate: the backend's own
+version is read directly.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+import requests
+
+from src import embedded
+from src.changes import change_listener
+from src.embedded import EMBEDDED
+from src.tracing import backend_get
+
+DATA_VERSION_CHECK_SECONDS = float(os.environ.get("DATA_VERSION_CHECK_SECONDS", "30"))
+REVALIDATE_CACHE_SIZE = int(os.environ.get("REVALIDATE_CACHE_SIZE", "500"))
+
+_responses: OrderedDict[str, tuple[str, object]] = OrderedDict()
+_lock = threading.Lock()
+_version: tuple[float, str] = (0.0, "")
+
+
+def get_json(url: str, params=None, timeout: float = 30):
+    """GET `url` and return its JSON body, revalidating a previously seen response by ETag."""
+    key = requests.Request("GET", url, params=params).prepare().url
+    with _lock:
+        cached = _responses.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    resp = backend_get(url, params=params, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached:
+        with _lock:
+            _responses.move_to_end(key)
+        return cached[1]
+    resp.raise_for_status()
+    body = resp.json()
+    etag = resp.headers.get("ETag")
+    if etag:
+        with _lock:
+            _responses[key] = (etag, body)
+            _responses.move_to_end(key)
+            while len(_responses) > REVALIDATE_CACHE_SIZE:
+                _responses.popitem(last=False)
+    return body
+
+
+def data_version(backend_url: str) -> str:
+    """The backend's data version plus today's date (trailing windows move daily).
+
+    While it's unknown, a key that changes every 5 minutes — the old TTL.
+    """
+    global _version
+    if EMBEDDED:
+        version = embedded.data_version()
+        return f"{version}@{date.today().isoformat()}" if version else f"unversioned-{int(time.time() // 300)}"
+    listener = change_listener(backend_url)
+    if listener and listener.connected and listener.version:
+        return f"{listener.version}@{date.today().isoformat()}"
+    checked_at, version = _version
+    if time.monotonic() - checked_at > DATA_VERSION_CHECK_SECONDS:
+        try:
+            version = get_json(f"{backend_url}/api/data-version", timeout=5).get("version") or ""
+        except Exception:
+            version = ""
+        # Unknown (backend still loading, or unreachable): check again on the next rerun.
+        _version = (time.monotonic() if version else 0.0, version)
+    if not version:
+        return f"unversioned-{int(time.time() // 300)}"
+    return f"{version}@{date.today().isoformat()}"
@@ -0,0 +1,100 @@
+"""Follow the backend's data version over its change stream instead of polling.
+
+One background thread per process holds /api/changes/stream open. Every
+event on it carries the data version, so while it's connected
+api.data_version() returns the pushed version (new data shows up on the
+next rerun, without waiting out DATA_VERSION_CHECK_SECONDS), and the
+last-visit badge re-renders as soon as it moves. When the stream drops,
+the thread reconnects with backoff, sending Last-Event-ID, and
+data_version() falls back to polling meanwhile. CHANGE_STREAM=off
+disables it.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+from src.embedded import EMBEDDED
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAM = os.environ.get("CHANGE_STREAM", "on").lower()
+# The backend sends a keep-alive every 15 s; a silent minute means the connection is gone.
+READ_TIMEOUT_SECONDS = 60
+MAX_BACKOFF_SECONDS = 60
+
+
+class ChangeListener:
+    def __init__(self, backend_url: str):
+        self.url = f"{backend_url}/api/changes/stream"
+        self.connected = False
+        self.version: str | None = None
+        self.last_event: dict | None = None  # the newest `notes` event
+        self._last_id: str | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "ChangeListener":
+        self._thread = threading.Thread(target=self._run, name="change-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                self._listen()
+                backoff = 1.0
+            except Exception as e:
+                logger.info("Change stream disconnected (%s); retrying in %.0fs", e, backoff)
+            self.connected = False
+            time.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+    def _listen(self) -> None:
+        headers = {"Accept": "text/event-stream"}
+        if self._last_id:
+            headers["Last-Event-ID"] = self._last_id
+        with requests.get(self.url, headers=headers, stream=True, timeout=(5, READ_TIMEOUT_SECONDS)) as resp:
+            resp.raise_for_status()
+            event, data, event_id = "message", [], None
+            for line in resp.iter_lines(decode_unicode=True):
+                if line:
+                    field, _, value = line.partition(":")
+                    value = value[1:] if value.startswith(" ") else value
+                    if field == "event":
+                        event = value
+                    elif field == "data":
+                        data.append(value)
+                    elif field == "id":
+                        event_id = value
+                    continue
+                if data:
+                    self._dispatch(event, json.loads("\n".join(data)), event_id)
+                event, data, event_id = "message", [], None
+
+    def _dispatch(self, event: str, data: dict, event_id: str | None) -> None:
+        if event_id:
+            self._last_id = event_id
+        if event == "notes":
+            self.last_event = data
+        self.version = data.get("version") or self.version
+        self.connected = True
+
+
+_listener: ChangeListener | None = None
+_lock = threading.Lock()
+
+
+def change_listener(backend_url: str) -> ChangeListener | None:
+    """This process's listener, started on first use; None with CHANGE_STREAM=off or in embedded mode."""
+    global _listener
+    if CHANGE_STREAM == "off" or EMBEDDED:
+        return None
+    with _lock:
+        if _listener is None:
+            _listener = ChangeListener(backend_url).start()
+        return _listener
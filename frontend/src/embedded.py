@@ -0,0 +1,264 @@
+"""Embedded mode: run the backend inside the Streamlit process and call it directly.
+
+With BACKEND_MODE=embedded (for single-container deployments) there is no
+backend service: the backend's FastAPI app (BACKEND_PATH, by default the
+repo's backend/ next to frontend/) is imported into this process, its
+lifespan runs once on an event loop thread — BigQuery client, note
+store, suggestion index, all shared by every session — and
+backend_get()/backend_post()/backend_delete() (src/tracing.py) call the
+matching endpoint function with Python values instead of making an HTTP
+request. Arguments are validated as FastAPI would validate them: each
+value is sent through pydantic as the string it would be on the wire,
+against the parameter's annotation and its Query(...) constraints (ge,
+le, max_length, ...), and failures come back as the same 422. Responses
+are the endpoints' return values as they are, not JSON round-tripped;
+EmbeddedResponse gives them the requests.Response surface main.py uses.
+Backend spans nest under the script's span.
+
+Both components have a top-level `src` package, so the backend is
+imported with the frontend's `src` modules set aside and they're put
+back afterwards; the backend's modules keep their own references. The
+backend's dependencies (backend/requirements.txt) must be installed.
+"""
+
+import asyncio
+import copy
+import importlib
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import types
+import typing
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+BACKEND_MODE = os.environ.get("BACKEND_MODE", "http").lower()
+EMBEDDED = BACKEND_MODE == "embedded"
+BACKEND_PATH = os.environ.get("BACKEND_PATH") or str(Path(__file__).resolve().parents[2] / "backend")
+
+_import_lock = threading.Lock()
+_start_lock = threading.Lock()
+_module: types.ModuleType | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_adapters: dict[tuple, object] = {}  # (endpoint, parameter) -> pydantic TypeAdapter
+
+
+class EmbeddedResponse:
+    """What main.py reads from a requests.Response, for an in-process call."""
+
+    def __init__(self, status_code: int, body, headers=None, url: str = ""):
+        self.status_code = status_code
+        self.body = body
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self):
+        return self.body
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self.body, default=str)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            detail = self.body.get("detail") if isinstance(self.body, dict) else self.body
+            raise requests.HTTPError(f"{self.status_code} for embedded {self.url}: {detail}", response=self)
+
+
+def _is_src(name: str) -> bool:
+    return name == "src" or name.startswith("src.")
+
+
+def backend_module() -> types.ModuleType:
+    """The backend's `app` module, imported on first use (its lifespan isn't started yet)."""
+    global _module
+    with _import_lock:
+        if _module is None:
+            ours = {name: sys.modules.pop(name) for name in [n for n in sys.modules if _is_src(n)]}
+            sys.path.insert(0, BACKEND_PATH)
+            try:
+                _module = importlib.import_module("app")
+            finally:
+                sys.path.remove(BACKEND_PATH)
+                for name in [n for n in sys.modules if _is_src(n)]:
+                    del sys.modules[name]
+                sys.modules.update(ours)
+        return _module
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """The loop the backend's lifespan runs on, started (and startup finished) on first call."""
+    global _loop
+    with _start_lock:
+        if _loop is not None:
+            return _loop
+        app = backend_module().app
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="embedded-backend", daemon=True).start()
+        started = threading.Event()
+        failure: list[BaseException] = []
+
+        async def serve() -> None:
+            try:
+                async with app.router.lifespan_context(app):
+                    started.set()
+                    await asyncio.Event().wait()  # for the life of the process
+            except BaseException as e:
+                failure.append(e)
+                started.set()
+                raise
+
+        asyncio.run_coroutine_threadsafe(serve(), loop)
+        started.wait()
+        if failure:
+            loop.call_soon_threadsafe(loop.stop)
+            raise RuntimeError(f"Embedded backend failed to start: {failure[0]}") from failure[0]
+        logger.info("Embedded backend started from %s", BACKEND_PATH)
+        _loop = loop
+        return loop
+
+
+def _match(app, method: str, path: str):
+    """(route, path parameters) for a request, or (None, {})."""
+    from fastapi.routing import APIRoute
+    from starlette.routing import Match
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            match, child = route.matches({"type": "http", "path": path, "method": method})
+            if match == Match.FULL:
+                return route, child.get("path_params", {})
+    return None, {}
+
+
+def _wire(value, annotation):
+    """A query-string value (or list of them) as the string(s) an HTTP request would carry."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        annotation = next(a for a in typing.get_args(annotation) if a is not type(None))
+    if typing.get_origin(annotation) is list:
+        return [str(v) for v in (value if isinstance(value, (list, tuple)) else [value])]
+    if isinstance(value, (list, tuple)):
+        value = value[-1]  # like FastAPI: the last of a repeated scalar parameter
+    return str(value)
+
+
+def _validate(endpoint, name: str, annotation, field, value, loc: str):
+    """`value` validated against the parameter's annotation and its FieldInfo constraints, as FastAPI does."""
+    from fastapi.exceptions import RequestValidationError
+    from pydantic import TypeAdapter, ValidationError
+
+    key = (endpoint, name)
+    if key not in _adapters:
+        _adapters[key] = TypeAdapter(typing.Annotated[annotation, field] if field is not None else annotation)
+    try:
+        return _adapters[key].validate_python(value)
+    except ValidationError as e:
+        prefix = (loc,) if loc == "body" else (loc, name)  # a lone body model isn't named, as in FastAPI
+        raise RequestValidationError(
+            [{**error, "loc": (*prefix, *error["loc"])} for error in e.errors(include_url=False)]
+        ) from None
+
+
+def _query(params) -> dict[str, list]:
+    """requests-style params (a dict, or a list of pairs) as name -> values."""
+    query: dict[str, list] = {}
+    for name, value in params.items() if isinstance(params, dict) else params or ():
+        if value is not None:
+            query.setdefault(name, []).extend(value if isinstance(value, (list, tuple)) else [value])
+    return query
+
+
+def _arguments(endpoint, path_params: dict, params: dict[str, list], body) -> dict:
+    """Keyword arguments for `endpoint`, bound and validated the way FastAPI would bind this request."""
+    from fastapi import HTTPException, Request
+    from fastapi.exceptions import RequestValidationError
+    from pydantic import BaseModel
+    from pydantic.fields import FieldInfo
+
+    hints = typing.get_type_hints(endpoint)
+    kwargs = {}
+    for name, param in inspect.signature(endpoint).parameters.items():
+        annotation = hints.get(name, str)
+        field = param.default if isinstance(param.default, FieldInfo) else None  # Query(...), Header(...)
+        if annotation is Request:
+            raise HTTPException(status_code=501, detail="Not available in embedded mode")
+        if name in path_params:
+            kwargs[name] = _validate(endpoint, name, annotation, field, path_params[name], "path")
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            kwargs[name] = _validate(endpoint, name, annotation, None, body or {}, "body")
+        elif params.get(name):
+            kwargs[name] = _validate(endpoint, name, annotation, field, _wire(params[name], annotation), "query")
+        elif field is not None and not field.is_required():
+            kwargs[name] = copy.copy(field.get_default(call_default_factory=True))
+        elif field is not None or param.default is inspect.Parameter.empty:
+            raise RequestValidationError(
+                [{"type": "missing", "loc": ("query", name), "msg": "Field required", "input": None}]
+            )
+    return kwargs
+
+
+def _error_response(app, exc: Exception, loop, url: str) -> EmbeddedResponse:
+    """The response FastAPI would have sent for an exception raised by an endpoint."""
+    from pydantic import ValidationError
+    from starlette.exceptions import HTTPException
+
+    if isinstance(exc, HTTPException):
+        return EmbeddedResponse(exc.status_code, {"detail": exc.detail}, exc.headers, url)
+    if isinstance(exc, ValidationError):
+        return EmbeddedResponse(422, {"detail": exc.errors(include_url=False)}, url=url)
+    handler = next((app.exception_handlers[c] for c in type(exc).__mro__ if c in app.exception_handlers), None)
+    if handler is not None:
+        response = handler(None, exc)
+        if inspect.isawaitable(response):
+            response = asyncio.run_coroutine_threadsafe(response, loop).result()
+        return EmbeddedResponse(response.status_code, json.loads(response.body), dict(response.headers), url)
+    logger.exception("Embedded backend call failed: %s", url)
+    return EmbeddedResponse(500, {"detail": f"Internal Server Error: {exc}"}, url=url)
+
+
+def _response(result, status_code: int, url: str) -> EmbeddedResponse:
+    """An endpoint's return value as a response; only endpoints returning a Response object get decoded."""
+    from starlette.responses import Response
+
+    if not isinstance(result, Response):
+        return EmbeddedResponse(status_code, result, url=url)
+    if not hasattr(result, "body"):  # StreamingResponse
+        return EmbeddedResponse(501, {"detail": "Streaming endpoints aren't available in embedded mode"}, url=url)
+    return EmbeddedResponse(result.status_code, json.loads(result.body), dict(result.headers), url)
+
+
+def request(method: str, url: str, params=None, json=None, **_ignored) -> EmbeddedResponse:
+    """Call the endpoint behind `method` + the path of `url` in-process (timeouts and headers don't apply)."""
+    loop = _event_loop()
+    app = backend_module().app
+    route, path_params = _match(app, method.upper(), urlsplit(url).path)
+    if route is None:
+        return EmbeddedResponse(404, {"detail": "Not Found"}, url=url)
+    try:
+        kwargs = _arguments(route.endpoint, path_params, _query(params), json)
+        if inspect.iscoroutinefunction(route.endpoint):
+            result = asyncio.run_coroutine_threadsafe(route.endpoint(**kwargs), loop).result()
+        else:
+            result = route.endpoint(**kwargs)
+    except Exception as e:
+        return _error_response(app, e, loop, url)
+    return _response(result, route.status_code or 200, url)
+
+
+def data_version() -> str | None:
+    """The embedded backend's data version, straight from its refreshers."""
+    _event_loop()
+    return backend_module()._data_version()
+
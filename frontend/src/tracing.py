@@ -0,0 +1,125 @@
+"""OpenTelemetry tracing for the Streamlit app — off unless an exporter is configured.
+
+Same OTEL_* variables as the backend (see backend/src/tracing.py);
+OTEL_SERVICE_NAME defaults to "release-notes-frontend". Each script run
+is one root span, and every backend call made during it is a child span
+whose W3C `traceparent` header is sent along, so the backend's spans
+(BigQuery jobs, pandas conversions, LLM calls) land in the same trace.
+With BACKEND_MODE=embedded the calls go to src/embedded.py instead.
+"""
+
+import json
+import logging
+import os
+from urllib.parse import urlsplit
+
+import requests
+import streamlit as st
+
+from src import embedded
+from src.embedded import EMBEDDED
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # tracing is optional
+    propagate = trace = None
+
+logger = logging.getLogger(__name__)
+
+_SCRIPT_SPAN_KEY = "_otel_script_span"
+_tracer = None
+
+
+def init_tracing(default_service_name: str) -> bool:
+    """Install a tracer provider once per process. Returns whether tracing is on."""
+    global _tracer
+    if _tracer is not None:
+        return True
+    exporter = os.environ.get("OTEL_TRACES_EXPORTER", "none").lower()
+    path = os.environ.get("OTEL_TRACES_FILE")
+    if trace is None or (exporter == "none" and not path):
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("OTEL_TRACES_EXPORTER is set but opentelemetry-sdk isn't installed; tracing is off")
+        return False
+
+    service_name = os.environ.get("OTEL_SERVICE_NAME", default_service_name)
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    elif exporter == "console":
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    if path:
+        out = open(path, "a", buffering=1)
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                ConsoleSpanExporter(out=out, formatter=lambda s: json.dumps(json.loads(s.to_json())) + "\n")
+            )
+        )
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(service_name)
+    return True
+
+
+def start_script_span() -> None:
+    """Open this script run's root span. Call at the top of main.py."""
+    if _tracer is None:
+        return
+    # A run cut short by st.rerun() never reaches end_script_span(); close it now.
+    previous = st.session_state.get(_SCRIPT_SPAN_KEY)
+    if previous is not None:
+        previous.set_attribute("streamlit.interrupted", True)
+        previous.end()
+    st.session_state[_SCRIPT_SPAN_KEY] = _tracer.start_span("streamlit.script_run")
+
+
+def end_script_span() -> None:
+    """Close this script run's root span. Call at the end of main.py and before st.stop()."""
+    if _tracer is None:
+        return
+    current = st.session_state.pop(_SCRIPT_SPAN_KEY, None)
+    if current is not None:
+        current.end()
+
+
+def _send(method: str, url: str, **kwargs) -> requests.Response:
+    if EMBEDDED:
+        return embedded.request(method, url, **kwargs)
+    return requests.request(method, url, **kwargs)
+
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    if _tracer is None:
+        return _send(method, url, **kwargs)
+    script_span = st.session_state.get(_SCRIPT_SPAN_KEY)
+    parent = trace.set_span_in_context(script_span) if script_span is not None else None
+    attributes = {"http.request.method": method, "url.full": url}
+    with _tracer.start_as_current_span(
+        f"{method} {urlsplit(url).path}", context=parent, kind=trace.SpanKind.CLIENT, attributes=attributes
+    ) as current:
+        headers = dict(kwargs.pop("headers", None) or {})
+        propagate.inject(headers)
+        response = _send(method, url, headers=headers, **kwargs)
+        current.set_attribute("http.response.status_code", response.status_code)
+        return response
+
+
+def backend_get(url: str, **kwargs) -> requests.Response:
+    """requests.get() that carries the current trace to the backend."""
+    return _request("GET", url, **kwargs)
+
+
+def backend_post(url: str, **kwargs) -> requests.Response:
+    """requests.post() that carries the current trace to the backend."""
+    return _request("POST", url, **kwargs)
+
+
+def backend_delete(url: str, **kwargs) -> requests.Response:
+    """requests.delete() that carries the current trace to the backend."""
+    return _request("DELETE", url, **kwargs)
@@ -72,3 +72,27 @@ def format_description(description: str | None) -> str:
                     unsafe_allow_html=True,
                 )
     return ""
+
+
+def render_description(note) -> None:
+    """Place the backend's pre-rendered description fragments for one note.
+
+    Falls back to format_description() for rows that don't carry render
+    artifacts (e.g. an older backend).
+    """
+    tracks = note.get("tracks")
+    html = note.get("description_html")
+    if not isinstance(html, str) or not isinstance(tracks, list):
+        format_description(note.get("description"))
+        return
+    if html:
+        st.markdown(f'<div class="note-description">{html}</div>', unsafe_allow_html=True)
+    if not tracks:
+        return
+    tabs = st.tabs([t["name"] for t in tracks])
+    for tab, track in zip(tabs, tracks):
+        with tab:
+            st.markdown(
+                f'<div class="note-description">{track["html"]}</div>',
+                unsafe_allow_html=True,
+            )
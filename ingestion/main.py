@@ -3,29 +3,52 @@ Entrypoint for the release-notes ingestion Cloud Run Job.
 
 For every platform in PLATFORMS (default "GCP"), builds the configured
 provider (src/providers/), pulls rows published since that platform's own
-watermark, and merges them into one shared BigQuery table in your own
-project, idempotently. Designed to run once a day via Cloud Scheduler ->
-Cloud Run Jobs. See README.md for deployment steps and for how to add a
-new platform.
+watermark, and merges them into one shared destination table, idempotently
+— a BigQuery table in your own project by default, or local Parquet files
+(SINK, see src/sinks/). Platforms run concurrently (INGEST_MAX_WORKERS) and
+in isolation: one platform failing doesn't stop the others, it just fails
+the run once they've all finished. Designed to run once a day via Cloud
+Scheduler -> Cloud Run Jobs. See README.md for deployment steps and for
+how to add a new platform.
 """
 
 import datetime as dt
 import logging
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 from src import config
 from src.bq_client import init_bq_client
-from src.loader import ensure_dataset_and_table, get_watermark, merge_new_rows
+from src.notify import notify_backend
 from src.providers import build_provider
+from src.sinks import build_sink
+from src.sinks.base import BaseSink
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
 
-def _ingest_platform(client, platform: str) -> tuple[int, int]:
+@dataclass
+class PlatformResult:
+    """Outcome of one platform's ingestion, reported in the run summary."""
+
+    platform: str
+    fetched: int = 0
+    inserted: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def _ingest_platform(client, sink: BaseSink, platform: str) -> tuple[int, int]:
     provider = build_provider(platform, client)
+    state = sink.load_state(platform, provider.source_id)
+    provider.state = state
 
-    watermark = get_watermark(client, platform)
+    # The state table's watermark saves a MAX(published_at) scan; the scan
+    # is only needed the first time a source runs with state tracking.
+    watermark = state.watermark or sink.get_watermark(platform)
     if watermark is None:
         since = dt.date.today() - dt.timedelta(days=config.INITIAL_BACKFILL_DAYS)
         logger.info("[%s] no rows yet for this platform — backfilling from %s", platform, since)
@@ -39,43 +62,83 @@ def _ingest_platform(client, platform: str) -> tuple[int, int]:
             config.WATERMARK_OVERLAP_DAYS,
         )
 
-    df = provider.fetch_new_rows(since)
-    inserted = merge_new_rows(client, df, platform=provider.platform, source=provider.source_id)
+    chunks = provider.iter_new_rows(since, config.LOAD_CHUNK_ROWS)
+    result = sink.merge(chunks, platform=provider.platform, source=provider.source_id, since=since)
     logger.info(
-        "[%s] fetched=%d inserted=%d skipped_as_duplicate=%d",
+        "[%s] fetched=%d inserted=%d already_loaded=%d skipped_as_duplicate=%d",
         platform,
-        len(df),
-        inserted,
-        len(df) - inserted,
+        result.fetched,
+        result.inserted,
+        result.already_loaded,
+        result.fetched - result.inserted,
+    )
+
+    state.watermark = max(
+        (d for d in (watermark, result.latest_published_at) if d is not None), default=None
     )
-    return len(df), inserted
+    state.last_row_count = result.fetched
+    state.last_run_at = dt.datetime.now(dt.timezone.utc)
+    sink.save_state(state)
+    return result.fetched, result.inserted
+
+
+def _run_platform(client, sink: BaseSink, platform: str) -> PlatformResult:
+    """Ingest one platform, capturing (not raising) its failure so the others keep going."""
+    result = PlatformResult(platform)
+    started = time.monotonic()
+    try:
+        result.fetched, result.inserted = _ingest_platform(client, sink, platform)
+    except Exception as e:
+        logger.exception("[%s] ingestion failed", platform)
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.monotonic() - started
+    return result
 
 
 def run() -> int:
     config.validate()
+    client = init_bq_client() if config.needs_bigquery_client() else None
+    sink = build_sink(config.SINK, client)
     logger.info(
-        "Starting ingestion run: platforms=%s dest=%s",
+        "Starting ingestion run: platforms=%s workers=%d sink=%s dest=%s",
         config.PLATFORMS,
-        config.dest_table_fqn(),
+        config.INGEST_MAX_WORKERS,
+        sink.name,
+        sink.describe(),
     )
+    sink.ensure()
 
-    client = init_bq_client()
-    ensure_dataset_and_table(client)
+    # bigquery.Client is safe to share across threads; each platform's
+    # fetch + merge is I/O-bound (HTTP / BigQuery job waits), so threads
+    # are enough to overlap them.
+    workers = min(config.INGEST_MAX_WORKERS, len(config.PLATFORMS))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+        results = list(pool.map(lambda p: _run_platform(client, sink, p), config.PLATFORMS))
 
-    total_fetched = 0
-    total_inserted = 0
-    for platform in config.PLATFORMS:
-        fetched, inserted = _ingest_platform(client, platform)
-        total_fetched += fetched
-        total_inserted += inserted
+    for r in results:
+        logger.info(
+            "[%s] %s fetched=%d inserted=%d in %.1fs%s",
+            r.platform,
+            "FAILED" if r.error else "ok",
+            r.fetched,
+            r.inserted,
+            r.seconds,
+            f" error={r.error}" if r.error else "",
+        )
 
+    failed = [r.platform for r in results if r.error]
     logger.info(
-        "Done. platforms=%s total_fetched=%d total_inserted=%d",
+        "Done. platforms=%s total_fetched=%d total_inserted=%d failed=%s",
         config.PLATFORMS,
-        total_fetched,
-        total_inserted,
+        sum(r.fetched for r in results),
+        sum(r.inserted for r in results),
+        failed or "none",
     )
-    return 0
+    notify_backend({r.platform: r.inserted for r in results})
+    # Non-zero exit marks the Cloud Run Job execution failed, so its
+    # --max-retries kick in. Re-running the platforms that did succeed is
+    # harmless — loads are idempotent.
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
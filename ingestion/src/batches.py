@@ -0,0 +1,94 @@
+"""
+Sink-agnostic batch preparation shared by every destination (src/sinks/).
+
+Turns provider rows into destination rows, one bounded chunk at a time:
+tags them with platform/source/ingested_at, computes the row_hash dedup
+key, drops duplicates and runs the normalization stage (src/normalize.py).
+"""
+
+import datetime as dt
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from src.normalize import normalize_descriptions
+
+HASH_FIELDS = ("platform", "product_name", "release_note_type", "published_at", "description")
+
+
+@dataclass
+class LoadResult:
+    """Row counts for one platform's load, for the run summary."""
+
+    fetched: int = 0
+    already_loaded: int = 0
+    staged: int = 0
+    inserted: int = 0
+    latest_published_at: dt.date | None = None
+
+
+def row_hash(row: pd.Series) -> str:
+    """Reference per-row implementation of the dedup key; row_hashes() must match it."""
+    key = "|".join(str(row.get(field, "")) for field in HASH_FIELDS)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def row_hashes(df: pd.DataFrame) -> list[str]:
+    """Columnar row_hash(): builds every key with vectorized string concat, then hashes.
+
+    Produces byte-identical digests to row_hash() — each field goes
+    through str() exactly as the per-row version does (None -> "None",
+    NaN -> "nan", dates -> ISO format).
+    """
+    keys = None
+    for field in HASH_FIELDS:
+        col = df[field].map(str) if field in df.columns else pd.Series("", index=df.index)
+        keys = col if keys is None else keys + "|" + col
+    return [hashlib.sha256(k.encode("utf-8")).hexdigest() for k in keys]
+
+
+def iter_chunks(rows: pd.DataFrame | Iterable[pd.DataFrame], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield `rows` as DataFrames of at most `chunk_rows` rows."""
+    frames = [rows] if isinstance(rows, pd.DataFrame) else rows
+    for frame in frames:
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start : start + chunk_rows]
+
+
+def prepare_chunk(
+    chunk: pd.DataFrame,
+    platform: str,
+    source: str,
+    ingested_at: pd.Timestamp,
+    seen_hashes: set[str],
+    existing_hashes: set[str],
+) -> tuple[pd.DataFrame, int]:
+    """Tag, hash, dedupe and normalize one chunk.
+
+    Drops rows whose hash is in `seen_hashes` (earlier chunks, plus the
+    pre-filled `existing_hashes` already in the destination) and returns
+    the remaining rows with how many were dropped as already loaded.
+    """
+    chunk = chunk.copy()
+    chunk["published_at"] = pd.to_datetime(chunk["published_at"]).dt.date
+    chunk["platform"] = platform
+    chunk["row_hash"] = row_hashes(chunk)
+    chunk = chunk.drop_duplicates(subset="row_hash")
+    already_loaded = int(chunk["row_hash"].isin(existing_hashes).sum()) if existing_hashes else 0
+    chunk = chunk[~chunk["row_hash"].isin(seen_hashes)].copy()
+    seen_hashes.update(chunk["row_hash"])
+    chunk["source"] = source
+    chunk["ingested_at"] = ingested_at
+    return normalize_descriptions(chunk), already_loaded
+
+
+def latest_published_at(chunk: pd.DataFrame, current: dt.date | None) -> dt.date | None:
+    """Return the later of `current` and the newest published_at in `chunk`."""
+    if chunk.empty:
+        return current
+    newest = pd.to_datetime(chunk["published_at"]).max()
+    if pd.isna(newest):
+        return current
+    return newest.date() if current is None else max(current, newest.date())
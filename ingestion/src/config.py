@@ -16,20 +16,32 @@ def _env_list(name: str, default: str) -> list[str]:
 # name must have a factory registered in src/providers/__init__.py.
 PLATFORMS = _env_list("PLATFORMS", "GCP")
 
+# How many platforms to fetch + merge concurrently.
+INGEST_MAX_WORKERS = int(_env("INGEST_MAX_WORKERS", "4"))
+
 # --- GCP provider config (src/providers/gcp.py) ---
 GCP_SOURCE_MODE = (_env("GCP_SOURCE_MODE", "bigquery") or "bigquery").strip().lower()
 GCP_SOURCE_PROJECT_ID = _env("GCP_SOURCE_PROJECT_ID", "bigquery-public-data")
 GCP_SOURCE_DATASET_ID = _env("GCP_SOURCE_DATASET_ID", "google_cloud_release_notes")
 GCP_SOURCE_TABLE_ID = _env("GCP_SOURCE_TABLE_ID", "release_notes")
 GCP_RSS_FEED_URL = _env("GCP_RSS_FEED_URL", "https://cloud.google.com/feeds/gcp-release-notes.xml")
+# "streaming" (incremental, stops at the watermark) or "feedparser" (whole document).
+GCP_RSS_PARSER = (_env("GCP_RSS_PARSER", "streaming") or "streaming").strip().lower()
 
-# --- Destination — your own project. Shared by every platform: one table,
-# discriminated by the `platform` column. ---
+# --- Destination. Shared by every platform: one table, discriminated by
+# the `platform` column. SINK picks where it lives (src/sinks/):
+# "bigquery" (your own project) or "parquet" (local files under PARQUET_ROOT). ---
+SINK = (_env("SINK", "bigquery") or "bigquery").strip().lower()
+PARQUET_ROOT = _env("PARQUET_ROOT", "lake")
 DEST_PROJECT_ID = _env("DEST_PROJECT_ID") or _env("PROJECT_ID")
 DEST_DATASET_ID = _env("DEST_DATASET_ID", "cloud_release_notes")
 DEST_TABLE_ID = _env("DEST_TABLE_ID", "release_notes")
 DEST_LOCATION = _env("DEST_LOCATION", "US")
 
+# Per-source cursors (watermark, ETag/Last-Modified, last row count) —
+# see src/state.py. Lives in DEST_DATASET_ID next to the destination table.
+STATE_TABLE_ID = _env("STATE_TABLE_ID", "ingestion_state")
+
 # Safety overlap so a watermark-based incremental pull doesn't miss notes
 # that get backfilled/corrected a few days after their published_at date.
 # Safe to keep even if it re-fetches a few days of rows every run: the
@@ -42,15 +54,45 @@ WATERMARK_OVERLAP_DAYS = int(_env("WATERMARK_OVERLAP_DAYS", "3"))
 # feeds only carry whatever the publisher currently keeps in them.
 INITIAL_BACKFILL_DAYS = int(_env("INITIAL_BACKFILL_DAYS", "730"))
 
+# Rows per staging load. The loader hashes, normalizes and loads one chunk
+# at a time (and providers that can stream hand it chunks of this size),
+# so this bounds peak memory regardless of how large a backfill is.
+LOAD_CHUNK_ROWS = int(_env("LOAD_CHUNK_ROWS", "5000"))
+
+# Optional: the backend's /api/changes/notify URL, POSTed after a run that
+# inserted rows so the backend refreshes immediately (src/notify.py), and
+# the shared secret it expects (the backend's CHANGES_NOTIFY_TOKEN).
+BACKEND_NOTIFY_URL = _env("BACKEND_NOTIFY_URL", "")
+BACKEND_NOTIFY_TOKEN = _env("BACKEND_NOTIFY_TOKEN", "")
+
 
 def dest_table_fqn() -> str:
     return f"{DEST_PROJECT_ID}.{DEST_DATASET_ID}.{DEST_TABLE_ID}"
 
 
+def state_table_fqn() -> str:
+    return f"{DEST_PROJECT_ID}.{DEST_DATASET_ID}.{STATE_TABLE_ID}"
+
+
+def needs_bigquery_client() -> bool:
+    """Whether this run talks to BigQuery at all (as sink or as the GCP source)."""
+    return SINK == "bigquery" or ("GCP" in PLATFORMS and GCP_SOURCE_MODE == "bigquery")
+
+
 def validate() -> None:
-    if not DEST_PROJECT_ID:
+    if SINK not in ("bigquery", "parquet"):
+        raise ValueError(f"SINK must be 'bigquery' or 'parquet', got {SINK!r}")
+    if needs_bigquery_client() and not DEST_PROJECT_ID:
         raise ValueError("Missing required env var: DEST_PROJECT_ID (or PROJECT_ID)")
     if not PLATFORMS:
         raise ValueError("PLATFORMS must list at least one platform, e.g. PLATFORMS=GCP")
+    if INGEST_MAX_WORKERS < 1:
+        raise ValueError(f"INGEST_MAX_WORKERS must be >= 1, got {INGEST_MAX_WORKERS}")
+    if LOAD_CHUNK_ROWS < 1:
+        raise ValueError(f"LOAD_CHUNK_ROWS must be >= 1, got {LOAD_CHUNK_ROWS}")
     if GCP_SOURCE_MODE not in ("bigquery", "rss"):
         raise ValueError(f"GCP_SOURCE_MODE must be 'bigquery' or 'rss', got {GCP_SOURCE_MODE!r}")
+    if GCP_RSS_PARSER not in ("streaming", "feedparser"):
+        raise ValueError(
+            f"GCP_RSS_PARSER must be 'streaming' or 'feedparser', got {GCP_RSS_PARSER!r}"
+        )
@@ -1,15 +1,16 @@
 """Create-if-needed destination table + idempotent incremental load via MERGE."""
 
 import datetime as dt
-import hashlib
 import logging
 import uuid
+from typing import Iterable
 
 import pandas as pd
 from google.api_core.exceptions import NotFound
 from google.cloud import bigquery
 
 from src import config
+from src.batches import LoadResult, iter_chunks, latest_published_at, prepare_chunk
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,21 @@ _SCHEMA = [
     bigquery.SchemaField("product_version_name", "STRING"),
     bigquery.SchemaField("source", "STRING"),
     bigquery.SchemaField("ingested_at", "TIMESTAMP"),
+    # Derived by src/normalize.py at load time.
+    bigquery.SchemaField("description_text", "STRING"),
+    bigquery.SchemaField("description_html_clean", "STRING"),
+    bigquery.SchemaField(
+        "tracks",
+        "RECORD",
+        mode="REPEATED",
+        fields=[
+            bigquery.SchemaField("name", "STRING"),
+            bigquery.SchemaField("html", "STRING"),
+        ],
+    ),
+    bigquery.SchemaField("word_count", "INT64"),
 ]
+_COLUMNS = [field.name for field in _SCHEMA]
 
 
 def ensure_dataset_and_table(client: bigquery.Client) -> None:
@@ -38,13 +53,27 @@ def ensure_dataset_and_table(client: bigquery.Client) -> None:
 
     table_ref = dataset_ref.table(config.DEST_TABLE_ID)
     try:
-        client.get_table(table_ref)
+        table = client.get_table(table_ref)
     except NotFound:
         table = bigquery.Table(table_ref, schema=_SCHEMA)
         table.time_partitioning = bigquery.TimePartitioning(field="published_at")
         table.clustering_fields = ["platform", "product_name", "release_note_type"]
         client.create_table(table)
         logger.info("Created table %s", config.dest_table_fqn())
+        return
+
+    # Tables created before a column was added to _SCHEMA get it appended
+    # (additive schema change — existing rows read it as NULL).
+    existing = {field.name for field in table.schema}
+    missing = [field for field in _SCHEMA if field.name not in existing]
+    if missing:
+        table.schema = list(table.schema) + missing
+        client.update_table(table, ["schema"])
+        logger.info(
+            "Added column(s) %s to %s",
+            ", ".join(field.name for field in missing),
+            config.dest_table_fqn(),
+        )
 
 
 def get_watermark(client: bigquery.Client, platform: str) -> dt.date | None:
@@ -61,58 +90,129 @@ def get_watermark(client: bigquery.Client, platform: str) -> dt.date | None:
     return rows[0]["max_date"] if rows else None
 
 
-def _row_hash(row: pd.Series) -> str:
-    key = "|".join(
-        str(row.get(field, ""))
-        for field in ("platform", "product_name", "release_note_type", "published_at", "description")
+def fetch_existing_hashes(client: bigquery.Client, platform: str, since: dt.date) -> set[str]:
+    """Return the row_hash values already stored for `platform` with published_at >= `since`.
+
+    Filters on the partitioning column (published_at) and the leading
+    clustering column (platform), so this only scans the overlap window's
+    partitions — a few days of one platform's rows on a normal run.
+    """
+    query = f"""
+    SELECT row_hash
+    FROM `{config.dest_table_fqn()}`
+    WHERE published_at >= @since AND platform = @platform
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("since", "DATE", since),
+            bigquery.ScalarQueryParameter("platform", "STRING", platform),
+        ]
     )
-    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return {row["row_hash"] for row in client.query(query, job_config=job_config).result()}
 
 
-def merge_new_rows(client: bigquery.Client, df: pd.DataFrame, platform: str, source: str) -> int:
-    """Load `df` into a staging table, then MERGE new rows into the destination.
+def _create_staging_table(client: bigquery.Client) -> str:
+    staging_table_id = f"{config.dest_table_fqn()}_staging_{uuid.uuid4().hex[:8]}"
+    table = bigquery.Table(staging_table_id, schema=_SCHEMA)
+    # Safety net only — the finally block below deletes it on every path
+    # the process survives.
+    table.expires = dt.datetime.now(dt.timezone.utc) + dt.timedelta(hours=1)
+    client.create_table(table)
+    return staging_table_id
+
+
+def merge_new_rows(
+    client: bigquery.Client,
+    rows: pd.DataFrame | Iterable[pd.DataFrame],
+    platform: str,
+    source: str,
+    since: dt.date | None = None,
+) -> LoadResult:
+    """Stream `rows` into a staging table in chunks, then MERGE new rows into the destination.
+
+    When `since` is given (the start of the window the provider was asked
+    for), the row_hash values already stored for that window are fetched
+    with the first non-empty chunk and diffed locally, so only genuinely
+    new rows are staged — and when there are none, no staging table, load
+    job or MERGE is created at all. A provider that yields nothing (a 304,
+    an empty window) costs no scan of the destination either. The MERGE
+    still dedupes on row_hash, so a row that slips past the pre-filter
+    (e.g. a provider returning something older than `since`) is never
+    inserted twice.
+
+    `rows` is either one DataFrame or an iterable of DataFrames (e.g. a
+    provider's iter_new_rows()). Either way it's staged LOAD_CHUNK_ROWS
+    rows at a time, so peak memory is bounded by the chunk size, not by
+    the size of the backfill.
 
     Dedup key is a content hash (platform + product_name + type +
     published_at + description), not an identity from the source, since
     none of the upstream sources expose a stable row id. This makes
-    re-running the job over an overlapping date range safe.
+    re-running the job over an overlapping date range safe. Rows go
+    through the normalization stage (src/normalize.py) after dedup, so
+    the derived description columns are computed once per new note.
     """
-    if df.empty:
-        return 0
-
-    df = df.copy()
-    df["published_at"] = pd.to_datetime(df["published_at"]).dt.date
-    df["platform"] = platform
-    df["row_hash"] = df.apply(_row_hash, axis=1)
-    df["source"] = source
-    df["ingested_at"] = pd.Timestamp.now(tz="UTC")
-    df = df.drop_duplicates(subset="row_hash")
-
-    staging_table_id = f"{config.dest_table_fqn()}_staging_{uuid.uuid4().hex[:8]}"
-    job_config = bigquery.LoadJobConfig(schema=_SCHEMA, write_disposition="WRITE_TRUNCATE")
-    client.load_table_from_dataframe(df, staging_table_id, job_config=job_config).result()
+    result = LoadResult()
+    ingested_at = pd.Timestamp.now(tz="UTC")
+    existing_hashes: set[str] | None = None if since else set()
+    seen_hashes: set[str] = set()
+    staging_table_id = None
+    job_config = bigquery.LoadJobConfig(schema=_SCHEMA, write_disposition="WRITE_APPEND")
 
     try:
+        for chunk in iter_chunks(rows, config.LOAD_CHUNK_ROWS):
+            result.fetched += len(chunk)
+            result.latest_published_at = latest_published_at(chunk, result.latest_published_at)
+            if existing_hashes is None:
+                existing_hashes = fetch_existing_hashes(client, platform, since)
+                seen_hashes |= existing_hashes
+            prepared, already_loaded = prepare_chunk(
+                chunk, platform, source, ingested_at, seen_hashes, existing_hashes
+            )
+            result.already_loaded += already_loaded
+            if prepared.empty:
+                continue
+            if staging_table_id is None:
+                staging_table_id = _create_staging_table(client)
+            client.load_table_from_dataframe(
+                prepared[_COLUMNS], staging_table_id, job_config=job_config
+            ).result()
+            result.staged += len(prepared)
+
+        if staging_table_id is None:
+            logger.info(
+                "[%s] nothing new (%d fetched, %d already loaded) — skipping staging and MERGE",
+                platform,
+                result.fetched,
+                result.already_loaded,
+            )
+            return result
+
+        # ingested_at is stamped by the MERGE itself, not when this run
+        # started: readers pull new rows by ingested_at (the backend's note
+        # store), and with platforms merging concurrently a start-of-run
+        # stamp could land behind rows another platform already committed.
+        values = ["CURRENT_TIMESTAMP()" if c == "ingested_at" else f"S.{c}" for c in _COLUMNS]
         merge_query = f"""
         MERGE `{config.dest_table_fqn()}` T
         USING `{staging_table_id}` S
         ON T.row_hash = S.row_hash
         WHEN NOT MATCHED THEN
-          INSERT (row_hash, platform, description, release_note_type, published_at,
-                  product_name, product_version_name, source, ingested_at)
-          VALUES (S.row_hash, S.platform, S.description, S.release_note_type, S.published_at,
-                  S.product_name, S.product_version_name, S.source, S.ingested_at)
+          INSERT ({", ".join(_COLUMNS)})
+          VALUES ({", ".join(values)})
         """
         job = client.query(merge_query)
         job.result()
-        inserted = job.num_dml_affected_rows or 0
+        result.inserted = job.num_dml_affected_rows or 0
         logger.info(
-            "[%s] merged %d new row(s) into %s (staging batch had %d candidate rows)",
+            "[%s] merged %d new row(s) into %s (staging had %d candidate rows from %d fetched)",
             platform,
-            inserted,
+            result.inserted,
             config.dest_table_fqn(),
-            len(df),
+            result.staged,
+            result.fetched,
         )
-        return inserted
+        return result
     finally:
-        client.delete_table(staging_table_id, not_found_ok=True)
+        if staging_table_id is not None:
+            client.delete_table(staging_table_id, not_found_ok=True)
@@ -0,0 +1,60 @@
+"""Markup rules for note descriptions, shared with the backend.
+
+The normalization stage (src/normalize.py) applies them to every note at
+load time; the backend's src/render.py applies the same ones on the fly
+for tables without the normalized columns (e.g. the public dataset),
+importing this module as `ingestion.src.markup` — so both always agree.
+Keep it free of dependencies beyond the standard library and nh3.
+
+clean_html() is a real sanitizer, not a regex pass: after dropping the
+kramdown attributes it runs nh3 (Rust's ammonia) with its default
+allowlist, so only known-safe tags and attributes survive, script and
+style blocks go with their content, URLs are limited to safe schemes and
+links get rel="noopener noreferrer". Its output can go into the page as
+HTML.
+"""
+
+import re
+
+import nh3
+
+TAG_RE = re.compile(r"<[^>]+>")
+EXTERNAL_ATTR_RE = re.compile(r"\{:\s*\.external[^}]*\}")
+SCRIPT_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+TRACK_RE = re.compile(r"\* \{([^}]+)\}\{: track-name='([^']+)'\}")
+
+
+def strip_html(raw: str | None) -> str:
+    return TAG_RE.sub("", raw or "").strip()
+
+
+def sanitize_html(html: str) -> str:
+    """`html` through nh3's allowlist; idempotent, so safe to apply again on read."""
+    return nh3.clean(html)
+
+
+def clean_html(raw: str | None) -> str:
+    """Drop kramdown `{: .external ...}` attributes, then sanitize (see the module docstring)."""
+    return sanitize_html(EXTERNAL_ATTR_RE.sub("", raw or ""))
+
+
+def remove_blocks(raw: str | None) -> str:
+    """Drop kramdown attributes and script/style blocks — for deriving text, not HTML to show."""
+    return SCRIPT_RE.sub("", EXTERNAL_ATTR_RE.sub("", raw or ""))
+
+
+def plain_text(raw: str | None) -> str:
+    """Tag-free text: kramdown attributes, script/style blocks and tags removed (not escaped)."""
+    return strip_html(remove_blocks(raw))
+
+
+def split_tracks(html: str) -> tuple[str, list[dict]]:
+    """Split cleaned HTML into (intro, [{"name", "html"}, ...]) on track-name blocks."""
+    parts = TRACK_RE.split(html)
+    if len(parts) == 1:
+        return html.strip(), []
+    tracks = [
+        {"name": parts[i], "html": parts[i + 2].strip()}
+        for i in range(1, len(parts) - 2, 3)
+    ]
+    return parts[0].strip(), tracks
@@ -0,0 +1,42 @@
+"""
+Description normalization stage, run by the loader before the MERGE.
+
+Every consumer of the table used to clean note text at request time: the
+backend stripped tags for the LLM prompt, the frontend dropped kramdown
+`{: .external ...}` attributes and parsed `track-name` blocks on every
+rerun. This stage does it once per note at load time and writes the
+results as derived columns:
+
+  description_text        tag-free text (copy buttons, digests, prompts)
+  description_html_clean  sanitized HTML (nh3 allowlist) minus kramdown attributes
+  tracks                  ARRAY<STRUCT<name, html>> of track-name sections
+  word_count              whitespace-delimited word count of the text
+
+The cleaning rules live in src/markup.py, which backend/src/render.py
+imports too: it still renders rows on the fly for tables that don't carry
+these columns (e.g. the public dataset).
+"""
+
+import pandas as pd
+
+from src.markup import EXTERNAL_ATTR_RE, SCRIPT_RE, TAG_RE, clean_html, split_tracks
+
+NORMALIZED_COLUMNS = ["description_text", "description_html_clean", "tracks", "word_count"]
+
+
+def normalize_descriptions(df: pd.DataFrame) -> pd.DataFrame:
+    """Add NORMALIZED_COLUMNS to `df` (in place) from its `description` column."""
+    descriptions = df["description"].fillna("").astype(str)
+    text = (
+        descriptions.str.replace(EXTERNAL_ATTR_RE, "", regex=True)
+        .str.replace(SCRIPT_RE, "", regex=True)
+        .str.replace(TAG_RE, "", regex=True)
+        .str.strip()
+    )
+    html_clean = descriptions.map(clean_html)
+
+    df["description_text"] = text
+    df["description_html_clean"] = html_clean.str.strip()
+    df["tracks"] = [split_tracks(h)[1] if "track-name=" in h else [] for h in html_clean]
+    df["word_count"] = text.str.split().str.len().fillna(0).astype("int64")
+    return df
@@ -0,0 +1,49 @@
+"""Tell the backend that new rows landed, so it refreshes now.
+
+Without this the backend notices new data on its next refresh
+(NOTE_STORE_REFRESH_SECONDS, 5 minutes by default); with
+BACKEND_NOTIFY_URL set, a run that inserted anything POSTs to the
+backend's /api/changes/notify, which refreshes right away and pushes the
+new notes to /api/changes/stream subscribers.
+
+Best effort: the rows are already committed, so a failed notification is
+logged and never fails the run.
+"""
+
+import logging
+
+import requests
+
+from src import config
+
+logger = logging.getLogger(__name__)
+
+
+def _id_token(audience: str) -> str | None:
+    """An identity token for a backend behind Cloud Run IAM; None where none is available (e.g. locally)."""
+    try:
+        import google.auth.transport.requests
+        from google.oauth2 import id_token
+
+        return id_token.fetch_id_token(google.auth.transport.requests.Request(), audience)
+    except Exception:
+        return None
+
+
+def notify_backend(inserted: dict[str, int]) -> None:
+    """POST the per-platform inserted counts to BACKEND_NOTIFY_URL, if it's set and anything was inserted."""
+    url = config.BACKEND_NOTIFY_URL
+    if not url or not any(inserted.values()):
+        return
+    headers = {}
+    if config.BACKEND_NOTIFY_TOKEN:
+        headers["X-Notify-Token"] = config.BACKEND_NOTIFY_TOKEN
+    token = _id_token(url.split("/api/", 1)[0])
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    try:
+        resp = requests.post(url, json={"inserted": inserted}, headers=headers, timeout=10)
+        resp.raise_for_status()
+        logger.info("Notified backend of %d new rows: HTTP %d", sum(inserted.values()), resp.status_code)
+    except requests.RequestException as e:
+        logger.warning("Backend notification to %s failed: %s", url, e)
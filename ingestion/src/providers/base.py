@@ -2,9 +2,12 @@
 
 import datetime as dt
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 import pandas as pd
 
+from src.state import SourceState
+
 # Every provider must return a DataFrame with exactly these columns.
 # `platform` and `source` are added by the loader, not the provider —
 # a provider shouldn't need to know how it's tagged downstream.
@@ -32,7 +35,25 @@ class BaseProvider(ABC):
     #: source within the platform produced the row, e.g. "bigquery", "rss".
     source_id: str
 
+    #: This source's cursor from the ingestion state table, set by main.py
+    #: before fetching and persisted after a successful merge. Providers
+    #: that can make conditional requests read their validators (etag /
+    #: last_modified) from it, write the new ones back, and return no rows
+    #: when the source reports it hasn't changed.
+    state: SourceState | None = None
+
     @abstractmethod
     def fetch_new_rows(self, since: dt.date) -> pd.DataFrame:
         """Return rows (columns = ROW_COLUMNS) published on/after `since`."""
         raise NotImplementedError
+
+    def iter_new_rows(self, since: dt.date, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Yield the same rows as fetch_new_rows() in chunks of at most `chunk_rows`.
+
+        The default just slices fetch_new_rows(). Override it when the
+        source can page natively, so a large backfill never has to be
+        held in memory at once.
+        """
+        df = self.fetch_new_rows(since)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start : start + chunk_rows]
@@ -0,0 +1,93 @@
+"""
+Incremental RSS 2.0 / Atom parser for newest-first release-notes feeds.
+
+feedparser needs the whole document in memory and parses every entry
+before the caller can filter by date. This parser is fed the response
+body chunk by chunk (XMLPullParser), hands back one entry at a time, and
+drops each entry's element as soon as it's been read — so memory stays
+bounded by a single entry, and the caller can stop reading the moment
+entries fall before its watermark.
+
+Each entry comes back as a plain dict with the subset of fields
+GCPRssSource reads from feedparser entries:
+
+  title       text of <title>
+  summary     <summary> / <content> (Atom) or <description> (RSS), raw HTML
+  published   date of <published>/<updated> (Atom) or <pubDate>/<dc:date>
+              (RSS), converted to UTC first like feedparser's *_parsed
+"""
+
+import datetime as dt
+import email.utils
+import logging
+from typing import Iterable, Iterator
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_TAGS = {"item", "entry"}
+# First match wins, mirroring feedparser's published_parsed -> updated_parsed fallback.
+_DATE_TAGS = ("published", "pubDate", "issued", "updated", "date")
+_SUMMARY_TAGS = ("summary", "description", "content", "encoded")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(raw: str | None) -> dt.date | None:
+    if not raw:
+        return None
+    raw = raw.strip()
+    try:
+        parsed = dt.datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(dt.timezone.utc)
+    return parsed.date()
+
+
+def _entry_to_dict(elem: Element) -> dict:
+    fields: dict[str, str] = {}
+    for child in elem:
+        name = _local(child.tag)
+        if name not in fields:
+            # itertext() covers both escaped HTML (one text node) and
+            # inline XHTML content (child elements).
+            fields[name] = "".join(child.itertext())
+    published = next((d for d in map(_parse_date, map(fields.get, _DATE_TAGS)) if d), None)
+    summary = next((fields[t] for t in _SUMMARY_TAGS if fields.get(t)), "")
+    return {"title": fields.get("title", ""), "summary": summary, "published": published}
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """Yield entries from an RSS/Atom document delivered as byte chunks, in document order.
+
+    Stops early if the caller stops iterating — the remaining chunks are
+    never read.
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    open_elements: list[Element] = []
+    for chunk in chunks:
+        try:
+            parser.feed(chunk)
+            events = list(parser.read_events())
+        except ParseError:
+            logger.warning("feed XML is malformed past this point; stopping", exc_info=True)
+            return
+        for event, elem in events:
+            if event == "start":
+                open_elements.append(elem)
+                continue
+            open_elements.pop()
+            if _local(elem.tag) not in _ENTRY_TAGS:
+                continue
+            entry = _entry_to_dict(elem)
+            # Detach the finished entry so the tree never holds more than one.
+            if open_elements:
+                open_elements[-1].remove(elem)
+            yield entry
@@ -27,6 +27,7 @@ Two implementations of the same platform, selected by GCP_SOURCE_MODE:
 import datetime as dt
 import logging
 import re
+from typing import Iterable, Iterator
 
 import feedparser
 import pandas as pd
@@ -34,12 +35,14 @@ import requests
 from google.cloud import bigquery
 
 from src import config
-from src.providers.base import BaseProvider
+from src.providers.base import ROW_COLUMNS, BaseProvider
+from src.providers.feed_stream import iter_feed_entries
 
 logger = logging.getLogger(__name__)
 
 _TAG_RE = re.compile(r"<[^>]+>")
 _REQUEST_HEADERS = {"User-Agent": "gcp-release-notes-ingestion/1.0"}
+_STREAM_CHUNK_BYTES = 64 * 1024
 
 # Keyword -> release_note_type, checked in order against the entry text.
 # The RSS feed doesn't carry a structured type field, so this is a
@@ -63,11 +66,32 @@ class GCPBigQuerySource(BaseProvider):
     def __init__(self, client: bigquery.Client):
         self._client = client
 
-    def fetch_new_rows(self, since: dt.date) -> pd.DataFrame:
-        table_fqn = (
+    @staticmethod
+    def _table_fqn() -> str:
+        return (
             f"{config.GCP_SOURCE_PROJECT_ID}."
             f"{config.GCP_SOURCE_DATASET_ID}.{config.GCP_SOURCE_TABLE_ID}"
         )
+
+    def _source_unchanged(self) -> bool:
+        """Compare the source table's last-modified time with the one stored in `state`.
+
+        A metadata lookup (free, no query job) standing in for an HTTP
+        conditional request: if the table hasn't been modified since the
+        last successful run, there's nothing new to pull.
+        """
+        if self.state is None:
+            return False
+        modified = self._client.get_table(self._table_fqn()).modified
+        modified = modified.isoformat() if modified else None
+        if modified and modified == self.state.last_modified:
+            logger.info("[GCP/bigquery] source table unchanged since %s — skipping query", modified)
+            return True
+        self.state.last_modified = modified
+        return False
+
+    def _query_job(self, since: dt.date) -> bigquery.QueryJob:
+        table_fqn = self._table_fqn()
         query = f"""
         SELECT
             description,
@@ -82,13 +106,31 @@ class GCPBigQuerySource(BaseProvider):
         job_config = bigquery.QueryJobConfig(
             query_parameters=[bigquery.ScalarQueryParameter("since", "DATE", since)]
         )
-        df = self._client.query(query, job_config=job_config).to_dataframe()
+        return self._client.query(query, job_config=job_config)
+
+    def fetch_new_rows(self, since: dt.date) -> pd.DataFrame:
+        if self._source_unchanged():
+            return pd.DataFrame(columns=ROW_COLUMNS)
+        df = self._query_job(since).to_dataframe()
         logger.info("[GCP/bigquery] fetched %d rows published on/after %s", len(df), since)
         return df
 
+    def iter_new_rows(self, since: dt.date, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        if self._source_unchanged():
+            return
+        rows = self._query_job(since).result(page_size=chunk_rows)
+        logger.info("[GCP/bigquery] streaming %d rows published on/after %s", rows.total_rows, since)
+        yield from rows.to_dataframe_iterable()
+
 
 class GCPRssSource(BaseProvider):
-    """Best-effort parser for Google's release-notes RSS feed. See module docstring."""
+    """Best-effort parser for Google's release-notes RSS feed. See module docstring.
+
+    Parsed with the streaming parser in feed_stream.py by default, which
+    stops reading the response as soon as entries fall before `since`
+    (the feed is newest-first). GCP_RSS_PARSER=feedparser switches back
+    to parsing the whole document with feedparser.
+    """
 
     platform = "GCP"
     source_id = "rss"
@@ -112,12 +154,9 @@ class GCPRssSource(BaseProvider):
             return None
         return dt.date(parsed.tm_year, parsed.tm_mon, parsed.tm_mday)
 
-    def _parse_entry(self, entry) -> dict | None:
-        published_at = self._entry_published(entry)
-        if published_at is None:
-            return None
-        description = self._strip_html(entry.get("summary") or entry.get("description") or "")
-        title = self._strip_html(entry.get("title") or "")
+    def _build_row(self, title: str, summary: str, published_at: dt.date) -> dict:
+        description = self._strip_html(summary)
+        title = self._strip_html(title)
         return {
             "description": description or title,
             "release_note_type": self._infer_type(f"{title} {description}"),
@@ -128,25 +167,82 @@ class GCPRssSource(BaseProvider):
             "product_version_name": None,
         }
 
-    def fetch_new_rows(self, since: dt.date) -> pd.DataFrame:
-        resp = requests.get(config.GCP_RSS_FEED_URL, timeout=30, headers=_REQUEST_HEADERS)
-        resp.raise_for_status()
-        parsed = feedparser.parse(resp.content)
+    def _parse_entry(self, entry) -> dict | None:
+        published_at = self._entry_published(entry)
+        if published_at is None:
+            return None
+        summary = entry.get("summary") or entry.get("description") or ""
+        return self._build_row(entry.get("title") or "", summary, published_at)
+
+    def rows_from_feedparser(self, content: bytes, since: dt.date) -> tuple[list[dict], int]:
+        """Parse the whole document with feedparser; returns (rows on/after `since`, entries read)."""
+        parsed = feedparser.parse(content)
         if parsed.bozo:
             logger.warning("[GCP/rss] feed parsed with warnings: %s", parsed.bozo_exception)
-
         rows = [
             row
             for row in (self._parse_entry(entry) for entry in parsed.entries)
             if row and row["published_at"] >= since
         ]
+        return rows, len(parsed.entries)
+
+    def rows_from_stream(self, chunks: Iterable[bytes], since: dt.date) -> tuple[list[dict], int]:
+        """Parse incrementally, stopping at the first entry older than `since`.
 
-        df = pd.DataFrame(rows)
+        Returns (rows on/after `since`, entries read). Relies on the feed
+        being newest-first; entries without a date are skipped, as in the
+        feedparser path.
+        """
+        rows = []
+        read = 0
+        for entry in iter_feed_entries(chunks):
+            read += 1
+            published_at = entry["published"]
+            if published_at is None:
+                continue
+            if published_at < since:
+                break
+            rows.append(self._build_row(entry["title"], entry["summary"], published_at))
+        return rows, read
+
+    def _conditional_headers(self) -> dict:
+        headers = dict(_REQUEST_HEADERS)
+        if self.state is not None:
+            if self.state.etag:
+                headers["If-None-Match"] = self.state.etag
+            if self.state.last_modified:
+                headers["If-Modified-Since"] = self.state.last_modified
+        return headers
+
+    def fetch_new_rows(self, since: dt.date) -> pd.DataFrame:
+        streaming = config.GCP_RSS_PARSER == "streaming"
+        with requests.get(
+            config.GCP_RSS_FEED_URL,
+            timeout=30,
+            headers=self._conditional_headers(),
+            stream=streaming,
+        ) as resp:
+            if resp.status_code == 304:
+                logger.info("[GCP/rss] feed not modified since last run — nothing to parse")
+                return pd.DataFrame(columns=ROW_COLUMNS)
+            resp.raise_for_status()
+            if self.state is not None:
+                self.state.etag = resp.headers.get("ETag")
+                self.state.last_modified = resp.headers.get("Last-Modified")
+            if streaming:
+                rows, read = self.rows_from_stream(
+                    resp.iter_content(chunk_size=_STREAM_CHUNK_BYTES), since
+                )
+            else:
+                rows, read = self.rows_from_feedparser(resp.content, since)
+
+        df = pd.DataFrame(rows, columns=ROW_COLUMNS)
         logger.info(
-            "[GCP/rss] fetched %d rows published on/after %s (feed had %d entries total)",
+            "[GCP/rss] fetched %d rows published on/after %s (%s parser read %d entries)",
             len(df),
             since,
-            len(parsed.entries),
+            config.GCP_RSS_PARSER,
+            read,
         )
         if not df.empty:
             logger.info("[GCP/rss] sample parsed row: %s", df.iloc[0].to_dict())
@@ -0,0 +1,33 @@
+"""
+Sink registry.
+
+A "sink" is where the job writes rows and per-source ingestion state.
+Selected by the SINK env var:
+
+  bigquery  the shared BigQuery destination table + state table (default)
+  parquet   partitioned Parquet files + an atomic manifest under
+            PARQUET_ROOT — no GCP access needed when the providers don't
+            need it either (e.g. GCP_SOURCE_MODE=rss)
+"""
+
+from typing import Callable
+
+from google.cloud import bigquery
+
+from src import config
+from src.sinks.base import BaseSink
+from src.sinks.bq import BigQuerySink
+from src.sinks.parquet import ParquetSink
+
+_REGISTRY: dict[str, Callable[[bigquery.Client | None], BaseSink]] = {
+    "bigquery": BigQuerySink,
+    "parquet": lambda _client: ParquetSink(config.PARQUET_ROOT, config.DEST_TABLE_ID),
+}
+
+
+def build_sink(name: str, bq_client: bigquery.Client | None) -> BaseSink:
+    try:
+        factory = _REGISTRY[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown sink {name!r}. Known sinks: {sorted(_REGISTRY)}.") from None
+    return factory(bq_client)
@@ -0,0 +1,56 @@
+"""Base interface every ingestion destination implements."""
+
+import datetime as dt
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+import pandas as pd
+
+from src.batches import LoadResult
+from src.state import SourceState
+
+
+class BaseSink(ABC):
+    """Where ingested rows (and each source's ingestion state) are stored.
+
+    Every sink gives the same guarantees: rows are deduped by row_hash, so
+    re-running over an overlapping window never creates duplicates, and a
+    load either lands completely or not at all.
+    """
+
+    #: Short name for logs and the SINK env var, e.g. "bigquery", "parquet".
+    name: str
+
+    @abstractmethod
+    def describe(self) -> str:
+        """Human-readable destination, for the run log."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def ensure(self) -> None:
+        """Create the destination (and state storage) if it doesn't exist yet."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_watermark(self, platform: str) -> dt.date | None:
+        """Latest published_at stored for `platform`, or None if it has no rows yet."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_state(self, platform: str, source: str) -> SourceState:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_state(self, state: SourceState) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def merge(
+        self,
+        rows: pd.DataFrame | Iterable[pd.DataFrame],
+        platform: str,
+        source: str,
+        since: dt.date | None = None,
+    ) -> LoadResult:
+        """Add the rows of `rows` not already stored; see src/loader.py::merge_new_rows."""
+        raise NotImplementedError
@@ -0,0 +1,47 @@
+"""BigQuery sink: the shared destination table plus the ingestion state table."""
+
+import datetime as dt
+from typing import Iterable
+
+import pandas as pd
+from google.cloud import bigquery
+
+from src import config
+from src.batches import LoadResult
+from src.loader import ensure_dataset_and_table, get_watermark, merge_new_rows
+from src.sinks.base import BaseSink
+from src.state import SourceState, ensure_state_table, load_state, save_state
+
+
+class BigQuerySink(BaseSink):
+    """Thin adapter over src/loader.py and src/state.py."""
+
+    name = "bigquery"
+
+    def __init__(self, client: bigquery.Client):
+        self._client = client
+
+    def describe(self) -> str:
+        return config.dest_table_fqn()
+
+    def ensure(self) -> None:
+        ensure_dataset_and_table(self._client)
+        ensure_state_table(self._client)
+
+    def get_watermark(self, platform: str) -> dt.date | None:
+        return get_watermark(self._client, platform)
+
+    def load_state(self, platform: str, source: str) -> SourceState:
+        return load_state(self._client, platform, source)
+
+    def save_state(self, state: SourceState) -> None:
+        save_state(self._client, state)
+
+    def merge(
+        self,
+        rows: pd.DataFrame | Iterable[pd.DataFrame],
+        platform: str,
+        source: str,
+        since: dt.date | None = None,
+    ) -> LoadResult:
+        return merge_new_rows(self._client, rows, platform=platform, source=source, since=since)
@@ -0,0 +1,105 @@
+"""
+Per-source ingestion state, persisted in a small BigQuery table next to
+the destination table.
+
+One row per (platform, source) records where that source left off: its
+watermark, the HTTP validators (ETag / Last-Modified) from its last
+successful fetch, how many rows it returned and when it ran. main.py
+loads it before a fetch and saves it after a successful merge, so:
+
+  - the watermark no longer needs a MAX(published_at) scan every run
+    (the scan is still the fallback when a source has no state yet);
+  - providers can make conditional requests and short-circuit when the
+    source hasn't changed since the last run (see BaseProvider.state).
+"""
+
+import datetime as dt
+import logging
+from dataclasses import dataclass
+
+from google.api_core.exceptions import NotFound
+from google.cloud import bigquery
+
+from src import config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = [
+    bigquery.SchemaField("platform", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("source", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("watermark", "DATE"),
+    bigquery.SchemaField("etag", "STRING"),
+    bigquery.SchemaField("last_modified", "STRING"),
+    bigquery.SchemaField("last_row_count", "INT64"),
+    bigquery.SchemaField("last_run_at", "TIMESTAMP"),
+]
+
+
+@dataclass
+class SourceState:
+    """Where one source left off. `etag` / `last_modified` are opaque validators."""
+
+    platform: str
+    source: str
+    watermark: dt.date | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    last_row_count: int | None = None
+    last_run_at: dt.datetime | None = None
+
+
+def ensure_state_table(client: bigquery.Client) -> None:
+    table_ref = bigquery.DatasetReference(config.DEST_PROJECT_ID, config.DEST_DATASET_ID).table(
+        config.STATE_TABLE_ID
+    )
+    try:
+        client.get_table(table_ref)
+    except NotFound:
+        client.create_table(bigquery.Table(table_ref, schema=_SCHEMA))
+        logger.info("Created table %s", config.state_table_fqn())
+
+
+def load_state(client: bigquery.Client, platform: str, source: str) -> SourceState:
+    """Return the stored state for (platform, source), or an empty one if it has never run."""
+    query = f"""
+    SELECT watermark, etag, last_modified, last_row_count, last_run_at
+    FROM `{config.state_table_fqn()}`
+    WHERE platform = @platform AND source = @source
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("platform", "STRING", platform),
+            bigquery.ScalarQueryParameter("source", "STRING", source),
+        ]
+    )
+    rows = list(client.query(query, job_config=job_config).result())
+    if not rows:
+        return SourceState(platform, source)
+    return SourceState(platform, source, **dict(rows[0]))
+
+
+def save_state(client: bigquery.Client, state: SourceState) -> None:
+    """Upsert `state` — called only after the source's rows were merged successfully."""
+    query = f"""
+    MERGE `{config.state_table_fqn()}` T
+    USING (SELECT @platform AS platform, @source AS source) S
+    ON T.platform = S.platform AND T.source = S.source
+    WHEN MATCHED THEN UPDATE SET
+      watermark = @watermark, etag = @etag, last_modified = @last_modified,
+      last_row_count = @last_row_count, last_run_at = @last_run_at
+    WHEN NOT MATCHED THEN
+      INSERT (platform, source, watermark, etag, last_modified, last_row_count, last_run_at)
+      VALUES (@platform, @source, @watermark, @etag, @last_modified, @last_row_count, @last_run_at)
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("platform", "STRING", state.platform),
+            bigquery.ScalarQueryParameter("source", "STRING", state.source),
+            bigquery.ScalarQueryParameter("watermark", "DATE", state.watermark),
+            bigquery.ScalarQueryParameter("etag", "STRING", state.etag),
+            bigquery.ScalarQueryParameter("last_modified", "STRING", state.last_modified),
+            bigquery.ScalarQueryParameter("last_row_count", "INT64", state.last_row_count),
+            bigquery.ScalarQueryParameter("last_run_at", "TIMESTAMP", state.last_run_at),
+        ]
+    )
+    client.query(query, job_config=job_config).result()
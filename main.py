@@ -12,13 +12,13 @@ import streamlit as st
 import streamlit.components.v1 as components
 from dotenv import load_dotenv
 
+from backend.src import query_builder
 from src.bq import get_bigquery_client
 from src.config import get_table_name
 from src.queries import (
     get_date_range,
     load_product_names,
     load_release_note_types,
-    query_release_notes,
 )
 from src.utils import format_description, get_type_css_class, get_badge_class
 
@@ -231,17 +231,13 @@ def _date_range_bounds(
 start_date, end_date = _date_range_bounds(date_range, min_date, max_date)
 
 # --------------- Query Data ---------------
-results, total_count = query_release_notes(
-    selected_types,
-    selected_products,
-    start_date,
-    end_date,
-    search_text,
-    st.session_state.items_per_page,
-    offset,
-    client,
-    table_name,
+note_filters = query_builder.NoteFilters.of(selected_types, selected_products, start_date, end_date, search_text)
+results = (
+    query_builder.release_notes_query(table_name, note_filters, st.session_state.items_per_page, offset)
+    .run(client)
+    .to_dataframe()
 )
+total_count = int(query_builder.count_query(table_name, note_filters).run(client).to_dataframe()["total"][0])
 
 total_pages = max(1, (total_count + st.session_state.items_per_page - 1) // st.session_state.items_per_page)
 
@@ -367,6 +363,11 @@ CHART_COLORS = [
 ]
 
 with tab_insights:
+    _all_notes = query_builder.NoteFilters.of()
+    _year_start, _today = query_builder.trailing_window(12)
+    _quarter_start, _ = query_builder.trailing_window(3)
+    _last_year = query_builder.NoteFilters.of(start_date=_year_start, end_date=_today)
+    _last_quarter = query_builder.NoteFilters.of(start_date=_quarter_start, end_date=_today)
     col1, col2 = st.columns(2)
 
     with col1:
@@ -375,13 +376,7 @@ with tab_insights:
             '<div class="insights-subtitle">Monthly volume over the last 12 months</div>',
             unsafe_allow_html=True,
         )
-        time_series_query = f"""
-        SELECT DATE_TRUNC(published_at, MONTH) as month, COUNT(*) as count
-        FROM `{table_name}`
-        WHERE published_at BETWEEN DATE_SUB(CURRENT_DATE(), INTERVAL 1 YEAR) AND CURRENT_DATE()
-        GROUP BY month ORDER BY month
-        """
-        time_df = client.query(time_series_query).to_dataframe()
+        time_df = query_builder.time_series_query(table_name, _last_year).run(client).to_dataframe()
 
         fig1 = go.Figure()
         fig1.add_trace(go.Scatter(
@@ -418,13 +413,7 @@ with tab_insights:
             '<div class="insights-subtitle">Breakdown by release note category</div>',
             unsafe_allow_html=True,
         )
-        types_query = f"""
-        SELECT release_note_type, COUNT(*) as count
-        FROM `{table_name}`
-        WHERE release_note_type IS NOT NULL
-        GROUP BY release_note_type ORDER BY count DESC LIMIT 10
-        """
-        types_df = client.query(types_query).to_dataframe()
+        types_df = query_builder.type_distribution_query(table_name, _all_notes).run(client).to_dataframe()
 
         fig2 = go.Figure(data=[go.Pie(
             labels=types_df["release_note_type"],
@@ -455,13 +444,7 @@ with tab_insights:
             '<div class="insights-subtitle">Most active products by release note count</div>',
             unsafe_allow_html=True,
         )
-        top_products_query = f"""
-        SELECT product_name, COUNT(*) as count
-        FROM `{table_name}`
-        WHERE product_name IS NOT NULL
-        GROUP BY product_name ORDER BY count DESC LIMIT 10
-        """
-        top_products_df = client.query(top_products_query).to_dataframe()
+        top_products_df = query_builder.top_products_query(table_name, _all_notes).run(client).to_dataframe()
 
         fig3 = go.Figure(data=[go.Bar(
             x=top_products_df["count"],
@@ -493,17 +476,7 @@ with tab_insights:
             '<div class="insights-subtitle">Daily release note activity (last 3 months)</div>',
             unsafe_allow_html=True,
         )
-        heatmap_query = f"""
-        SELECT
-            EXTRACT(DAYOFWEEK FROM published_at) as day_of_week,
-            DATE_TRUNC(published_at, WEEK) as week,
-            COUNT(*) as count
-        FROM `{table_name}`
-        WHERE published_at BETWEEN DATE_SUB(CURRENT_DATE(), INTERVAL 3 MONTH) AND CURRENT_DATE()
-        GROUP BY day_of_week, week
-        ORDER BY week, day_of_week
-        """
-        heatmap_df = client.query(heatmap_query).to_dataframe()
+        heatmap_df = query_builder.heatmap_query(table_name, _last_quarter).run(client).to_dataframe()
 
         if not heatmap_df.empty:
             pivot_df = heatmap_df.pivot_table(